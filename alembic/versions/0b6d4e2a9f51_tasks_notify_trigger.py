@@ -0,0 +1,59 @@
+"""notify on task changes
+
+Revision ID: 0b6d4e2a9f51
+Revises: f2a7c9d4e813
+Create Date: 2026-10-19 19:05:37.918264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d4e2a9f51'
+down_revision: Union[str, Sequence[str], None] = 'f2a7c9d4e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_task_change() RETURNS trigger AS $$
+        DECLARE
+            rec tasks;
+            kind text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                rec := OLD;
+                kind := 'deleted';
+            ELSE
+                rec := NEW;
+                IF TG_OP = 'INSERT' THEN
+                    kind := 'created';
+                ELSIF OLD.status_id IS DISTINCT FROM NEW.status_id THEN
+                    kind := 'status_changed';
+                ELSE
+                    kind := 'updated';
+                END IF;
+            END IF;
+            PERFORM pg_notify('task_changes', json_build_object(
+                'type', kind, 'id', rec.id, 'creator_id', rec.creator_id, 'status_id', rec.status_id
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION notify_task_change()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER tasks_notify_change ON tasks")
+    op.execute("DROP FUNCTION notify_task_change()")
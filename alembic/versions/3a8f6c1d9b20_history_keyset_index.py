@@ -0,0 +1,39 @@
+"""history (task_id, changed_at, id) index for keyset paging
+
+Revision ID: 3a8f6c1d9b20
+Revises: 6d1f8b3e0a27
+Create Date: 2026-10-19 23:02:41.573920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a8f6c1d9b20'
+down_revision: Union[str, Sequence[str], None] = '6d1f8b3e0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # id добавлен как последний ключ keyset-пагинации истории; старый индекс - префикс нового
+    op.create_index('ix_task_status_history_task_id_changed_at_id', 'task_status_history',
+                    ['task_id', 'changed_at', 'id'], unique=False)
+    op.drop_index('ix_task_status_history_task_id_changed_at', table_name='task_status_history')
+    op.create_index('ix_task_status_history_archive_task_id_changed_at_id', 'task_status_history_archive',
+                    ['task_id', 'changed_at', 'id'], unique=False)
+    op.drop_index('ix_task_status_history_archive_task_id_changed_at', table_name='task_status_history_archive')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_task_status_history_archive_task_id_changed_at', 'task_status_history_archive',
+                    ['task_id', 'changed_at'], unique=False)
+    op.drop_index('ix_task_status_history_archive_task_id_changed_at_id', table_name='task_status_history_archive')
+    op.create_index('ix_task_status_history_task_id_changed_at', 'task_status_history',
+                    ['task_id', 'changed_at'], unique=False)
+    op.drop_index('ix_task_status_history_task_id_changed_at_id', table_name='task_status_history')
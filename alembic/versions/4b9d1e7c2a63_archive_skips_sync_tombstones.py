@@ -0,0 +1,74 @@
+"""archiving does not write sync tombstones
+
+Revision ID: 4b9d1e7c2a63
+Revises: 7c2e5a9d3f14
+Create Date: 2026-10-20 10:12:37.511204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b9d1e7c2a63'
+down_revision: Union[str, Sequence[str], None] = '7c2e5a9d3f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CURRENT_XID = "pg_current_xact_id()::text::bigint"
+# флаг транзакции архивации (SET LOCAL app.archiving = 'on', см. app/db/archive.py)
+ARCHIVING_FLAG = "current_setting('app.archiving', true) = 'on'"
+
+
+def _replace_functions(delete_kind: str, tombstone_guard: str) -> None:
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_task_change() RETURNS trigger AS $$
+        DECLARE
+            rec tasks;
+            kind text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                rec := OLD;
+                kind := {delete_kind};
+            ELSE
+                rec := NEW;
+                IF TG_OP = 'INSERT' THEN
+                    kind := 'created';
+                ELSIF OLD.status_id IS DISTINCT FROM NEW.status_id THEN
+                    kind := 'status_changed';
+                ELSE
+                    kind := 'updated';
+                END IF;
+            END IF;
+            PERFORM pg_notify('task_changes', json_build_object(
+                'type', kind, 'id', rec.id, 'creator_id', rec.creator_id, 'status_id', rec.status_id
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION task_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            {tombstone_guard}
+            INSERT INTO task_tombstones (task_id, creator_id, change_xid) VALUES (OLD.id, OLD.creator_id, {CURRENT_XID});
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # перенос в архив - не удаление: без надгробия для синхронизации и с событием archived в ленте
+    _replace_functions(
+        f"CASE WHEN {ARCHIVING_FLAG} THEN 'archived' ELSE 'deleted' END",
+        f"IF {ARCHIVING_FLAG} THEN RETURN NULL; END IF;",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_functions("'deleted'", "")
@@ -0,0 +1,32 @@
+"""history (task_id, changed_at) index
+
+Revision ID: 4c1f7a9e2b6d
+Revises: 8218e6360a16
+Create Date: 2026-10-19 10:12:41.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1f7a9e2b6d'
+down_revision: Union[str, Sequence[str], None] = '8218e6360a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # составной индекс покрывает и поиск по task_id, поэтому одиночный удаляем
+    op.create_index('ix_task_status_history_task_id_changed_at', 'task_status_history',
+                    ['task_id', 'changed_at'], unique=False)
+    op.drop_index(op.f('ix_task_status_history_task_id'), table_name='task_status_history')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_task_status_history_task_id'), 'task_status_history', ['task_id'], unique=False)
+    op.drop_index('ix_task_status_history_task_id_changed_at', table_name='task_status_history')
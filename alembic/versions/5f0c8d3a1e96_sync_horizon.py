@@ -0,0 +1,32 @@
+"""sync horizon for tombstone retention
+
+Revision ID: 5f0c8d3a1e96
+Revises: 8e3a6f2b5c71
+Create Date: 2026-10-20 11:20:44.187352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0c8d3a1e96'
+down_revision: Union[str, Sequence[str], None] = '8e3a6f2b5c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_horizon',
+    sa.Column('id', sa.SmallInteger(), autoincrement=False, nullable=False),
+    sa.Column('purged_xid', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sync_horizon')
@@ -0,0 +1,76 @@
+"""history task snapshot and indexes for activity feed
+
+Revision ID: 7c2e5a9d3f14
+Revises: 3a8f6c1d9b20
+Create Date: 2026-10-19 23:41:12.208417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9d3f14'
+down_revision: Union[str, Sequence[str], None] = '3a8f6c1d9b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('task_status_history', sa.Column('creator_id', sa.Integer(), nullable=True))
+    op.add_column('task_status_history', sa.Column('topic_id', sa.Integer(), nullable=True))
+    op.add_column('task_status_history', sa.Column('assignee_id', sa.Integer(), nullable=True))
+    # для старых записей снимок берётся из текущего состояния задачи - точнее восстановить нечем
+    op.execute(
+        "UPDATE task_status_history h "
+        "SET creator_id = t.creator_id, topic_id = t.topic_id, assignee_id = t.assignee_id "
+        "FROM tasks t WHERE t.id = h.task_id"
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION history_task_snapshot() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.creator_id IS NULL THEN
+                SELECT creator_id, topic_id, assignee_id INTO NEW.creator_id, NEW.topic_id, NEW.assignee_id
+                FROM tasks WHERE id = NEW.task_id;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER task_status_history_task_snapshot BEFORE INSERT ON task_status_history
+        FOR EACH ROW EXECUTE FUNCTION history_task_snapshot()
+    """)
+
+    op.create_index('ix_task_status_history_changed_at_id', 'task_status_history',
+                    ['changed_at', 'id'], unique=False)
+    # старый индекс по changed_by_id - префикс нового
+    op.create_index('ix_task_status_history_changed_by_id_changed_at_id', 'task_status_history',
+                    ['changed_by_id', 'changed_at', 'id'], unique=False)
+    op.drop_index('ix_task_status_history_changed_by_id', table_name='task_status_history')
+    op.create_index('ix_task_status_history_creator_id_changed_at_id', 'task_status_history',
+                    ['creator_id', 'changed_at', 'id'], unique=False)
+    op.create_index('ix_task_status_history_topic_id_changed_at_id', 'task_status_history',
+                    ['topic_id', 'changed_at', 'id'], unique=False)
+    op.create_index('ix_task_status_history_assignee_id_changed_at_id', 'task_status_history',
+                    ['assignee_id', 'changed_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_status_history_assignee_id_changed_at_id', table_name='task_status_history')
+    op.drop_index('ix_task_status_history_topic_id_changed_at_id', table_name='task_status_history')
+    op.drop_index('ix_task_status_history_creator_id_changed_at_id', table_name='task_status_history')
+    op.create_index('ix_task_status_history_changed_by_id', 'task_status_history',
+                    ['changed_by_id'], unique=False)
+    op.drop_index('ix_task_status_history_changed_by_id_changed_at_id', table_name='task_status_history')
+    op.drop_index('ix_task_status_history_changed_at_id', table_name='task_status_history')
+
+    op.execute("DROP TRIGGER task_status_history_task_snapshot ON task_status_history")
+    op.execute("DROP FUNCTION history_task_snapshot()")
+    op.drop_column('task_status_history', 'assignee_id')
+    op.drop_column('task_status_history', 'topic_id')
+    op.drop_column('task_status_history', 'creator_id')
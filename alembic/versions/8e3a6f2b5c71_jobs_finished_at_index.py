@@ -0,0 +1,28 @@
+"""jobs finished_at index for result retention
+
+Revision ID: 8e3a6f2b5c71
+Revises: 4b9d1e7c2a63
+Create Date: 2026-10-20 10:48:05.930163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3a6f2b5c71'
+down_revision: Union[str, Sequence[str], None] = '4b9d1e7c2a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_jobs_finished_at', 'jobs', ['finished_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_finished_at', table_name='jobs')
@@ -0,0 +1,79 @@
+"""task change_xid and tombstones for incremental sync
+
+Revision ID: 9e4c2b7a5d18
+Revises: 0b6d4e2a9f51
+Create Date: 2026-10-19 20:41:12.304518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4c2b7a5d18'
+down_revision: Union[str, Sequence[str], None] = '0b6d4e2a9f51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CURRENT_XID = "pg_current_xact_id()::text::bigint"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # константный default не переписывает таблицу; существующие задачи получают 0
+    # и попадают в первую же синхронизацию
+    op.add_column('tasks', sa.Column('change_xid', sa.BigInteger(), server_default='0', nullable=False))
+    op.alter_column('tasks', 'change_xid', server_default=sa.text(CURRENT_XID))
+    op.create_index('ix_tasks_change_xid_id', 'tasks', ['change_xid', 'id'], unique=False)
+    op.create_index('ix_tasks_creator_id_change_xid_id', 'tasks', ['creator_id', 'change_xid', 'id'], unique=False)
+
+    op.create_table('task_tombstones',
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('creator_id', sa.Integer(), nullable=False),
+    sa.Column('change_xid', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_tombstones_change_xid_task_id', 'task_tombstones', ['change_xid', 'task_id'], unique=False)
+    op.create_index('ix_task_tombstones_creator_id_change_xid_task_id', 'task_tombstones', ['creator_id', 'change_xid', 'task_id'], unique=False)
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION task_sync_touch() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := {CURRENT_XID};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION task_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstones (task_id, creator_id, change_xid) VALUES (OLD.id, OLD.creator_id, {CURRENT_XID});
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_sync_touch BEFORE UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_sync_touch()
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_sync_tombstone AFTER DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_sync_tombstone()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER tasks_sync_tombstone ON tasks")
+    op.execute("DROP TRIGGER tasks_sync_touch ON tasks")
+    op.execute("DROP FUNCTION task_sync_tombstone()")
+    op.execute("DROP FUNCTION task_sync_touch()")
+    op.drop_index('ix_task_tombstones_creator_id_change_xid_task_id', table_name='task_tombstones')
+    op.drop_index('ix_task_tombstones_change_xid_task_id', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index('ix_tasks_creator_id_change_xid_id', table_name='tasks')
+    op.drop_index('ix_tasks_change_xid_id', table_name='tasks')
+    op.drop_column('tasks', 'change_xid')
@@ -0,0 +1,110 @@
+"""partition task_status_history by month
+
+Revision ID: a7d3e5b19c42
+Revises: 4c1f7a9e2b6d
+Create Date: 2026-10-19 13:40:05.227114
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5b19c42'
+down_revision: Union[str, Sequence[str], None] = '4c1f7a9e2b6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# сколько месяцев вперёд создать сразу, дальше - python -m app.db.partitions
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, task_id, from_status_id, to_status_id, changed_by_id, changed_at"
+
+
+def _month_start(day: date, shift: int = 0) -> date:
+    month = day.year * 12 + day.month - 1 + shift
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def _rename_old_table() -> None:
+    op.execute("ALTER TABLE task_status_history RENAME TO task_status_history_old")
+    op.execute("ALTER TABLE task_status_history_old RENAME CONSTRAINT task_status_history_pkey "
+               "TO task_status_history_old_pkey")
+    op.execute("ALTER INDEX ix_task_status_history_task_id_changed_at "
+               "RENAME TO ix_task_status_history_old_task_id_changed_at")
+    op.execute("ALTER INDEX ix_task_status_history_changed_by_id "
+               "RENAME TO ix_task_status_history_old_changed_by_id")
+
+
+def _copy_and_drop_old_table() -> None:
+    op.execute(f"INSERT INTO task_status_history ({COLUMNS}) SELECT {COLUMNS} FROM task_status_history_old")
+    # последовательность id остаётся прежней, переносим её владельца на новую таблицу
+    op.execute("ALTER SEQUENCE task_status_history_id_seq OWNED BY task_status_history.id")
+    op.execute("DROP TABLE task_status_history_old")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_old_table()
+
+    op.execute("""
+        CREATE TABLE task_status_history (
+            id integer NOT NULL DEFAULT nextval('task_status_history_id_seq'),
+            task_id integer NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+            from_status_id integer REFERENCES task_statuses (id) ON DELETE SET NULL,
+            to_status_id integer NOT NULL REFERENCES task_statuses (id) ON DELETE RESTRICT,
+            changed_by_id integer NOT NULL REFERENCES users (id) ON DELETE RESTRICT,
+            changed_at timestamp with time zone NOT NULL DEFAULT now(),
+            CONSTRAINT task_status_history_pkey PRIMARY KEY (id, changed_at)
+        ) PARTITION BY RANGE (changed_at)
+    """)
+    op.create_index('ix_task_status_history_task_id_changed_at', 'task_status_history',
+                    ['task_id', 'changed_at'], unique=False)
+    op.create_index(op.f('ix_task_status_history_changed_by_id'), 'task_status_history',
+                    ['changed_by_id'], unique=False)
+    op.execute("CREATE TABLE task_status_history_default PARTITION OF task_status_history DEFAULT")
+
+    # партиции на весь период существующей истории и несколько месяцев вперёд
+    first = op.get_bind().execute(sa.text("SELECT min(changed_at) FROM task_status_history_old")).scalar()
+    today = date.today()
+    start = _month_start(first.date() if first else today)
+    last = _month_start(today, MONTHS_AHEAD)
+    while start <= last:
+        end = _month_start(start, 1)
+        op.execute(
+            f"CREATE TABLE task_status_history_p{start.year:04d}_{start.month:02d} "
+            f"PARTITION OF task_status_history FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    _copy_and_drop_old_table()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_old_table()
+
+    op.create_table('task_status_history',
+    sa.Column('id', sa.Integer(), nullable=False,
+              server_default=sa.text("nextval('task_status_history_id_seq')")),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('from_status_id', sa.Integer(), nullable=True),
+    sa.Column('to_status_id', sa.Integer(), nullable=False),
+    sa.Column('changed_by_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['changed_by_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['from_status_id'], ['task_statuses.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['to_status_id'], ['task_statuses.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_status_history_task_id_changed_at', 'task_status_history',
+                    ['task_id', 'changed_at'], unique=False)
+    op.create_index(op.f('ix_task_status_history_changed_by_id'), 'task_status_history',
+                    ['changed_by_id'], unique=False)
+
+    # отсоединённые ранее партиции остаются отдельными таблицами и сюда не переносятся
+    _copy_and_drop_old_table()
@@ -0,0 +1,28 @@
+"""tasks (created_at, id) index
+
+Revision ID: c3e9a1f58d20
+Revises: e5b82c4d1f37
+Create Date: 2026-10-19 16:21:44.130852
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e9a1f58d20'
+down_revision: Union[str, Sequence[str], None] = 'e5b82c4d1f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
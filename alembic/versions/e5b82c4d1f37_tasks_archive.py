@@ -0,0 +1,65 @@
+"""tasks archive tables
+
+Revision ID: e5b82c4d1f37
+Revises: a7d3e5b19c42
+Create Date: 2026-10-19 15:02:17.604381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b82c4d1f37'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e5b19c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status_id', sa.Integer(), nullable=False),
+    sa.Column('topic_id', sa.Integer(), nullable=True),
+    sa.Column('creator_id', sa.Integer(), nullable=False),
+    sa.Column('assignee_id', sa.Integer(), nullable=True),
+    sa.Column('priority', sa.SmallInteger(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['assignee_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['status_id'], ['task_statuses.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['topic_id'], ['topics.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tasks_archive_creator_id'), 'tasks_archive', ['creator_id'], unique=False)
+    op.create_table('task_status_history_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('from_status_id', sa.Integer(), nullable=True),
+    sa.Column('to_status_id', sa.Integer(), nullable=False),
+    sa.Column('changed_by_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['changed_by_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['from_status_id'], ['task_statuses.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks_archive.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['to_status_id'], ['task_statuses.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_status_history_archive_task_id_changed_at', 'task_status_history_archive',
+                    ['task_id', 'changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_status_history_archive_task_id_changed_at', table_name='task_status_history_archive')
+    op.drop_table('task_status_history_archive')
+    op.drop_index(op.f('ix_tasks_archive_creator_id'), table_name='tasks_archive')
+    op.drop_table('tasks_archive')
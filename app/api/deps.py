@@ -1,8 +1,17 @@
 from typing import Generator
+
+from fastapi import Request
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import ReadOnlySessionLocal, SessionLocal
+
+# методы, которые ничего не меняют: для них транзакция только для чтения
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+def get_db(request: Request = None) -> Generator[Session, None, None]:
+    if request is not None and request.method in SAFE_METHODS:
+        yield from _read_only_db()
+        return
 
-def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
@@ -11,4 +20,13 @@ def get_db() -> Generator[Session, None, None]:
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# BEGIN READ ONLY вместо BEGIN (тот же запрос к базе) и без COMMIT в конце:
+# фиксировать нечего, close() откатывает транзакцию при возврате соединения в пул
+def _read_only_db() -> Generator[Session, None, None]:
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.api.deps_auth import get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.models import Task, TaskStatusHistory, User, UserRole
+from app.db.read_models import history_entries
+from app.schemas.task_history import ActivityPage
+
+router = APIRouter(prefix="/activity", tags=["Активность"])
+
+@router.get("", response_model=ActivityPage, summary="Лента переходов статусов по задачам")
+def activity_feed(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    changed_by_id: int | None = None,
+    topic_id: int | None = None,
+    assignee_id: int | None = None,
+    since: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+) -> dict:
+    key = decode_cursor(cursor, (datetime.fromisoformat, int))
+    if cursor and key is None:
+        raise HTTPException(status_code=400, detail="Неверный курсор")
+
+    h = TaskStatusHistory
+    # фильтры по полям самой истории (тема и исполнитель - на момент перехода), каждому
+    # соответствует индекс (поле, changed_at, id): страница - обратный проход по нему от курсора
+    conds = []
+    if user.role != UserRole.admin:
+        conds.append(h.creator_id == user.id)
+    if changed_by_id is not None:
+        conds.append(h.changed_by_id == changed_by_id)
+    if topic_id is not None:
+        conds.append(h.topic_id == topic_id)
+    if assignee_id is not None:
+        conds.append(h.assignee_id == assignee_id)
+    # since отсекает и старые партиции
+    if since is not None:
+        conds.append(h.changed_at >= since)
+    if key is not None:
+        conds.append(tuple_(h.changed_at, h.id) < tuple_(*key))
+
+    stmt = (
+        history_entries(h)
+        .add_columns(h.task_id, Task.title.label("task_title"))
+        .join(Task, Task.id == h.task_id)
+        .where(*conds)
+        .order_by(h.changed_at.desc(), h.id.desc())
+        .limit(limit + 1)
+    )
+    rows = db.execute(stmt).mappings().all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]["changed_at"], items[-1]["id"]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,76 +1,119 @@
-from datetime import date, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
 from io import BytesIO
 from typing import Literal
 
 import pandas as pd
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
-import matplotlib
-matplotlib.use("Agg")
-from matplotlib import pyplot as plt
-from sqlalchemy import and_, select, func
+from fastapi.responses import Response
+from sqlalchemy import DateTime, Interval, and_, case, cast, literal, or_, select, func, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.deps_auth import get_current_user
+from app.core.charts import (ChartKind, chart_spec, histogram, load_pyplot, multi_chart_spec, render_multi_svg,
+                             render_svg)
 from app.db.models import UserRole, Task, User, TaskStatus, Topic, TaskStatusHistory
+from app.db.session import replica_engine
 
 router = APIRouter(prefix="/analytics", tags=["Аналитика"])
 
+ChartFormat = Literal["json", "png", "svg", "spec"]
+
+# пул для параллельного расчёта агрегатов дашборда на реплике, создаётся один раз на процесс
+_replica_pool: ThreadPoolExecutor | None = None
+_replica_pool_lock = threading.Lock()
+
 # ограничение видимости данных
 def _task_scope_filter(user: User):
     if user.role == UserRole.admin:
         return None
     return Task.creator_id == user.id
 
+def _get_done_status_id(db: Session) -> int:
+    done_status_id = db.execute(
+        select(TaskStatus.id).where(TaskStatus.code == "done")
+    ).scalar_one_or_none()
+    if not done_status_id:
+        raise HTTPException(status_code=500, detail="Статус 'Сделано' не найден")
+    return done_status_id
+
+# момент первого перевода задачи в "Сделано"; before - верхняя граница по changed_at
+def _done_at_subquery(done_status_id: int, before=None):
+    stmt = (
+        select(
+            TaskStatusHistory.task_id.label("task_id"),
+            func.min(TaskStatusHistory.changed_at).label("done_at"),
+        )
+        .where(TaskStatusHistory.to_status_id == done_status_id)
+        .group_by(TaskStatusHistory.task_id)
+    )
+    if before is not None:
+        stmt = stmt.where(TaskStatusHistory.changed_at < before)
+    return stmt.subquery()
+
+# готовая картинка целиком, а не поток: тот же ответ можно сохранить как результат фонового задания
+def _png_response(plt, fig) -> Response:
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=150)
+    plt.close(fig)
+    return Response(buf.getvalue(), media_type="image/png")
+
 # рисует столбчатую диаграмму и отдаёт как png
-def _df_to_png_bar(df: pd.DataFrame, x_col: str, y_col: str, title: str) -> StreamingResponse:
+def _df_to_png_bar(df: pd.DataFrame, x_col: str, y_col: str, title: str) -> Response:
+    plt = load_pyplot()
     fig = plt.figure()
     plt.title(title)
     plt.bar(df[x_col].astype(str), df[y_col])
     plt.xticks(rotation=25, ha="right")
     plt.tight_layout()
-
-    buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-
-    return StreamingResponse(buf, media_type="image/png")
+    return _png_response(plt, fig)
 
 # линейная диаграмма
-def _df_to_png_line(df: pd.DataFrame, x_col: str, y_col: str, title: str) -> StreamingResponse:
+def _df_to_png_line(df: pd.DataFrame, x_col: str, y_col: str, title: str) -> Response:
+    plt = load_pyplot()
     fig = plt.figure()
     plt.title(title)
     plt.plot(df[x_col], df[y_col], marker="o")
     plt.xticks(rotation=25, ha="right")
     plt.tight_layout()
+    return _png_response(plt, fig)
 
-    buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-    return StreamingResponse(buf, media_type="image/png")
+# несколько линий на одном графике
+def _df_to_png_lines(df: pd.DataFrame, x_col: str, y_cols: dict[str, str], title: str) -> Response:
+    plt = load_pyplot()
+    fig = plt.figure()
+    plt.title(title)
+    for col, label in y_cols.items():
+        plt.plot(df[x_col], df[col], marker="o", label=label)
+    plt.legend()
+    plt.xticks(rotation=25, ha="right")
+    plt.tight_layout()
+    return _png_response(plt, fig)
 
 # гистограмма
-def _series_to_png_hist(values: pd.Series, title: str, bins: int = 20) -> StreamingResponse:
+def _series_to_png_hist(values: pd.Series, title: str, bins: int = 20) -> Response:
+    plt = load_pyplot()
     fig = plt.figure()
     plt.title(title)
     plt.hist(values.dropna(), bins=bins)
     plt.tight_layout()
+    return _png_response(plt, fig)
 
-    buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-    return StreamingResponse(buf, media_type="image/png")
+# svg и спецификация графика для отрисовки на клиенте, без matplotlib
+def _chart_response(format: ChartFormat, kind: ChartKind, labels, values, title: str) -> Response | dict:
+    if format == "svg":
+        return Response(render_svg(kind, labels, values, title), media_type="image/svg+xml")
+    return chart_spec(kind, labels, values, title)
 
 
 @router.get("/statuses", summary="Аналитика по статусам")
 def analytics_by_statuses(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-    format: Literal["json", "png"] = "json",
+    format: ChartFormat = "json",
     date_from: date | None = None,
     date_to: date | None = None,
 ):
@@ -109,6 +152,8 @@ def analytics_by_statuses(
 
     if format == "png":
         return _df_to_png_bar(df, x_col="name", y_col="count", title="Задачи по статусам")
+    if format != "json":
+        return _chart_response(format, "bar", df["name"], df["count"], "Задачи по статусам")
 
     return {
         "total": total,
@@ -119,7 +164,7 @@ def analytics_by_statuses(
 def analytics_by_topics(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-    format: Literal["json", "png"] = "json",
+    format: ChartFormat = "json",
 ):
     scope = _task_scope_filter(user)
 
@@ -151,6 +196,8 @@ def analytics_by_topics(
 
     if format == "png":
         return _df_to_png_bar(df, x_col="topic", y_col="count", title="Задачи по темам")
+    if format != "json":
+        return _chart_response(format, "bar", df["topic"], df["count"], "Задачи по темам")
 
     return {"total": total, "items": df.to_dict(orient="records")}
 
@@ -158,7 +205,7 @@ def analytics_by_topics(
 def analytics_by_assignees(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-    format: Literal["json", "png"] = "json",
+    format: ChartFormat = "json",
     include_unassigned: bool = Query(default=True),
 ):
     scope = _task_scope_filter(user)
@@ -201,6 +248,8 @@ def analytics_by_assignees(
 
     if format == "png":
         return _df_to_png_bar(df, x_col="assignee", y_col="count", title="Задачи по исполнителям")
+    if format != "json":
+        return _chart_response(format, "bar", df["assignee"], df["count"], "Задачи по исполнителям")
 
     return {"total": total, "items": df.to_dict(orient="records")}
 
@@ -212,11 +261,7 @@ def analytics_summary(
 ):
     scope = _task_scope_filter(user)
 
-    done_status_id = db.execute(
-        select(TaskStatus.id).where(TaskStatus.code == "done")
-    ).scalar_one_or_none()
-    if not done_status_id:
-        raise HTTPException(status_code=500, detail="Статус 'Сделано' не найден")
+    done_status_id = _get_done_status_id(db)
 
     today = date.today()
     week_ago = today - timedelta(days=7)
@@ -261,27 +306,16 @@ def analytics_summary(
 def analytics_burndown(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-    format: Literal["json", "png"] = "json",
+    format: ChartFormat = "json",
     date_from: date | None = None,
     date_to: date | None = None,
 ):
     scope = _task_scope_filter(user)
 
-    done_status_id = db.execute(
-        select(TaskStatus.id).where(TaskStatus.code == "done")
-    ).scalar_one_or_none()
-    if not done_status_id:
-        raise HTTPException(status_code=500, detail="Статус 'Сделано' не найден")
+    done_status_id = _get_done_status_id(db)
 
-    subq = (
-        select(
-            TaskStatusHistory.task_id.label("task_id"),
-            func.min(TaskStatusHistory.changed_at).label("done_at"),
-        )
-        .where(TaskStatusHistory.to_status_id == done_status_id)
-        .group_by(TaskStatusHistory.task_id)
-        .subquery()
-    )
+    # верхняя граница прямо в подзапросе: лишние месячные партиции истории не читаются
+    subq = _done_at_subquery(done_status_id, before=date_to)
 
     stmt = (
         select(
@@ -310,6 +344,9 @@ def analytics_burndown(
     df["day"] = pd.to_datetime(df["day"])
     if format == "png":
         return _df_to_png_line(df, x_col="day", y_col="done_count", title="Закрытые задачи по дням")
+    if format != "json":
+        return _chart_response(format, "line", df["day"].dt.date.astype(str), df["done_count"],
+                               "Закрытые задачи по дням")
 
     return {"items": df.assign(day=df["day"].dt.date.astype(str)).to_dict(orient="records")}
 
@@ -318,25 +355,13 @@ def analytics_burndown(
 def analytics_lead_time(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-    format: Literal["json", "png"] = "json",
+    format: ChartFormat = "json",
 ):
     scope = _task_scope_filter(user)
 
-    done_status_id = db.execute(
-        select(TaskStatus.id).where(TaskStatus.code == "done")
-    ).scalar_one_or_none()
-    if not done_status_id:
-        raise HTTPException(status_code=500, detail="Статус 'Сделано' не найден")
+    done_status_id = _get_done_status_id(db)
 
-    subq = (
-        select(
-            TaskStatusHistory.task_id.label("task_id"),
-            func.min(TaskStatusHistory.changed_at).label("done_at"),
-        )
-        .where(TaskStatusHistory.to_status_id == done_status_id)
-        .group_by(TaskStatusHistory.task_id)
-        .subquery()
-    )
+    subq = _done_at_subquery(done_status_id)
 
     stmt = (
         select(
@@ -366,10 +391,366 @@ def analytics_lead_time(
 
     if format == "png":
         return _series_to_png_hist(df["lead_hours"], title="Распределение времени до конца (часы)", bins=20)
+    if format != "json":
+        labels, counts = histogram(df["lead_hours"].tolist(), bins=20)
+        return _chart_response(format, "bar", labels, counts, "Распределение времени до конца (часы)")
 
     return {
         "count": int(len(df)),
         "avg_hours": float(df["lead_hours"].mean()),
         "median_hours": float(df["lead_hours"].median()),
         "p90_hours": float(df["lead_hours"].quantile(0.9)),
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/time_in_status", summary="Время нахождения задач в статусах")
+def analytics_time_in_status(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    format: ChartFormat = "json",
+    group_by: Literal["none", "topic", "assignee"] = "none",
+    date_from: date | None = None,
+    date_to: date | None = None,
+):
+    scope = _task_scope_filter(user)
+
+    # конец пребывания в статусе - момент следующей смены статуса этой же задачи
+    h = (
+        select(
+            TaskStatusHistory.task_id.label("task_id"),
+            TaskStatusHistory.from_status_id.label("from_status_id"),
+            TaskStatusHistory.to_status_id.label("to_status_id"),
+            TaskStatusHistory.changed_at.label("changed_at"),
+            Task.created_at.label("task_created_at"),
+            func.lead(TaskStatusHistory.changed_at).over(
+                partition_by=TaskStatusHistory.task_id,
+                order_by=(TaskStatusHistory.changed_at, TaskStatusHistory.id),
+            ).label("next_changed_at"),
+            func.row_number().over(
+                partition_by=TaskStatusHistory.task_id,
+                order_by=(TaskStatusHistory.changed_at, TaskStatusHistory.id),
+            ).label("rn"),
+        )
+        .select_from(TaskStatusHistory)
+        .join(Task, Task.id == TaskStatusHistory.task_id)
+    )
+    if scope is not None:
+        h = h.where(scope)
+    # нижняя граница не влияет на lead(), поэтому её можно применить до оконной функции
+    if date_from:
+        h = h.where(TaskStatusHistory.changed_at >= date_from)
+    h = h.subquery()
+
+    # первый отрезок: от создания задачи до первой смены статуса (создание в историю не пишется)
+    first_segment = select(
+        h.c.task_id,
+        h.c.from_status_id.label("status_id"),
+        h.c.task_created_at.label("started_at"),
+        h.c.changed_at.label("ended_at"),
+    ).where(h.c.rn == 1, h.c.from_status_id.is_not(None))
+    if date_from:
+        first_segment = first_segment.where(h.c.task_created_at >= date_from)
+
+    next_segments = select(
+        h.c.task_id,
+        h.c.to_status_id.label("status_id"),
+        h.c.changed_at.label("started_at"),
+        h.c.next_changed_at.label("ended_at"),
+    )
+
+    seg = union_all(first_segment, next_segments).subquery()
+
+    # отрезок обрезается по концу окна (date_to или текущий момент); если к этому моменту задача
+    # ещё в статусе, отрезок открыт - его длина не итоговая, и в медиану/p90 он не идёт
+    window_end = cast(datetime.combine(date_to, time.min), DateTime(timezone=True)) if date_to else func.now()
+    is_open = or_(seg.c.ended_at.is_(None), seg.c.ended_at > window_end)
+    dwell_hours = (
+        func.extract("epoch", func.least(func.coalesce(seg.c.ended_at, func.now()), window_end)
+                     - seg.c.started_at) / 3600
+    )
+    closed_hours = case((~is_open, dwell_hours))
+
+    group_cols = []
+    if group_by == "topic":
+        group_cols.append(func.coalesce(Topic.name, "Без темы").label("group"))
+    elif group_by == "assignee":
+        group_cols.append(func.coalesce(User.name, "Без исполнителя").label("group"))
+
+    stmt = (
+        select(
+            TaskStatus.code.label("status_code"),
+            TaskStatus.name.label("status_name"),
+            *group_cols,
+            func.count(closed_hours).label("count"),
+            func.avg(closed_hours).label("avg_hours"),
+            func.percentile_cont(0.5).within_group(closed_hours).label("median_hours"),
+            func.percentile_cont(0.9).within_group(closed_hours).label("p90_hours"),
+            func.max(closed_hours).label("max_hours"),
+            func.count(case((is_open, 1))).label("open_count"),
+            func.avg(case((is_open, dwell_hours))).label("open_avg_hours"),
+        )
+        .select_from(seg)
+        .join(TaskStatus, TaskStatus.id == seg.c.status_id)
+        # в терминальном статусе задача «живёт» бесконечно, такие отрезки не считаем
+        .where(TaskStatus.is_terminal.is_(False))
+    )
+    if group_by == "topic":
+        stmt = stmt.join(Task, Task.id == seg.c.task_id).outerjoin(Topic, Topic.id == Task.topic_id)
+    elif group_by == "assignee":
+        stmt = stmt.join(Task, Task.id == seg.c.task_id).outerjoin(User, User.id == Task.assignee_id)
+    if date_to:
+        stmt = stmt.where(seg.c.started_at < date_to)
+
+    stmt = (
+        stmt.group_by(TaskStatus.id, *group_cols)
+        .order_by(TaskStatus.sort_order.asc(), *group_cols)
+    )
+
+    rows = db.execute(stmt).mappings().all()
+    df = pd.DataFrame(rows)
+
+    if df.empty:
+        raise HTTPException(status_code=404, detail="Нет данных")
+
+    hour_cols = ["avg_hours", "median_hours", "p90_hours", "max_hours", "open_avg_hours"]
+    for col in hour_cols:
+        df[col] = pd.to_numeric(df[col], errors="coerce").round(2)
+
+    if format != "json":
+        labels = df["status_name"] if group_by == "none" else df["status_name"] + " / " + df["group"]
+        df = df.assign(label=labels, avg_hours=df["avg_hours"].fillna(0))
+        if format == "png":
+            return _df_to_png_bar(df, x_col="label", y_col="avg_hours", title="Среднее время в статусе (часы)")
+        return _chart_response(format, "bar", labels, df["avg_hours"], "Среднее время в статусе (часы)")
+
+    # группы только с открытыми отрезками: NaN в JSON не сериализуется
+    df[hour_cols] = df[hour_cols].astype(object).where(df[hour_cols].notna(), None)
+    return {"group_by": group_by, "items": df.to_dict(orient="records")}
+
+
+
+@router.get("/trend", summary="Динамика создания и закрытия задач")
+def analytics_trend(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    format: ChartFormat = "json",
+    bucket: Literal["day", "week", "month"] = "day",
+    date_from: date | None = None,
+    date_to: date | None = None,
+):
+    scope = _task_scope_filter(user)
+    done_status_id = _get_done_status_id(db)
+
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=30)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from позже date_to")
+
+    # границы выравниваем по началу периода, правая граница не включается
+    step = cast(literal(f"1 {bucket}"), Interval)
+    first_bucket = func.date_trunc(bucket, cast(datetime.combine(date_from, time.min), DateTime(timezone=True)))
+    last_bucket = func.date_trunc(bucket, cast(datetime.combine(date_to, time.min), DateTime(timezone=True)))
+    range_end = last_bucket + step
+
+    buckets = select(
+        func.generate_series(first_bucket, last_bucket, step).label("bucket_start")
+    ).cte("buckets")
+
+    created_bucket = func.date_trunc(bucket, Task.created_at)
+    created = (
+        select(created_bucket.label("bucket_start"), func.count(Task.id).label("cnt"))
+        .where(Task.created_at >= first_bucket, Task.created_at < range_end)
+        .group_by(created_bucket)
+    )
+
+    done_at = _done_at_subquery(done_status_id, before=range_end)
+    completed_bucket = func.date_trunc(bucket, done_at.c.done_at)
+    completed = (
+        select(completed_bucket.label("bucket_start"), func.count(done_at.c.task_id).label("cnt"))
+        .select_from(done_at)
+        .join(Task, Task.id == done_at.c.task_id)
+        .where(done_at.c.done_at >= first_bucket)
+        .group_by(completed_bucket)
+    )
+
+    # открытые задачи на начало диапазона: созданные раньше минус закрытые раньше
+    open_before = select(func.count(Task.id)).where(Task.created_at < first_bucket)
+    done_before = (
+        select(func.count(done_at.c.task_id))
+        .select_from(done_at)
+        .join(Task, Task.id == done_at.c.task_id)
+        .where(done_at.c.done_at < first_bucket)
+    )
+
+    if scope is not None:
+        created = created.where(scope)
+        completed = completed.where(scope)
+        open_before = open_before.where(scope)
+        done_before = done_before.where(scope)
+
+    created = created.cte("created")
+    completed = completed.cte("completed")
+
+    created_cnt = func.coalesce(created.c.cnt, 0)
+    completed_cnt = func.coalesce(completed.c.cnt, 0)
+    stmt = (
+        select(
+            buckets.c.bucket_start.label("bucket"),
+            created_cnt.label("created"),
+            completed_cnt.label("completed"),
+            (
+                open_before.scalar_subquery()
+                - done_before.scalar_subquery()
+                + func.sum(created_cnt - completed_cnt).over(order_by=buckets.c.bucket_start)
+            ).label("open"),
+        )
+        .select_from(buckets)
+        .outerjoin(created, created.c.bucket_start == buckets.c.bucket_start)
+        .outerjoin(completed, completed.c.bucket_start == buckets.c.bucket_start)
+        .order_by(buckets.c.bucket_start.asc())
+    )
+
+    rows = db.execute(stmt).all()
+    labels = [r.bucket.date().isoformat() for r in rows]
+    series = {
+        "created": [int(r.created) for r in rows],
+        "completed": [int(r.completed) for r in rows],
+        "open": [int(r.open) for r in rows],
+    }
+    title = "Создано, закрыто и открыто задач"
+
+    if format == "png":
+        df = pd.DataFrame({"bucket": labels, **series})
+        return _df_to_png_lines(df, x_col="bucket", y_cols={"created": "Создано", "completed": "Закрыто",
+                                                             "open": "Открыто"}, title=title)
+    if format == "svg":
+        return Response(render_multi_svg("line", labels, series, title), media_type="image/svg+xml")
+    if format == "spec":
+        return multi_chart_spec("line", labels, series, title)
+
+    return {
+        "bucket": bucket,
+        "items": [
+            {"bucket": label, "created": c, "completed": d, "open": o}
+            for label, c, d, o in zip(labels, series["created"], series["completed"], series["open"])
+        ],
+    }
+
+
+
+# каждый агрегат дашборда - отдельный запрос, возвращающий одно json-значение
+def _dashboard_queries(scope) -> dict:
+    conds = [scope] if scope is not None else []
+
+    st = (
+        select(
+            TaskStatus.code.label("code"),
+            TaskStatus.name.label("name"),
+            TaskStatus.sort_order.label("sort_order"),
+            func.count(Task.id).label("count"),
+        )
+        .select_from(TaskStatus)
+        .outerjoin(Task, and_(Task.status_id == TaskStatus.id, *conds))
+        .group_by(TaskStatus.id)
+        .cte("statuses")
+    )
+    tp = (
+        select(Topic.name.label("topic"), func.count(Task.id).label("count"))
+        .select_from(Topic)
+        .outerjoin(Task, and_(Task.topic_id == Topic.id, *conds))
+        .group_by(Topic.id)
+        .cte("topics")
+    )
+    asg = (
+        select(
+            func.coalesce(User.name, "Без исполнителя").label("assignee"),
+            func.count(Task.id).label("count"),
+        )
+        .select_from(Task)
+        .outerjoin(User, Task.assignee_id == User.id)
+        .where(*conds)
+        .group_by(Task.assignee_id, User.name)
+        .cte("assignees")
+    )
+
+    done_id = select(TaskStatus.id).where(TaskStatus.code == "done").scalar_subquery()
+    done_at = _done_at_subquery(done_id)
+    lead = (
+        select((func.extract("epoch", done_at.c.done_at - Task.created_at) / 3600).label("hours"))
+        .select_from(Task)
+        .join(done_at, Task.id == done_at.c.task_id)
+        .where(*conds)
+        .cte("lead_time")
+    )
+
+    def items(cte, order_by, **fields):
+        obj = func.json_build_object(*(x for name, col in fields.items() for x in (name, col)))
+        return select(func.coalesce(func.json_agg(aggregate_order_by(obj, *order_by)), "[]")).select_from(cte)
+
+    return {
+        "statuses": items(st, [st.c.sort_order.asc()], code=st.c.code, name=st.c.name, count=st.c.count),
+        "topics": items(tp, [tp.c.count.desc(), tp.c.topic.asc()], topic=tp.c.topic, count=tp.c.count),
+        "assignees": items(asg, [asg.c.count.desc(), asg.c.assignee.asc()], assignee=asg.c.assignee,
+                           count=asg.c.count),
+        "lead_time": select(func.json_build_object(
+            "count", func.count(lead.c.hours),
+            "avg_hours", func.avg(lead.c.hours),
+            "median_hours", func.percentile_cont(0.5).within_group(lead.c.hours),
+            "p90_hours", func.percentile_cont(0.9).within_group(lead.c.hours),
+        )).select_from(lead),
+    }
+
+
+def _fetch_on_replica(stmt):
+    with replica_engine.connect() as conn:
+        return conn.execute(stmt).scalar_one()
+
+
+def _with_percent(items: list[dict]) -> dict:
+    total = sum(x["count"] for x in items)
+    for x in items:
+        x["percent"] = round(x["count"] / total * 100, 1) if total else 0.0
+    return {"total": total, "items": items}
+
+
+def _get_replica_pool(workers: int) -> ThreadPoolExecutor:
+    global _replica_pool
+    # под блокировкой: иначе одновременные первые запросы создадут по пулу, и лишние никто не закроет
+    with _replica_pool_lock:
+        if _replica_pool is None:
+            _replica_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dashboard")
+        return _replica_pool
+
+
+def build_dashboard(db: Session, user: User) -> dict:
+    queries = _dashboard_queries(_task_scope_filter(user))
+
+    if replica_engine is not None:
+        # на реплике агрегаты независимы и считаются параллельно на разных соединениях
+        pool = _get_replica_pool(len(queries))
+        futures = {name: pool.submit(_fetch_on_replica, stmt) for name, stmt in queries.items()}
+        raw = {name: f.result() for name, f in futures.items()}
+    else:
+        # без реплики - один запрос с CTE на все агрегаты
+        stmt = select(*(q.scalar_subquery().label(name) for name, q in queries.items()))
+        raw = dict(db.execute(stmt).one()._mapping)
+
+    lead = raw["lead_time"]
+    return {
+        "statuses": _with_percent(raw["statuses"]),
+        "topics": _with_percent(raw["topics"]),
+        "assignees": _with_percent(raw["assignees"]),
+        "lead_time": {
+            "count": lead["count"],
+            **{k: round(float(lead[k]), 2) if lead[k] is not None else None
+               for k in ("avg_hours", "median_hours", "p90_hours")},
+        },
+    }
+
+
+@router.get("/dashboard", summary="Сводный дашборд")
+def analytics_dashboard(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    return build_dashboard(db, user)
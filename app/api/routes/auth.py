@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.core.security import hash_password, verify_password, create_access_token
+from app.db import ref_cache
 from app.db.models import User
 from app.schemas.auth import UserCreate, Token
 
@@ -23,7 +24,7 @@ def register(payload: UserCreate = Depends(UserCreate.as_form), db: Session = De
     )
     db.add(user)
     db.flush()
-    db.refresh(user)
+    ref_cache.invalidate(db, "users")
     return {"id": user.id, "email": user.email}
 
 @router.post("/login", response_model=Token, summary="Логин")
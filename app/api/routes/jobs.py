@@ -0,0 +1,79 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Form, HTTPException, status
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.api.deps_auth import get_current_user
+from app.api.routes.analytics import ChartFormat
+from app.db.models import Job, JobStatus, User, UserRole
+from app.jobs import runner
+from app.schemas.job import JobOut
+
+router = APIRouter(prefix="/jobs", tags=["Фоновые задания"])
+
+AnalyticsName = Literal["statuses", "topics", "assignees", "summary", "burndown", "lead_time",
+                        "time_in_status", "trend", "dashboard"]
+
+def _get_job(db: Session, job_id: int, user: User) -> Job:
+    # статус меняет воркер в другой сессии, поэтому перечитываем строку, а не берём из identity map
+    job = db.get(Job, job_id, populate_existing=True)
+    if not job:
+        raise HTTPException(status_code=404, detail="Задание не найдено")
+    if user.role != UserRole.admin and job.created_by_id != user.id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return job
+
+@router.post("/tasks-export", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED,
+             summary="Выгрузить задачи в фоне")
+def submit_tasks_export(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    format: Literal["csv", "json"] = Form("csv"),
+    status_id: int | None = Form(None),
+    topic_id: int | None = Form(None),
+    assignee_id: int | None = Form(None),
+) -> Job:
+    params = {"format": format, "status_id": status_id, "topic_id": topic_id, "assignee_id": assignee_id}
+    return runner.submit(db, "tasks_export", params, user)
+
+@router.post("/analytics/{name}", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED,
+             summary="Посчитать аналитику в фоне")
+def submit_analytics(
+    name: AnalyticsName,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    format: ChartFormat = Form("png"),
+    date_from: date | None = Form(None),
+    date_to: date | None = Form(None),
+    bucket: Literal["day", "week", "month"] | None = Form(None),
+    group_by: Literal["none", "topic", "assignee"] | None = Form(None),
+) -> Job:
+    args = {"format": format, "date_from": date_from, "date_to": date_to, "bucket": bucket, "group_by": group_by}
+    args = {k: v.isoformat() if isinstance(v, date) else v for k, v in args.items() if v is not None}
+    return runner.submit(db, "analytics", {"name": name, "args": args}, user)
+
+@router.get("/{job_id}", response_model=JobOut, summary="Статус задания")
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> Job:
+    return _get_job(db, job_id, user)
+
+@router.get("/{job_id}/result", summary="Скачать результат задания")
+def get_job_result(
+    job_id: int,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> Response:
+    job = _get_job(db, job_id, user)
+    if job.status == JobStatus.failed:
+        raise HTTPException(status_code=409, detail=f"Задание завершилось ошибкой: {job.error}")
+    if job.status != JobStatus.done:
+        raise HTTPException(status_code=409, detail="Задание ещё не выполнено")
+
+    headers = {"Content-Disposition": f'attachment; filename="{job.result_name}"'} if job.result_name else None
+    return Response(job.result, media_type=job.result_type, headers=headers)
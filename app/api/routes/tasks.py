@@ -1,21 +1,34 @@
-from typing import Literal
+import asyncio
+import json
+from datetime import datetime
+from typing import AsyncIterator, Literal
 
 from fastapi import APIRouter, status, HTTPException, Depends, Query
-from sqlalchemy import select, asc, desc
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, asc, delete, desc, text, tuple_, union_all
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.deps_auth import get_current_user
-from app.db.models import Task, User, UserRole, Topic, TaskStatus, TaskStatusHistory
-from app.schemas.task import TaskOut, TaskCreate, TaskUpdate
+from app.core.config import settings
+from app.core.fast_json import json_response
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db import task_cache, task_events
+from app.db.archive import TASK_COLUMNS
+from app.db.models import (SyncHorizon, Task, TaskArchive, TaskTombstone, User, UserRole, Topic, TaskStatus,
+                           TaskStatusHistory, TaskStatusHistoryArchive)
+from app.db.read_models import TaskRow, fetch, fetch_one, history_entries, select_rows
+from app.schemas.task import TaskChanges, TaskOut, TaskCreate, TaskUpdate
+from app.schemas.task_history import TaskHistoryPage
 from app.schemas.task_status import TaskStatusChange
 
 router = APIRouter(prefix="/tasks", tags=["Задачи"])
 
-def _check_task_access(task: Task, user: User) -> None:
-    if user.role == UserRole.admin:
-        return
-    if task.creator_id != user.id:
+def _can_access_task(creator_id: int, user_id: int, is_admin: bool) -> bool:
+    return is_admin or creator_id == user_id
+
+def _check_task_access(task: Task | TaskArchive | TaskRow, user: User) -> None:
+    if not _can_access_task(task.creator_id, user.id, user.role == UserRole.admin):
         raise HTTPException(status_code=403, detail="Forbidden")
 
 @router.post("", response_model=TaskOut, status_code=status.HTTP_201_CREATED, summary="Создать задачу")
@@ -40,9 +53,21 @@ def create_task(
         raise HTTPException(status_code=400, detail="Исполнитель не найден")
     db.add(task)
     db.flush()
-    db.refresh(task)
     return task
 
+def task_list_filters(model, user: User, status_id: int | None, topic_id: int | None,
+                  assignee_id: int | None) -> list:
+    conds = []
+    if user.role != UserRole.admin:
+        conds.append(model.creator_id == user.id)
+    if status_id is not None:
+        conds.append(model.status_id == status_id)
+    if topic_id is not None:
+        conds.append(model.topic_id == topic_id)
+    if assignee_id is not None:
+        conds.append(model.assignee_id == assignee_id)
+    return conds
+
 @router.get("", response_model=list[TaskOut], summary="Открыть список задач")
 def list_tasks(
     db: Session = Depends(get_db),
@@ -50,44 +75,209 @@ def list_tasks(
     status_id: int | None = None,
     topic_id: int | None = None,
     assignee_id: int | None = None,
+    include_archived: bool = False,
     sort_by: Literal["created_at", "due_date", "priority", "title"] = "created_at",
     sort_dir: Literal["asc", "desc"] = "desc",
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-) -> list[Task]:
-    stmt = select(Task)
+) -> Response:
+    # модели чтения, а не ORM-объекты: ответ собирается без TaskOut на каждую строку,
+    # response_model остаётся для схемы в документации
+    if not include_archived:
+        stmt = select_rows(TaskRow, Task).where(*task_list_filters(Task, user, status_id, topic_id, assignee_id))
+        order_col = getattr(Task, sort_by)
+        stmt = stmt.order_by(asc(order_col) if sort_dir == "asc" else desc(order_col))
+        stmt = stmt.limit(limit).offset(offset)
+        return json_response(fetch(db, TaskRow, stmt))
 
-    if user.role != UserRole.admin:
-        stmt = stmt.where(Task.creator_id == user.id)
+    # архив подмешиваем только по запросу: обычный список читает лишь рабочую таблицу
+    both = union_all(*(
+        select(*(getattr(model, c) for c in TASK_COLUMNS))
+        .where(*task_list_filters(model, user, status_id, topic_id, assignee_id))
+        for model in (Task, TaskArchive)
+    )).subquery()
+    order_col = both.c[sort_by]
+    # id - второй ключ: иначе при равных значениях страницы смешанной выборки пересекаются
+    stmt = (
+        select(both)
+        .order_by(asc(order_col) if sort_dir == "asc" else desc(order_col), both.c.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return json_response(fetch(db, TaskRow, stmt))
 
-    if status_id is not None:
-        stmt = stmt.where(Task.status_id == status_id)
-    if topic_id is not None:
-        stmt = stmt.where(Task.topic_id == topic_id)
-    if assignee_id is not None:
-        stmt = stmt.where(Task.assignee_id == assignee_id)
 
-    order_col = getattr(Task, sort_by)
-    stmt = stmt.order_by(asc(order_col) if sort_dir == "asc" else desc(order_col))
-    stmt = stmt.limit(limit).offset(offset)
 
-    return list(db.execute(stmt).scalars().all())
+@router.delete("", summary="Удалить задачи по id или фильтру")
+def delete_tasks(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    ids: list[int] | None = Query(default=None),
+    status_id: int | None = None,
+    topic_id: int | None = None,
+    assignee_id: int | None = None,
+) -> dict:
+    if not ids and status_id is None and topic_id is None and assignee_id is None:
+        raise HTTPException(status_code=400, detail="Укажите id задач или фильтр")
+
+    # один DELETE ... WHERE: история уходит каскадом в БД, задачи в сессию не загружаются.
+    # Чужие задачи пользователя просто не попадают под условие
+    conds = task_list_filters(Task, user, status_id, topic_id, assignee_id)
+    if ids:
+        conds.append(Task.id.in_(ids))
+    deleted = db.execute(
+        delete(Task).where(*conds).returning(Task.id).execution_options(synchronize_session=False)
+    ).scalars().all()
+    task_cache.invalidate(db, *deleted)
+    return {"deleted": len(deleted)}
+
+
+
+# транзакции с xid не меньше xmin снимка ещё могут зафиксировать изменения с меньшим xid,
+# чем уже закоммиченные, поэтому отдаём только строки ниже этой границы - остальные в следующий раз
+SYNC_HORIZON = text("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+# объявлен до /{task_id}, иначе "changes" разбирался бы как id задачи
+@router.get("/changes", response_model=TaskChanges, summary="Изменения задач с прошлой синхронизации")
+def task_changes(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    token: str | None = None,
+    limit: int = Query(default=200, ge=1, le=1000),
+) -> dict:
+    # токен: позиция (xid, id) и база - позиция, до которой клиент уже был синхронизирован
+    # в начале текущей серии страниц; 0 - полная синхронизация с пустого клиента
+    key = decode_cursor(token, (int, int, int)) if token else (0, 0, 0)
+    if key is None:
+        # токены без базы, выданные до её появления
+        key = decode_cursor(token, (int, int))
+        key = key and (*key, key[0])
+    if key is None:
+        raise HTTPException(status_code=400, detail="Неверный токен синхронизации")
+    cursor, base = key[:2], key[2]
+
+    horizon, purged_xid = db.execute(
+        select(SYNC_HORIZON, select(SyncHorizon.purged_xid).where(SyncHorizon.id == 1).scalar_subquery())
+    ).one()
+    # удалены надгробия не раньше базы клиента (позиция (base, 0) стоит перед всеми строками
+    # транзакции base): про часть удалений он бы не узнал
+    if base and purged_xid is not None and base <= purged_xid:
+        raise HTTPException(status_code=410, detail="Токен синхронизации устарел, нужна полная синхронизация")
+
+    def page(model, id_col):
+        stmt = select(model).where(
+            tuple_(model.change_xid, id_col) > tuple_(*cursor),
+            model.change_xid < horizon,
+        )
+        if user.role != UserRole.admin:
+            stmt = stmt.where(model.creator_id == user.id)
+        stmt = stmt.order_by(model.change_xid, id_col).limit(limit + 1)
+        return [(row.change_xid, getattr(row, id_col.key), row) for row in db.execute(stmt).scalars()]
 
+    # изменения и удаления - один поток в порядке (xid, id)
+    rows = sorted(page(Task, Task.id) + page(TaskTombstone, TaskTombstone.task_id), key=lambda r: r[:2])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
+    if has_more:
+        next_token = encode_cursor(*rows[-1][:2], base)
+    else:
+        last = max(cursor, (horizon, 0))
+        next_token = encode_cursor(*last, last[0])
+    return {
+        "changed": [row for _, _, row in rows if isinstance(row, Task)],
+        "deleted": [task_id for _, task_id, row in rows if isinstance(row, TaskTombstone)],
+        "next_token": next_token,
+        "has_more": has_more,
+    }
+
+async def task_event_stream(user_id: int, is_admin: bool, heartbeat: float) -> AsyncIterator[str]:
+    queue = await asyncio.to_thread(task_events.hub.subscribe, asyncio.get_running_loop())
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # комментарий SSE держит соединение живым через прокси
+                yield ": ping\n\n"
+                continue
+            # те же правила видимости, что у _check_task_access
+            if not _can_access_task(event["creator_id"], user_id, is_admin):
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        task_events.hub.unsubscribe(queue)
+
+# объявлен до /{task_id}, иначе "events" разбирался бы как id задачи
+@router.get("/events", summary="Лента изменений задач (Server-Sent Events)")
+def task_events_feed(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    user_id, is_admin = user.id, user.role == UserRole.admin
+    # соединение с БД потоку не нужно, не держим его на всё время подписки
+    db.close()
+    return StreamingResponse(
+        task_event_stream(user_id, is_admin, settings.TASK_EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+
+# задача из рабочей таблицы, а если её там нет - из архива; второй элемент - нашлась ли в архиве
+def _find_task(db: Session, task_id: int) -> tuple[TaskRow, bool]:
+    task = task_cache.get(db, task_id)
+    if task is not None:
+        return task, False
+    task = fetch_one(db, TaskRow, select_rows(TaskRow, TaskArchive).where(TaskArchive.id == task_id))
+    if task is None:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    return task, True
 
 @router.get("/{task_id}", response_model=TaskOut, summary="Получить задачу")
 def get_task(
     task_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-) -> Task:
-    task = db.get(Task, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Задача не найдена")
-
+) -> TaskRow:
+    task, _ = _find_task(db, task_id)
     _check_task_access(task, user)
     return task
 
+@router.get("/{task_id}/history", response_model=TaskHistoryPage, summary="История статусов задачи")
+def get_task_history(
+    task_id: int,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+) -> dict:
+    task, archived = _find_task(db, task_id)
+    _check_task_access(task, user)
+
+    key = decode_cursor(cursor, (datetime.fromisoformat, int))
+    if cursor and key is None:
+        raise HTTPException(status_code=400, detail="Неверный курсор")
+
+    # новые сверху; страница - отрезок индекса (task_id, changed_at, id) от курсора,
+    # названия статусов и автора - join-ами в том же запросе
+    history = TaskStatusHistoryArchive if archived else TaskStatusHistory
+    stmt = (
+        history_entries(history)
+        .where(history.task_id == task_id)
+        .order_by(history.changed_at.desc(), history.id.desc())
+        .limit(limit + 1)
+    )
+    if key is not None:
+        stmt = stmt.where(tuple_(history.changed_at, history.id) < tuple_(*key))
+
+    rows = db.execute(stmt).mappings().all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]["changed_at"], items[-1]["id"]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.patch("/{task_id}", response_model=TaskOut, summary="Обновить задачу")
 def update_task(
     task_id: int,
@@ -107,7 +297,7 @@ def update_task(
 
     db.add(task)
     db.flush()
-    db.refresh(task)
+    task_cache.invalidate(db, task.id)
     return task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Удалить задачу")
@@ -124,6 +314,7 @@ def delete_task(
 
     db.delete(task)
     db.flush()
+    task_cache.invalidate(db, task_id)
 
 @router.patch("/{task_id}/status", response_model=TaskOut, summary="Изменить статус задачи")
 def change_task_status(
@@ -160,5 +351,5 @@ def change_task_status(
 
     db.add(task)
     db.flush()
-    db.refresh(task)
+    task_cache.invalidate(db, task.id)
     return task
\ No newline at end of file
@@ -4,14 +4,17 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.deps_auth import get_current_user, require_admin
+from app.core.fast_json import json_response
+from app.db import ref_cache, task_cache
 from app.db.models import Topic, User
+from app.db.read_models import TopicRow, fetch, select_rows
 from app.schemas.topic import TopicCreate, TopicOut, TopicUpdate
 
 router = APIRouter(prefix="/topics", tags=["Темы"])
 
 @router.get("", response_model=list[TopicOut], summary="Список тем")
 def list_topics(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return list(db.execute(select(Topic).order_by(Topic.name.asc())).scalars().all())
+    return json_response(fetch(db, TopicRow, select_rows(TopicRow, Topic).order_by(Topic.name.asc())))
 
 @router.post("",
              response_model=TopicOut,
@@ -25,7 +28,7 @@ def create_topic(payload: TopicCreate = Depends(TopicCreate.as_form), db: Sessio
     topic = Topic(name=payload.name, description=payload.description)
     db.add(topic)
     db.flush()
-    db.refresh(topic)
+    ref_cache.invalidate(db, "topics")
     return topic
 
 @router.patch("/{topic_id}", response_model=TopicOut, summary="Обновить тему(только для Админа)")
@@ -40,7 +43,7 @@ def update_topic(topic_id: int, payload: TopicUpdate = Depends(TopicUpdate.as_fo
 
     db.add(topic)
     db.flush()
-    db.refresh(topic)
+    ref_cache.invalidate(db, "topics")
     return topic
 
 @router.delete("/{topic_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Удалить тему(только для Админа)")
@@ -49,4 +52,6 @@ def delete_topic(topic_id: int, db: Session = Depends(get_db), _: User = Depends
     if not topic:
         raise HTTPException(status_code=404, detail="Тема не найдена")
     db.delete(topic)
-    db.flush()
\ No newline at end of file
+    db.flush()
+    ref_cache.invalidate(db, "topics")
+    task_cache.invalidate_all(db)
\ No newline at end of file
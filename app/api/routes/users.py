@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.deps_auth import get_current_user, require_admin
+from app.db import ref_cache
 from app.db.models import User, UserRole
+from app.db.read_models import UserRow, fetch, select_rows
 from app.schemas.user import UserOut, UserRoleUpdate
 from app.core.config import settings
+from app.core.fast_json import json_response
 
 router = APIRouter(prefix="/users", tags=["Пользователи"])
 
@@ -16,7 +18,7 @@ def me(user: User = Depends(get_current_user)):
 
 @router.get("", response_model=list[UserOut], summary="Список пользователей(только для Админа)")
 def list_users(db: Session = Depends(get_db), _: User = Depends(require_admin)):
-    return list(db.execute(select(User).order_by(User.id.asc())).scalars().all())
+    return json_response(fetch(db, UserRow, select_rows(UserRow, User).order_by(User.id.asc())))
 
 @router.patch("/{user_id}/role", response_model=UserOut, summary="Поменять роль(Для теста доступно всем ролям)")
 def change_role(
@@ -36,5 +38,5 @@ def change_role(
     user.role = payload.role
     db.add(user)
     db.flush()
-    db.refresh(user)
+    ref_cache.invalidate(db, "users")
     return user
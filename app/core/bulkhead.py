@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+# Bulkhead для тяжёлой аналитики (pandas/matplotlib): одновременно выполняется не больше capacity
+# таких запросов, остальные ждут в очереди до queue_timeout и получают 503.
+# Синхронные обработчики аналитики и CRUD делят общий пул потоков FastAPI, без ограничения
+# всплеск запросов графиков занимает весь пул и создание задач встаёт в очередь за ними.
+
+
+class BulkheadFull(Exception):
+    pass
+
+
+class Bulkhead:
+    def __init__(self, capacity: int, queue_timeout: float):
+        self.capacity = capacity
+        self.queue_timeout = queue_timeout
+        self.in_use = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self._sem: asyncio.Semaphore | None = None
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.capacity)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise BulkheadFull()
+        finally:
+            self.waiting -= 1
+
+        self.in_use += 1
+        try:
+            yield
+        finally:
+            self.in_use -= 1
+            self.completed += 1
+            self._sem.release()
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "saturation": round(self.in_use / self.capacity, 3),
+            "completed_total": self.completed,
+            "rejected_total": self.rejected,
+        }
+
+
+analytics_bulkhead = Bulkhead(settings.ANALYTICS_CONCURRENCY, settings.ANALYTICS_QUEUE_TIMEOUT_SECONDS)
+
+
+def is_analytics_path(path: str) -> bool:
+    # html-страница /ui/analytics лёгкая, ограничиваем только сами графики
+    return path.startswith(("/analytics", "/ui/analytics/"))
+
+
+class BulkheadMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_analytics_path(scope["path"]):
+            return await self.app(scope, receive, send)
+        try:
+            async with analytics_bulkhead.slot():
+                return await self.app(scope, receive, send)
+        except BulkheadFull:
+            response = JSONResponse(
+                {"detail": "Аналитика перегружена, повторите позже"},
+                status_code=503,
+                headers={"Retry-After": str(max(1, round(analytics_bulkhead.queue_timeout)))},
+            )
+            return await response(scope, receive, send)
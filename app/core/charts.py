@@ -0,0 +1,137 @@
+from html import escape
+from typing import Literal, Sequence
+
+ChartKind = Literal["bar", "line"]
+
+WIDTH = 640
+HEIGHT = 360
+MARGIN_LEFT = 56
+MARGIN_RIGHT = 16
+MARGIN_TOP = 36
+MARGIN_BOTTOM = 96
+Y_TICKS = 5
+COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728")
+
+
+# matplotlib тяжёлый, поэтому грузим его только когда действительно нужен png
+def load_pyplot():
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+    return plt
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _nice_max(value: float) -> float:
+    if value <= 0:
+        return 1.0
+    step = 10 ** len(str(int(value))) / 10
+    for mult in (1, 2, 2.5, 5, 10):
+        if value <= step * mult:
+            return step * mult
+    return value
+
+
+def histogram(values: Sequence[float], bins: int = 20) -> tuple[list[str], list[int]]:
+    values = [float(v) for v in values if v is not None and v == v]
+    if not values:
+        return [], []
+    lo, hi = min(values), max(values)
+    if lo == hi:
+        return [_fmt(lo)], [len(values)]
+    width = (hi - lo) / bins
+    counts = [0] * bins
+    for v in values:
+        counts[min(int((v - lo) / width), bins - 1)] += 1
+    labels = [f"{_fmt(lo + i * width)}–{_fmt(lo + (i + 1) * width)}" for i in range(bins)]
+    return labels, counts
+
+
+def chart_spec(kind: ChartKind, labels: Sequence, values: Sequence[float], title: str,
+               series: str = "value") -> dict:
+    return multi_chart_spec(kind, labels, {series: values}, title)
+
+
+def multi_chart_spec(kind: ChartKind, labels: Sequence, series: dict[str, Sequence[float]], title: str) -> dict:
+    return {
+        "type": kind,
+        "title": title,
+        "labels": [str(x) for x in labels],
+        "series": [{"name": name, "values": [float(v) for v in values]} for name, values in series.items()],
+    }
+
+
+def render_svg(kind: ChartKind, labels: Sequence, values: Sequence[float], title: str) -> str:
+    return render_multi_svg(kind, labels, {"": values}, title)
+
+
+# несколько рядов: линии разных цветов или сгруппированные столбцы, подписи рядов - в легенде
+def render_multi_svg(kind: ChartKind, labels: Sequence, series: dict[str, Sequence[float]], title: str) -> str:
+    labels = [str(x) for x in labels]
+    series = {name: [float(v) for v in values] for name, values in series.items()}
+
+    plot_w = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_h = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    y_max = _nice_max(max((v for values in series.values() for v in values), default=0.0))
+    n = max(len(labels), 1)
+    slot = plot_w / n
+
+    def x_at(i: int) -> float:
+        return MARGIN_LEFT + slot * i + slot / 2
+
+    def y_at(v: float) -> float:
+        return MARGIN_TOP + plot_h - (max(v, 0.0) / y_max) * plot_h
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+        f'viewBox="0 0 {WIDTH} {HEIGHT}" font-family="Arial, sans-serif" font-size="11">',
+        f'<text x="{WIDTH / 2}" y="20" text-anchor="middle" font-size="14">{escape(title)}</text>',
+    ]
+
+    # ось Y с сеткой
+    for i in range(Y_TICKS + 1):
+        v = y_max * i / Y_TICKS
+        y = y_at(v)
+        parts.append(f'<line x1="{MARGIN_LEFT}" y1="{y:.1f}" x2="{WIDTH - MARGIN_RIGHT}" y2="{y:.1f}" stroke="#e5e5e5"/>')
+        parts.append(f'<text x="{MARGIN_LEFT - 6}" y="{y + 4:.1f}" text-anchor="end">{_fmt(v)}</text>')
+
+    for k, (name, values) in enumerate(series.items()):
+        color = COLORS[k % len(COLORS)]
+        if kind == "bar":
+            bar_w = slot * 0.8 / len(series)
+            for i, v in enumerate(values):
+                y = y_at(v)
+                x = x_at(i) - slot * 0.4 + bar_w * k
+                parts.append(
+                    f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_w:.1f}" height="{MARGIN_TOP + plot_h - y:.1f}" '
+                    f'fill="{color}"><title>{escape(labels[i])}: {_fmt(v)}</title></rect>'
+                )
+        else:
+            points = " ".join(f"{x_at(i):.1f},{y_at(v):.1f}" for i, v in enumerate(values))
+            parts.append(f'<polyline points="{points}" fill="none" stroke="{color}" stroke-width="2"/>')
+            for i, v in enumerate(values):
+                parts.append(
+                    f'<circle cx="{x_at(i):.1f}" cy="{y_at(v):.1f}" r="3" fill="{color}">'
+                    f'<title>{escape(labels[i])}: {_fmt(v)}</title></circle>'
+                )
+        if name:
+            ly = MARGIN_TOP + 12 * k
+            parts.append(f'<rect x="{WIDTH - MARGIN_RIGHT - 110}" y="{ly - 8}" width="10" height="10" fill="{color}"/>')
+            parts.append(f'<text x="{WIDTH - MARGIN_RIGHT - 96}" y="{ly + 1}">{escape(name)}</text>')
+
+    # подписи по оси X: при большом числе точек выводим не каждую
+    base_y = MARGIN_TOP + plot_h
+    parts.append(f'<line x1="{MARGIN_LEFT}" y1="{base_y}" x2="{WIDTH - MARGIN_RIGHT}" y2="{base_y}" stroke="#333"/>')
+    every = max(1, -(-len(labels) // 30))
+    for i in range(0, len(labels), every):
+        x = x_at(i)
+        parts.append(
+            f'<text x="{x:.1f}" y="{base_y + 12}" text-anchor="end" '
+            f'transform="rotate(-35 {x:.1f} {base_y + 12})">{escape(labels[i])}</text>'
+        )
+
+    parts.append("</svg>")
+    return "".join(parts)
@@ -1,11 +1,48 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # реплика только для чтения; если задана, тяжёлая аналитика считается на ней
+    REPLICA_DATABASE_URL: str | None = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     ALLOW_ROLE_SELF_ASSIGN: bool = False
+    # время жизни кэша справочников для UI (0 - без кэша)
+    REFERENCE_CACHE_TTL_SECONDS: int = 300
+    # кэш задач по id для чтения одной задачи: сколько снимков держать и сколько секунд (0 - без кэша);
+    # между процессами сбрасывается через NOTIFY task_changes, TTL - страховка
+    TASK_CACHE_SIZE: int = 10_000
+    TASK_CACHE_TTL_SECONDS: int = 30
+    # партиции истории статусов: сколько месяцев создавать заранее и сколько хранить (None - всегда)
+    HISTORY_PARTITIONS_AHEAD: int = 3
+    HISTORY_RETENTION_MONTHS: int | None = None
+    # архив: завершённые задачи старше стольких дней переносятся в tasks_archive пачками
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+    # сколько дней хранить надгробия удалённых задач для GET /tasks/changes; клиент,
+    # не синхронизировавшийся дольше, получает 410 и делает полную синхронизацию
+    TOMBSTONE_RETENTION_DAYS: int = 30
+    # фоновые задания: сколько заданий каждого типа выполняется одновременно в процессе
+    JOB_CONCURRENCY: dict[str, int] = {"tasks_export": 2, "analytics": 2}
+    # задание в статусе running дольше стольких секунд считается потерянным (процесс упал) и при
+    # старте помечается failed; завершённые задания с результатом удаляются через столько часов
+    JOB_LEASE_SECONDS: int = 3600
+    JOB_RESULT_TTL_HOURS: int = 24
+    # лента изменений задач: как часто слать keep-alive, если событий нет
+    TASK_EVENTS_HEARTBEAT_SECONDS: int = 15
+    # лимит запросов на пользователя (анонима - на IP) по классам маршрутов:
+    # класс -> (запросов в секунду, допустимый всплеск); классы см. app/core/rate_limit.py
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMITS: dict[str, tuple[float, int]] = {"analytics": (0.5, 10), "tasks": (10, 50), "default": (20, 100)}
+    # memory - вёдра в памяти процесса, postgres - общие для всех воркеров
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    # сколько запросов аналитики (/analytics/*, графики UI) выполняется одновременно
+    # и сколько секунд остальные ждут своей очереди, прежде чем получить 503
+    ANALYTICS_CONCURRENCY: int = 4
+    ANALYTICS_QUEUE_TIMEOUT_SECONDS: float = 10
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,43 @@
+import dataclasses
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterable, Sequence
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # необязательная зависимость, без неё работает обычный json
+    orjson = None
+
+# Быстрая отдача списков: тело ответа собирается прямо из строк выборки (кортежей колонок
+# или моделей чтения app/db/read_models.py), без ORM-объектов, без валидации каждой строки
+# через pydantic и без jsonable_encoder. Данные из своей базы уже проверены при записи.
+# Формат совпадает с ответом через response_model: даты в ISO, UTC с суффиксом Z, enum - значением.
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if dataclasses.is_dataclass(value):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    raise TypeError(f"{type(value).__name__} не сериализуется в JSON")
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+def rows_to_dicts(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict]:
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def json_response(data: Any, status_code: int = 200) -> Response:
+    return Response(dumps(data), status_code=status_code, media_type="application/json")
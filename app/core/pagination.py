@@ -0,0 +1,27 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+# Курсор для keyset-пагинации: значения ключа сортировки последней строки страницы.
+# Следующая страница выбирается условием (ключ) < (курсор) по индексу, а не через OFFSET,
+# поэтому её стоимость не зависит от того, насколько далеко пролистали.
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# parsers - по функции разбора на каждое значение ключа; битый курсор -> None
+def decode_cursor(token: str | None, parsers: Sequence[Callable[[Any], Any]]) -> tuple | None:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(parsers):
+            return None
+        return tuple(parse(v) for parse, v in zip(parsers, values))
+    except (ValueError, TypeError):
+        return None
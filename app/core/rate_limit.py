@@ -0,0 +1,154 @@
+import logging
+import math
+import threading
+import time
+
+from jose import jwt, JWTError
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+# Ограничение частоты запросов: token bucket на пару (пользователь, класс маршрутов).
+# Ведро пополняется со скоростью rate токенов в секунду до burst, каждый запрос забирает один токен.
+# Пользователь берётся из JWT (заголовок или cookie UI) без похода в базу, анонимы считаются по IP.
+
+logger = logging.getLogger(__name__)
+
+# при таком числе ключей в памяти из словаря выкидываются давно полные вёдра
+_MAX_KEYS = 10_000
+
+
+def route_class(path: str) -> str:
+    if path.startswith(("/analytics", "/ui/analytics")):
+        return "analytics"
+    if path.startswith(("/tasks", "/ui/tasks")):
+        return "tasks"
+    return "default"
+
+
+def client_identity(scope: dict) -> str:
+    headers = dict(scope.get("headers") or [])
+    token = None
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    if auth.lower().startswith("bearer "):
+        token = auth[7:]
+    else:
+        for part in headers.get(b"cookie", b"").decode("latin-1").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "access_token":
+                token = value
+    if token:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            return f"user:{int(payload.get('sub'))}"
+        except (JWTError, TypeError, ValueError):
+            pass
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class MemoryBuckets:
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """Забирает токен; возвращает 0 или сколько секунд ждать следующего."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                if len(self._buckets) > _MAX_KEYS:
+                    self._prune(now, rate, burst)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def _prune(self, now: float, rate: float, burst: int) -> None:
+        idle = burst / rate
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < idle}
+
+
+# одна атомарная операция на запрос: пополнение и списание в upsert,
+# при нехватке токенов WHERE не даёт обновить строку и RETURNING пуст
+_TAKE_SQL = text("""
+    INSERT INTO rate_limit_buckets AS b (key, tokens, updated_at)
+    VALUES (:key, :burst - 1, clock_timestamp())
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = LEAST(:burst, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate) - 1,
+        updated_at = clock_timestamp()
+    WHERE LEAST(:burst, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate) >= 1
+    RETURNING b.tokens
+""")
+_PEEK_SQL = text("""
+    SELECT LEAST(:burst, tokens + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * :rate)
+    FROM rate_limit_buckets WHERE key = :key
+""")
+
+
+class PostgresBuckets:
+    """Общие для всех воркеров вёдра в таблице rate_limit_buckets."""
+
+    def __init__(self, engine=None):
+        self.engine = engine
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        params = {"key": key, "rate": rate, "burst": burst}
+        with self._engine().begin() as conn:
+            if conn.execute(_TAKE_SQL, params).first() is not None:
+                return 0.0
+            tokens = conn.execute(_PEEK_SQL, params).scalar() or 0.0
+        return max((1 - float(tokens)) / rate, 0.0)
+
+    def clear(self) -> None:
+        with self._engine().begin() as conn:
+            conn.execute(text("DELETE FROM rate_limit_buckets"))
+
+    def _engine(self):
+        if self.engine is None:
+            from app.db.session import engine
+            self.engine = engine
+        return self.engine
+
+
+memory_buckets = MemoryBuckets()
+postgres_buckets = PostgresBuckets()
+
+
+class RateLimitMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        cls = route_class(scope["path"])
+        rate, burst = settings.RATE_LIMITS.get(cls) or settings.RATE_LIMITS["default"]
+        key = f"{cls}:{client_identity(scope)}"
+        if settings.RATE_LIMIT_BACKEND == "postgres":
+            try:
+                retry_after = await run_in_threadpool(postgres_buckets.take, key, rate, burst)
+            except Exception:
+                # недоступная база не должна превращаться в отказ всем запросам
+                logger.exception("Не удалось проверить лимит запросов")
+                retry_after = 0.0
+        else:
+            retry_after = memory_buckets.take(key, rate, burst)
+
+        if retry_after > 0:
+            response = JSONResponse(
+                {"detail": "Слишком много запросов, повторите позже"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            return await response(scope, receive, send)
+        return await self.app(scope, receive, send)
@@ -0,0 +1,131 @@
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import task_cache
+from app.db.models import (SyncHorizon, Task, TaskArchive, TaskStatus, TaskStatusHistory, TaskStatusHistoryArchive,
+                           TaskTombstone)
+
+# Перенос давно завершённых задач вместе с историей в холодные таблицы.
+# Запускается по расписанию: python -m app.db.archive
+# Каждая пачка - отдельная транзакция, чтобы не держать долгие блокировки на tasks.
+# Тем же запуском удаляются надгробия старше TOMBSTONE_RETENTION_DAYS.
+
+TASK_COLUMNS = ("id", "title", "description", "status_id", "topic_id", "creator_id", "assignee_id",
+                "priority", "due_date", "created_at", "updated_at")
+HISTORY_COLUMNS = ("id", "task_id", "from_status_id", "to_status_id", "changed_by_id", "changed_at")
+
+
+def _pick_batch(db: Session, cutoff: datetime, batch_size: int) -> list[int]:
+    terminal = select(TaskStatus.id).where(TaskStatus.is_terminal.is_(True))
+    # завершена тогда, когда впервые перешла в конечный статус (как в аналитике),
+    # поздние правки задачи архивацию не откладывают
+    done_at = (
+        select(
+            TaskStatusHistory.task_id.label("task_id"),
+            func.min(TaskStatusHistory.changed_at).label("done_at"),
+        )
+        .where(TaskStatusHistory.to_status_id.in_(terminal), TaskStatusHistory.changed_at < cutoff)
+        .group_by(TaskStatusHistory.task_id)
+        .subquery()
+    )
+    # для старых задач без записи о переходе остаётся только updated_at
+    stmt = (
+        select(Task.id)
+        .outerjoin(done_at, done_at.c.task_id == Task.id)
+        .where(
+            Task.status_id.in_(terminal),
+            or_(done_at.c.done_at.is_not(None),
+                and_(~exists().where(TaskStatusHistory.task_id == Task.id,
+                                     TaskStatusHistory.to_status_id.in_(terminal)),
+                     Task.updated_at < cutoff)),
+        )
+        .order_by(Task.id)
+        .limit(batch_size)
+        .with_for_update(of=Task, skip_locked=True)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    ids = _pick_batch(db, cutoff, batch_size)
+    if not ids:
+        return 0
+
+    db.execute(insert(TaskArchive).from_select(
+        TASK_COLUMNS,
+        select(*(getattr(Task, c) for c in TASK_COLUMNS)).where(Task.id.in_(ids)),
+    ))
+    # историю переносим до удаления задач, иначе её заберёт ON DELETE CASCADE
+    moved = (
+        delete(TaskStatusHistory)
+        .where(TaskStatusHistory.task_id.in_(ids))
+        .returning(*(getattr(TaskStatusHistory, c) for c in HISTORY_COLUMNS))
+        .cte("moved_history")
+    )
+    db.execute(insert(TaskStatusHistoryArchive).from_select(HISTORY_COLUMNS, select(moved)))
+    # задача не удалена, а перенесена: триггеры tasks не пишут надгробие для синхронизации
+    # и шлют в ленту событие archived вместо deleted (см. app/db/models/task.py)
+    db.execute(text("SET LOCAL app.archiving = 'on'"))
+    db.execute(delete(Task).where(Task.id.in_(ids)).execution_options(synchronize_session=False))
+    db.execute(text("SET LOCAL app.archiving = 'off'"))
+    # снимок рабочей задачи направил бы чтение истории не в ту таблицу;
+    # кэш другого процесса (если архивация запущена отдельно) устареет не дольше TASK_CACHE_TTL_SECONDS
+    task_cache.invalidate(db, *ids)
+    return len(ids)
+
+
+def archive_done_tasks(db: Session, older_than_days: int, batch_size: int,
+                       now: datetime | None = None) -> int:
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=older_than_days)
+    total = 0
+    while True:
+        moved = archive_batch(db, cutoff, batch_size)
+        db.commit()
+        total += moved
+        if moved < batch_size:
+            return total
+
+
+# надгробия нужны только клиентам, синхронизировавшимся после удаления; граница очистки
+# запоминается, чтобы GET /tasks/changes отвечал 410 клиентам, которые могли пропустить удаления
+def purge_tombstones(db: Session, older_than_days: int, now: datetime | None = None) -> int:
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=older_than_days)
+    purged = (
+        delete(TaskTombstone)
+        .where(TaskTombstone.deleted_at < cutoff)
+        .returning(TaskTombstone.change_xid)
+        .cte("purged")
+    )
+    count, max_xid = db.execute(select(func.count(), func.max(purged.c.change_xid)).select_from(purged)).one()
+    if count:
+        stmt = pg_insert(SyncHorizon).values(id=1, purged_xid=max_xid)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[SyncHorizon.id],
+            set_={"purged_xid": func.greatest(SyncHorizon.purged_xid, stmt.excluded.purged_xid)},
+        ))
+    db.commit()
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Перенос завершённых задач в архив")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--tombstone-retention-days", type=int, default=settings.TOMBSTONE_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        total = archive_done_tasks(db, args.older_than_days, args.batch_size)
+        purged = purge_tombstones(db, args.tombstone_retention_days)
+    print(f"перенесено задач: {total}, удалено надгробий: {purged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,5 +3,11 @@ from .task import Task
 from .topic import Topic
 from .task_status import TaskStatus
 from .task_status_history import TaskStatusHistory
+from .task_archive import TaskArchive, TaskStatusHistoryArchive
+from .job import Job, JobStatus
+from .task_tombstone import TaskTombstone, SyncHorizon
+from .rate_limit_bucket import RateLimitBucket
 
-__all__ = ["User", "UserRole", "Task", "Topic", "TaskStatus", "TaskStatusHistory"]
\ No newline at end of file
+__all__ = ["User", "UserRole", "Task", "Topic", "TaskStatus", "TaskStatusHistory",
+           "TaskArchive", "TaskStatusHistoryArchive", "Job", "JobStatus",
+           "TaskTombstone", "SyncHorizon", "RateLimitBucket"]
\ No newline at end of file
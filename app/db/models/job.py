@@ -0,0 +1,44 @@
+import enum
+from sqlalchemy import String, Text, LargeBinary, DateTime, Enum, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+# фоновое задание (выгрузка, тяжёлый график), выполняется вне запроса, см. app/jobs
+class Job(Base):
+    __tablename__ = "jobs"
+    # при старте подбираем задания из очереди
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        # очистка завершённых заданий по сроку хранения
+        Index("ix_jobs_finished_at", "finished_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, name="job_status"),
+        nullable=False,
+        default=JobStatus.queued,
+        server_default=JobStatus.queued.value,
+    )
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    # задания пользователя удаляются вместе с ним
+    created_by_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"),
+                                               nullable=False, index=True)
+
+    # результат грузится только при скачивании, опрос статуса его не читает
+    result: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    result_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    result_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at: Mapped["DateTime | None"] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped["DateTime | None"] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import String, Float, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# общее состояние лимитов запросов для нескольких воркеров (RATE_LIMIT_BACKEND=postgres),
+# см. app/core/rate_limit.py; UNLOGGED - после сбоя вёдра просто начинаются заново
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,9 +1,23 @@
-from sqlalchemy import String, Text, SmallInteger, Date, DateTime, ForeignKey, func, text
+from sqlalchemy import DDL, BigInteger, FetchedValue, String, Text, SmallInteger, Date, DateTime, ForeignKey, Index, event, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
+# id текущей транзакции (xid8 без переполнения) как bigint
+CURRENT_XID = "pg_current_xact_id()::text::bigint"
+
 class Task(Base):
     __tablename__ = "tasks"
+    # порядок списка задач в UI и ключ его keyset-пагинации
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # инкрементальная синхронизация (GET /tasks/changes): всех задач и задач одного автора
+        Index("ix_tasks_change_xid_id", "change_xid", "id"),
+        Index("ix_tasks_creator_id_change_xid_id", "creator_id", "change_xid", "id"),
+    )
+
+    # серверные значения (created_at, updated_at, change_xid) возвращаются самим INSERT/UPDATE ... RETURNING,
+    # без повторного SELECT после flush
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
@@ -28,11 +42,84 @@ class Task(Base):
                                                    server_default=func.now(),
                                                    onupdate=func.now(),
                                                    nullable=False)
+    # транзакция, последней изменившая задачу; на UPDATE выставляется триггером ниже
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default=text(CURRENT_XID),
+                                            server_onupdate=FetchedValue(), nullable=False)
 
     # orm связи
     status = relationship("TaskStatus", back_populates="tasks")
     topic = relationship("Topic", back_populates="tasks")
     creator = relationship("User", back_populates="created_tasks", foreign_keys=[creator_id])
     assignee = relationship("User", back_populates="assigned_tasks", foreign_keys=[assignee_id])
-    # История статусов удалится вместе с задачей
-    history = relationship("TaskStatusHistory", back_populates="task", cascade="all, delete-orphan")
\ No newline at end of file
+    # История статусов удалится вместе с задачей: это делает ON DELETE CASCADE в БД,
+    # поэтому при удалении задачи ORM не загружает историю в сессию
+    history = relationship("TaskStatusHistory", back_populates="task", cascade="all, delete-orphan",
+                           passive_deletes=True)
+
+# перенос задачи в архив (app/db/archive.py) - не удаление: задача по-прежнему доступна по id.
+# Архивация включает флаг на свою транзакцию (SET LOCAL app.archiving = 'on'), триггеры видят его
+ARCHIVING_FLAG = "current_setting('app.archiving', true) = 'on'"
+
+# уведомление о каждом изменении задачи (LISTEN task_changes, см. app/db/task_events.py);
+# NOTIFY доставляется только после коммита транзакции
+NOTIFY_TASK_CHANGE_SQL = f"""
+CREATE OR REPLACE FUNCTION notify_task_change() RETURNS trigger AS $$
+DECLARE
+    rec tasks;
+    kind text;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        rec := OLD;
+        kind := CASE WHEN {ARCHIVING_FLAG} THEN 'archived' ELSE 'deleted' END;
+    ELSE
+        rec := NEW;
+        IF TG_OP = 'INSERT' THEN
+            kind := 'created';
+        ELSIF OLD.status_id IS DISTINCT FROM NEW.status_id THEN
+            kind := 'status_changed';
+        ELSE
+            kind := 'updated';
+        END IF;
+    END IF;
+    PERFORM pg_notify('task_changes', json_build_object(
+        'type', kind, 'id', rec.id, 'creator_id', rec.creator_id, 'status_id', rec.status_id
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_notify_change
+AFTER INSERT OR UPDATE OR DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION notify_task_change();
+"""
+
+# версия строки для синхронизации и надгробие для удалённой задачи (см. GET /tasks/changes)
+TASK_SYNC_SQL = f"""
+CREATE OR REPLACE FUNCTION task_sync_touch() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := {CURRENT_XID};
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION task_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    -- архивная задача у клиента остаётся как есть, она не изменилась
+    IF {ARCHIVING_FLAG} THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO task_tombstones (task_id, creator_id, change_xid) VALUES (OLD.id, OLD.creator_id, {CURRENT_XID});
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_sync_touch BEFORE UPDATE ON tasks
+FOR EACH ROW EXECUTE FUNCTION task_sync_touch();
+
+CREATE TRIGGER tasks_sync_tombstone AFTER DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION task_sync_tombstone();
+"""
+
+event.listen(Task.__table__, "after_create", DDL(NOTIFY_TASK_CHANGE_SQL))
+event.listen(Task.__table__, "after_create", DDL(TASK_SYNC_SQL))
+
@@ -0,0 +1,38 @@
+from sqlalchemy import String, Text, SmallInteger, Date, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# Холодные копии завершённых задач и их истории (см. app/db/archive.py).
+# Колонки повторяют tasks / task_status_history, id сохраняются.
+
+class TaskArchive(Base):
+    __tablename__ = "tasks_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status_id: Mapped[int] = mapped_column(ForeignKey("task_statuses.id", ondelete="RESTRICT"), nullable=False)
+    topic_id: Mapped[int | None] = mapped_column(ForeignKey("topics.id", ondelete="SET NULL"), nullable=True)
+    creator_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="RESTRICT"),
+                                            nullable=False, index=True)
+    assignee_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    due_date: Mapped["Date | None"] = mapped_column(Date, nullable=True)
+    created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TaskStatusHistoryArchive(Base):
+    __tablename__ = "task_status_history_archive"
+    __table_args__ = (
+        Index("ix_task_status_history_archive_task_id_changed_at_id", "task_id", "changed_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks_archive.id", ondelete="CASCADE"), nullable=False)
+    from_status_id: Mapped[int | None] = mapped_column(ForeignKey("task_statuses.id", ondelete="SET NULL"),
+                                                       nullable=True)
+    to_status_id: Mapped[int] = mapped_column(ForeignKey("task_statuses.id", ondelete="RESTRICT"), nullable=False)
+    changed_by_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
+    changed_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
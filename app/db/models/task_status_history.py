@@ -1,24 +1,70 @@
-from sqlalchemy import DateTime, ForeignKey, func
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
 class TaskStatusHistory(Base):
     __tablename__ = "task_status_history"
+    # выборка истории задачи по времени (оконные функции в аналитике, GET /tasks/{id}/history - keyset
+    # по (changed_at, id)), заменяет индекс по task_id
+    # таблица партиционирована по месяцам changed_at (см. app/db/partitions.py),
+    # поэтому changed_at входит в первичный ключ
+    __table_args__ = (
+        Index("ix_task_status_history_task_id_changed_at_id", "task_id", "changed_at", "id"),
+        # лента активности (GET /activity): новые сверху по всем задачам, по автору перехода,
+        # по автору, теме и исполнителю задачи - ограниченный обратный проход по индексу
+        Index("ix_task_status_history_changed_at_id", "changed_at", "id"),
+        Index("ix_task_status_history_changed_by_id_changed_at_id", "changed_by_id", "changed_at", "id"),
+        Index("ix_task_status_history_creator_id_changed_at_id", "creator_id", "changed_at", "id"),
+        Index("ix_task_status_history_topic_id_changed_at_id", "topic_id", "changed_at", "id"),
+        Index("ix_task_status_history_assignee_id_changed_at_id", "assignee_id", "changed_at", "id"),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"),
-                                         nullable=False, index=True)
+                                         nullable=False)
     # может быть null для первой установки статуса
     from_status_id: Mapped[int | None] = mapped_column(ForeignKey("task_statuses.id", ondelete="SET NULL"),
                                                        nullable=True)
     to_status_id: Mapped[int] = mapped_column(ForeignKey("task_statuses.id", ondelete="RESTRICT"),
                                               nullable=False)
     changed_by_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="RESTRICT"),
-                                               nullable=False, index=True)
-    changed_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+                                               nullable=False)
+    changed_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(),
+                                                   nullable=False, primary_key=True)
+    # снимок автора, темы и исполнителя задачи на момент перехода, заполняется триггером ниже;
+    # без внешних ключей - это история, а не ссылки на текущие строки
+    creator_id: Mapped[int | None] = mapped_column(nullable=True)
+    topic_id: Mapped[int | None] = mapped_column(nullable=True)
+    assignee_id: Mapped[int | None] = mapped_column(nullable=True)
 
     task = relationship("Task", back_populates="history")
     changed_by = relationship("User", back_populates="status_changes", foreign_keys=[changed_by_id])
     # две связи на одну таблицу статусов
     from_status = relationship("TaskStatus", foreign_keys=[from_status_id])
-    to_status = relationship("TaskStatus", foreign_keys=[to_status_id])
\ No newline at end of file
+    to_status = relationship("TaskStatus", foreign_keys=[to_status_id])
+
+# строки вне созданных помесячных партиций попадают сюда
+event.listen(
+    TaskStatusHistory.__table__,
+    "after_create",
+    DDL("CREATE TABLE task_status_history_default PARTITION OF task_status_history DEFAULT"),
+)
+
+# поля задачи для ленты активности; кто передал их сам (генератор данных), тот обходится без запроса
+HISTORY_TASK_SNAPSHOT_SQL = """
+CREATE OR REPLACE FUNCTION history_task_snapshot() RETURNS trigger AS $$
+BEGIN
+    IF NEW.creator_id IS NULL THEN
+        SELECT creator_id, topic_id, assignee_id INTO NEW.creator_id, NEW.topic_id, NEW.assignee_id
+        FROM tasks WHERE id = NEW.task_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER task_status_history_task_snapshot BEFORE INSERT ON task_status_history
+FOR EACH ROW EXECUTE FUNCTION history_task_snapshot();
+"""
+
+event.listen(TaskStatusHistory.__table__, "after_create", DDL(HISTORY_TASK_SNAPSHOT_SQL))
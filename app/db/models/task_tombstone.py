@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, DateTime, Index, SmallInteger, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# след удалённой задачи для инкрементальной синхронизации клиентов;
+# пишется триггером на tasks, внешних ключей нет - задачи и автора уже может не быть
+class TaskTombstone(Base):
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_change_xid_task_id", "change_xid", "task_id"),
+        Index("ix_task_tombstones_creator_id_change_xid_task_id", "creator_id", "change_xid", "task_id"),
+    )
+
+    task_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    creator_id: Mapped[int] = mapped_column(nullable=False)
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# граница очистки надгробий (app/db/archive.py, purge_tombstones): надгробия с change_xid
+# не больше purged_xid удалены, клиент со старой базой синхронизации мог пропустить удаления.
+# Одна строка с id = 1; пока очистки не было, строки нет
+class SyncHorizon(Base):
+    __tablename__ = "sync_horizon"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    purged_xid: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,115 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import Connection, text
+
+from app.core.config import settings
+
+# Помесячные партиции task_status_history (PARTITION BY RANGE (changed_at)).
+# Запускается по расписанию: python -m app.db.partitions
+#   - заранее создаёт партиции на ближайшие месяцы;
+#   - отсоединяет (или удаляет) партиции старше срока хранения.
+
+PARENT = "task_status_history"
+DEFAULT_PARTITION = f"{PARENT}_default"
+LOCK_TIMEOUT = "5s"
+
+
+def month_start(day: date, shift: int = 0) -> date:
+    month = day.year * 12 + day.month - 1 + shift
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def partition_name(start: date) -> str:
+    return f"{PARENT}_p{start.year:04d}_{start.month:02d}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)"
+    ), {"name": PARENT}).first())
+
+
+def list_partitions(conn: Connection) -> list[str]:
+    return list(conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:name) ORDER BY c.relname"
+    ), {"name": PARENT}).scalars())
+
+
+def create_partition(conn: Connection, start: date) -> str:
+    end = month_start(start, 1)
+    name = partition_name(start)
+    # строки за этот месяц могли попасть в default-партицию - переносим их до присоединения,
+    # иначе ATTACH PARTITION завершится ошибкой
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    if DEFAULT_PARTITION in list_partitions(conn):
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE changed_at >= :start AND changed_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), {"start": start, "end": end})
+    conn.execute(text(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    return name
+
+
+def ensure_future_partitions(conn: Connection, months_ahead: int, today: date | None = None) -> list[str]:
+    if not is_partitioned(conn):
+        return []
+    today = today or date.today()
+    existing = set(list_partitions(conn))
+    created = []
+    for shift in range(months_ahead + 1):
+        start = month_start(today, shift)
+        if partition_name(start) not in existing:
+            created.append(create_partition(conn, start))
+    return created
+
+
+def detach_old_partitions(conn: Connection, retention_months: int, drop: bool = False,
+                          today: date | None = None) -> list[str]:
+    if not is_partitioned(conn):
+        return []
+    # храним текущий месяц и retention_months предыдущих
+    cutoff = partition_name(month_start(today or date.today(), -retention_months))
+    prefix = f"{PARENT}_p"
+    old = [name for name in list_partitions(conn) if name.startswith(prefix) and name < cutoff]
+    # DETACH берёт ACCESS EXCLUSIVE на всю task_status_history, а CONCURRENTLY недоступен
+    # из-за default-партиции. Блокировка держится до конца транзакции, но сама операция
+    # мгновенная; lock_timeout не даёт ей встать в очередь за долгим запросом и
+    # заблокировать за собой все чтения и записи истории - лучше упасть и повторить позже
+    if old:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    for name in old:
+        conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+    return old
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Обслуживание партиций истории статусов")
+    parser.add_argument("--months-ahead", type=int, default=settings.HISTORY_PARTITIONS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=settings.HISTORY_RETENTION_MONTHS)
+    parser.add_argument("--drop", action="store_true", help="удалять старые партиции, а не только отсоединять")
+    args = parser.parse_args()
+
+    from app.db.session import engine
+
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            raise SystemExit(f"Таблица {PARENT} не партиционирована, сначала примените миграции")
+        for name in ensure_future_partitions(conn, args.months_ahead):
+            print(f"создана {name}")
+    # отдельной короткой транзакцией, чтобы эксклюзивная блокировка не держалась дольше нужного
+    if args.retention_months is not None:
+        with engine.begin() as conn:
+            for name in detach_old_partitions(conn, args.retention_months, drop=args.drop):
+                print(f"{'удалена' if args.drop else 'отсоединена'} {name}")
+
+
+if __name__ == "__main__":
+    main()
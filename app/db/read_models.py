@@ -0,0 +1,105 @@
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import TypeVar
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session, aliased
+
+from app.db.models import Task, TaskStatus, Topic, User, UserRole
+
+# Модели чтения для горячих GET: выборка явных колонок через core select() в компактные
+# dataclass со __slots__. В отличие от ORM-объектов они не попадают в identity map сессии,
+# не отслеживают изменения и не несут прокси связей - на строку меньше памяти и CPU
+# (замер: python -m benchmarks.read_models). Поля совпадают по именам с колонками модели.
+
+R = TypeVar("R")
+
+
+# порядок полей как в app.db.archive.TASK_COLUMNS: строки UNION с архивом разбираются по позиции
+@dataclass(slots=True, frozen=True)
+class TaskRow:
+    id: int
+    title: str
+    description: str | None
+    status_id: int
+    topic_id: int | None
+    creator_id: int
+    assignee_id: int | None
+    priority: int
+    due_date: date | None
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class TopicRow:
+    id: int
+    name: str
+    description: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class UserRow:
+    id: int
+    name: str
+    email: str
+    role: UserRole
+    is_active: bool
+
+
+# строка таблицы задач в UI: названия связанных сущностей вместо объектов связей
+@dataclass(slots=True, frozen=True)
+class TaskListItem:
+    id: int
+    title: str
+    description: str | None
+    priority: int
+    creator_id: int
+    created_at: datetime
+    status_name: str
+    topic_name: str | None
+    assignee_name: str | None
+    creator_email: str
+
+
+def select_rows(row_cls: type, model) -> Select:
+    return select(*(getattr(model, f.name) for f in fields(row_cls)))
+
+
+def fetch(db: Session, row_cls: type[R], stmt: Select) -> list[R]:
+    return [row_cls(*row) for row in db.execute(stmt)]
+
+
+def fetch_one(db: Session, row_cls: type[R], stmt: Select) -> R | None:
+    row = db.execute(stmt).first()
+    return row_cls(*row) if row is not None else None
+
+
+def task_list_items() -> Select:
+    creator = aliased(User)
+    assignee = aliased(User)
+    return (
+        select(Task.id, Task.title, Task.description, Task.priority, Task.creator_id, Task.created_at,
+               TaskStatus.name, Topic.name, assignee.name, creator.email)
+        .join(TaskStatus, TaskStatus.id == Task.status_id)
+        .join(creator, creator.id == Task.creator_id)
+        .outerjoin(Topic, Topic.id == Task.topic_id)
+        .outerjoin(assignee, assignee.id == Task.assignee_id)
+    )
+
+
+# записи истории статусов с названиями статусов и автора перехода; history - рабочая или архивная таблица
+def history_entries(history) -> Select:
+    from_status = aliased(TaskStatus)
+    to_status = aliased(TaskStatus)
+    author = aliased(User)
+    return (
+        select(
+            history.id, history.from_status_id, from_status.name.label("from_status"),
+            history.to_status_id, to_status.name.label("to_status"),
+            history.changed_by_id, author.name.label("changed_by"), history.changed_at,
+        )
+        .outerjoin(from_status, from_status.id == history.from_status_id)
+        .join(to_status, to_status.id == history.to_status_id)
+        .join(author, author.id == history.changed_by_id)
+    )
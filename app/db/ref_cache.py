@@ -0,0 +1,128 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import TaskStatus, Topic, User, UserRole
+
+# Справочники (статусы, темы, пользователи) для UI-страниц.
+# Меняются редко, поэтому держим их в памяти процесса и сбрасываем явно из роутов,
+# которые их изменяют. TTL - страховка на случай изменений из другого процесса.
+
+_PENDING_KEY = "ref_cache_pending"
+
+
+@dataclass(frozen=True, slots=True)
+class StatusRef:
+    id: int
+    code: str
+    name: str
+    sort_order: int
+    is_terminal: bool
+
+
+@dataclass(frozen=True, slots=True)
+class TopicRef:
+    id: int
+    name: str
+    description: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class UserRef:
+    id: int
+    name: str
+    email: str
+    role: UserRole
+    is_active: bool
+
+
+def _load_statuses(db: Session) -> tuple[StatusRef, ...]:
+    rows = db.execute(select(TaskStatus).order_by(TaskStatus.sort_order.asc())).scalars()
+    return tuple(StatusRef(s.id, s.code, s.name, s.sort_order, s.is_terminal) for s in rows)
+
+
+def _load_topics(db: Session) -> tuple[TopicRef, ...]:
+    rows = db.execute(select(Topic).order_by(Topic.name.asc())).scalars()
+    return tuple(TopicRef(t.id, t.name, t.description) for t in rows)
+
+
+def _load_users(db: Session) -> tuple[UserRef, ...]:
+    rows = db.execute(select(User).order_by(User.name.asc())).scalars()
+    return tuple(UserRef(u.id, u.name, u.email, u.role, u.is_active) for u in rows)
+
+
+_LOADERS: dict[str, Callable[[Session], tuple]] = {
+    "statuses": _load_statuses,
+    "topics": _load_topics,
+    "users": _load_users,
+}
+
+_lock = threading.Lock()
+_entries: dict[str, tuple[float, tuple]] = {}
+# поколение растёт при каждом сбросе: загрузка, начатая до сброса, не попадёт в кэш
+_generations: dict[str, int] = {kind: 0 for kind in _LOADERS}
+
+
+def _get(kind: str, db: Session) -> tuple:
+    ttl = settings.REFERENCE_CACHE_TTL_SECONDS
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(kind)
+        generation = _generations[kind]
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+
+    value = _LOADERS[kind](db)
+    if ttl > 0:
+        with _lock:
+            if _generations[kind] == generation:
+                _entries[kind] = (now, value)
+    return value
+
+
+def get_statuses(db: Session) -> tuple[StatusRef, ...]:
+    return _get("statuses", db)
+
+
+def get_topics(db: Session) -> tuple[TopicRef, ...]:
+    return _get("topics", db)
+
+
+def get_users(db: Session) -> tuple[UserRef, ...]:
+    return _get("users", db)
+
+
+def _drop(kinds) -> None:
+    with _lock:
+        for kind in kinds:
+            _entries.pop(kind, None)
+            _generations[kind] += 1
+
+
+# сбрасываем сразу и ещё раз после коммита db: иначе параллельный запрос
+# может успеть закэшировать данные, прочитанные до коммита
+def invalidate(db: Session | None, *kinds: str) -> None:
+    _drop(kinds)
+    if db is not None:
+        db.info.setdefault(_PENDING_KEY, set()).update(kinds)
+
+
+def clear() -> None:
+    _drop(_LOADERS)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_pending_after_commit(session: Session) -> None:
+    kinds = session.info.pop(_PENDING_KEY, None)
+    if kinds:
+        _drop(kinds)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
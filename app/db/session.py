@@ -3,4 +3,13 @@ from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
\ No newline at end of file
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# сессии GET-запросов: psycopg2 открывает транзакцию как BEGIN READ ONLY,
+# признак снимается с соединения при возврате в пул
+ReadOnlySessionLocal = sessionmaker(bind=engine.execution_options(postgresql_readonly=True),
+                                    autoflush=False, autocommit=False)
+
+replica_engine = (
+    create_engine(settings.REPLICA_DATABASE_URL, pool_pre_ping=True)
+    if settings.REPLICA_DATABASE_URL else None
+)
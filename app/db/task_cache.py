@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import task_events
+from app.db.models import Task
+from app.db.read_models import TaskRow, fetch_one, select_rows
+
+# Снимки задач по id для чтения одной задачи (GET /tasks/{id}, страница редактирования в UI):
+# LRU на TASK_CACHE_SIZE записей в памяти процесса. Записи задач через API и UI сбрасывают
+# снимок сразу и ещё раз после коммита, как в app/db/ref_cache.py, поэтому свои изменения
+# видны следующему же запросу. Изменения из других процессов (другие воркеры, архивация)
+# приходят через ленту NOTIFY task_changes (app/db/task_events.py) сразу после их коммита.
+# Пока LISTEN не подключён, кэш не используется, а после каждого подключения очищается:
+# события за время разрыва потеряны. TTL - последняя страховка.
+# Сами записи читают задачу из БД: ORM пишет только колонки, отличающиеся от загруженных,
+# и изменение поверх устаревшего снимка могло бы молча потеряться.
+
+_PENDING_KEY = "task_cache_pending"
+_PENDING_ALL_KEY = "task_cache_pending_all"
+
+_lock = threading.Lock()
+_entries: OrderedDict[int, tuple[float, TaskRow]] = OrderedDict()
+# растёт при каждом сбросе: снимок, прочитанный до сброса, не попадёт в кэш
+_generation = 0
+
+
+def _load(db: Session, task_id: int) -> TaskRow | None:
+    return fetch_one(db, TaskRow, select_rows(TaskRow, Task).where(Task.id == task_id))
+
+
+def _put(task: TaskRow, loaded_at: float, generation: int) -> None:
+    size = settings.TASK_CACHE_SIZE
+    with _lock:
+        if _generation != generation:
+            return
+        entry = _entries.get(task.id)
+        # версия - updated_at: более старый снимок не вытесняет более новый
+        if entry is not None and entry[1].updated_at > task.updated_at:
+            return
+        _entries[task.id] = (loaded_at, task)
+        _entries.move_to_end(task.id)
+        while len(_entries) > size:
+            _entries.popitem(last=False)
+
+
+def _enabled() -> bool:
+    if settings.TASK_CACHE_SIZE <= 0 or settings.TASK_CACHE_TTL_SECONDS <= 0:
+        return False
+    if not task_events.hub.connected:
+        # запускает поток ленты и ждёт LISTEN; если БД недоступна - читаем мимо кэша
+        task_events.hub.add_listener(_on_task_change)
+    return task_events.hub.connected
+
+
+# задача из рабочей таблицы (архив не кэшируется), None - если её там нет
+def get(db: Session, task_id: int) -> TaskRow | None:
+    if not _enabled():
+        return _load(db, task_id)
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(task_id)
+        if entry is not None and now - entry[0] < settings.TASK_CACHE_TTL_SECONDS:
+            _entries.move_to_end(task_id)
+            return entry[1]
+        generation = _generation
+
+    task = _load(db, task_id)
+    if task is not None:
+        _put(task, now, generation)
+    return task
+
+
+def _drop(task_ids) -> None:
+    global _generation
+    with _lock:
+        for task_id in task_ids:
+            _entries.pop(task_id, None)
+        _generation += 1
+
+
+def invalidate(db: Session | None, *task_ids: int) -> None:
+    _drop(task_ids)
+    if db is not None:
+        db.info.setdefault(_PENDING_KEY, set()).update(task_ids)
+
+
+# изменение, задевающее много задач сразу (удаление темы обнуляет topic_id каскадом в БД)
+def invalidate_all(db: Session | None) -> None:
+    clear()
+    if db is not None:
+        db.info[_PENDING_ALL_KEY] = True
+
+
+def clear() -> None:
+    global _generation
+    with _lock:
+        _entries.clear()
+        _generation += 1
+
+
+# событие из ленты: задача изменена, удалена или перенесена в архив; None - события могли потеряться
+def _on_task_change(event: dict | None) -> None:
+    if event is None:
+        clear()
+    else:
+        _drop((event["id"],))
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_pending_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_ALL_KEY, False):
+        clear()
+    task_ids = session.info.pop(_PENDING_KEY, None)
+    if task_ids:
+        _drop(task_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_PENDING_ALL_KEY, None)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from typing import Callable
+
+from sqlalchemy import Engine
+
+from app.db.session import engine as default_engine
+
+# Лента изменений задач: триггер на tasks (см. app/db/models/task.py) шлёт NOTIFY task_changes
+# при коммите, один поток на процесс слушает канал и раздаёт события подписчикам (SSE-клиентам).
+# Поток и соединение LISTEN создаются при первом подписчике. События, отправленные, пока
+# соединение переподключается, теряются - клиентам, которым важна полнота, нужен GET /tasks/changes.
+# Кроме SSE-клиентов, события получают слушатели в самом процессе (кэш задач app/db/task_cache.py):
+# их вызывают в потоке ленты, а при каждом подключении LISTEN - с None, "события могли потеряться".
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_changes"
+QUEUE_SIZE = 1000
+RECONNECT_MIN_SECONDS = 0.5
+RECONNECT_MAX_SECONDS = 30
+
+
+class TaskEventHub:
+    def __init__(self, engine: Engine = default_engine):
+        self.engine = engine
+        self._subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._listeners: set[Callable[[dict | None], None]] = set()
+        # LISTEN подключён: пока нет, слушатели не должны полагаться на доставку событий
+        self.connected = False
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        # stop() будит поток сразу, не дожидаясь таймаута select
+        self._wake_r, self._wake_w = os.pipe()
+
+    # блокирует до подключения LISTEN, из асинхронного кода вызывать через asyncio.to_thread
+    def subscribe(self, loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add((loop, queue))
+            self._ensure_thread()
+        # события до LISTEN потерялись бы, поэтому ждём подключения
+        self._ready.wait(timeout=5)
+        return queue
+
+    # как subscribe, но для синхронного кода процесса; повторная регистрация ничего не меняет
+    def add_listener(self, listener: Callable[[dict | None], None]) -> None:
+        with self._lock:
+            self._listeners.add(listener)
+            self._ensure_thread()
+        self._ready.wait(timeout=5)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._listen, name="task-events", daemon=True)
+            self._thread.start()
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = {s for s in self._subscribers if s[1] is not queue}
+
+    def stop(self) -> None:
+        self._stop.set()
+        os.write(self._wake_w, b"x")
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _listen(self) -> None:
+        # соединение может оборваться (рестарт или failover БД, pg_terminate_backend): подписчики
+        # остаются на месте, а поток переподключается с растущей паузой, пока его не остановят
+        backoff = RECONNECT_MIN_SECONDS
+        while not self._stop.is_set():
+            try:
+                self._listen_once()
+                backoff = RECONNECT_MIN_SECONDS
+            except Exception:
+                logger.exception("Соединение ленты изменений задач потеряно, переподключение через %s с", backoff)
+                # subscribe не должен ждать таймаут, пока БД недоступна
+                self._ready.set()
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, RECONNECT_MAX_SECONDS)
+        self._ready.set()
+
+    def _listen_once(self) -> None:
+        # отдельное соединение вне пула: оно занято LISTEN всё время работы потока
+        conn = self.engine.raw_connection()
+        raw = conn.driver_connection
+        conn.detach()
+        try:
+            raw.autocommit = True
+            raw.cursor().execute(f"LISTEN {CHANNEL}")
+            self.connected = True
+            self._notify_listeners(None)
+            self._ready.set()
+            while not self._stop.is_set():
+                readable, _, _ = select.select([raw, self._wake_r], [], [], 1.0)
+                if self._wake_r in readable:
+                    os.read(self._wake_r, 64)
+                if raw not in readable:
+                    continue
+                raw.poll()
+                while raw.notifies:
+                    self._publish(json.loads(raw.notifies.pop(0).payload))
+        finally:
+            self.connected = False
+            raw.close()
+
+    def _notify_listeners(self, event: dict | None) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Слушатель ленты изменений задач завершился ошибкой")
+
+    def _publish(self, event: dict) -> None:
+        self._notify_listeners(event)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(_offer, queue, event)
+
+
+# медленный клиент не должен копить события бесконечно: выбрасываем самое старое
+def _offer(queue: asyncio.Queue, event: dict) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+hub = TaskEventHub()
@@ -0,0 +1,3 @@
+from .runner import JobRunner, runner
+
+__all__ = ["JobRunner", "runner"]
@@ -0,0 +1,87 @@
+import csv
+import inspect
+import io
+import json
+from datetime import date
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic.fields import FieldInfo
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.routes import analytics
+from app.api.routes.tasks import task_list_filters
+from app.core import fast_json
+from app.db.archive import TASK_COLUMNS
+from app.db.models import Task, User
+
+# Обработчики фоновых заданий: получают параметры задания и возвращают
+# (содержимое, content-type, имя файла для скачивания).
+JobResult = tuple[bytes, str, str | None]
+
+EXPORT_BATCH_SIZE = 1000
+
+ANALYTICS_ROUTES: dict[str, Callable] = {
+    "statuses": analytics.analytics_by_statuses,
+    "topics": analytics.analytics_by_topics,
+    "assignees": analytics.analytics_by_assignees,
+    "summary": analytics.analytics_summary,
+    "burndown": analytics.analytics_burndown,
+    "lead_time": analytics.analytics_lead_time,
+    "time_in_status": analytics.analytics_time_in_status,
+    "trend": analytics.analytics_trend,
+    "dashboard": analytics.analytics_dashboard,
+}
+EXTENSIONS = {"png": "png", "svg": "svg", "json": "json", "spec": "json"}
+
+
+def export_tasks(db: Session, user: User, params: dict) -> JobResult:
+    stmt = (
+        select(*(getattr(Task, c) for c in TASK_COLUMNS))
+        .where(*task_list_filters(Task, user, params.get("status_id"), params.get("topic_id"),
+                                  params.get("assignee_id")))
+        .order_by(Task.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    rows = db.execute(stmt)
+
+    if params.get("format") == "json":
+        return fast_json.dumps(fast_json.rows_to_dicts(TASK_COLUMNS, rows)), "application/json", "tasks.json"
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(TASK_COLUMNS)
+    writer.writerows(rows)
+    return buf.getvalue().encode(), "text/csv; charset=utf-8", "tasks.csv"
+
+
+# тот же код, что отвечает на GET /analytics/{name}, только вызывается из воркера
+def run_analytics(db: Session, user: User, params: dict) -> JobResult:
+    name = params["name"]
+    route = ANALYTICS_ROUTES[name]
+    args = params.get("args", {})
+
+    kwargs = {"db": db, "user": user}
+    for arg, param in inspect.signature(route).parameters.items():
+        if arg in kwargs:
+            continue
+        if arg in args:
+            value = args[arg]
+            kwargs[arg] = date.fromisoformat(value) if arg in ("date_from", "date_to") else value
+        elif isinstance(param.default, FieldInfo):
+            # значения Query(...) по умолчанию при прямом вызове не подставляются
+            kwargs[arg] = param.default.default
+
+    result = route(**kwargs)
+    filename = f"{name}.{EXTENSIONS.get(args.get('format', 'json'), 'json')}"
+    if isinstance(result, Response):
+        return result.body, result.media_type, filename
+    return json.dumps(jsonable_encoder(result), ensure_ascii=False).encode(), "application/json", filename
+
+
+HANDLERS: dict[str, Callable[[Session, User, dict], JobResult]] = {
+    "tasks_export": export_tasks,
+    "analytics": run_analytics,
+}
@@ -0,0 +1,130 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.models import Job, JobStatus, User
+from app.db.session import SessionLocal
+from app.jobs.handlers import HANDLERS
+
+# Фоновые задания выполняются в пуле потоков процесса, у каждого типа свой пул,
+# поэтому тяжёлые выгрузки не занимают места графиков и наоборот.
+# Состояние и результат хранятся в таблице jobs: статус можно опрашивать из любого воркера,
+# а задания из очереди подхватываются после перезапуска. Задания, которые выполнял упавший процесс,
+# после JOB_LEASE_SECONDS помечаются failed; завершённые хранятся JOB_RESULT_TTL_HOURS.
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "jobs_pending"
+
+
+class JobRunner:
+    def __init__(self, concurrency: dict[str, int], session_factory: sessionmaker = SessionLocal):
+        self.concurrency = concurrency
+        self.session_factory = session_factory
+        self._pools: dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, db: Session, job_type: str, params: dict, user: User) -> Job:
+        job = Job(type=job_type, params=params, created_by_id=user.id)
+        db.add(job)
+        db.flush()
+        # в пул отдаём только после коммита, иначе воркер может не увидеть строку
+        db.info.setdefault(_PENDING_KEY, []).append((job.id, job_type))
+        return job
+
+    def dispatch(self, job_id: int, job_type: str) -> None:
+        self._pool(job_type).submit(self._run, job_id)
+
+    # running дольше аренды - процесс, который его выполнял, упал или был убит:
+    # статус никто больше не обновит, клиент ждал бы вечно
+    def reclaim_stale(self) -> int:
+        with self.session_factory() as db:
+            result = db.execute(
+                update(Job)
+                .where(Job.status == JobStatus.running,
+                       Job.started_at < func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS))
+                .values(status=JobStatus.failed, error="Задание прервано перезапуском сервера",
+                        finished_at=func.now())
+            )
+            db.commit()
+        return result.rowcount
+
+    # результаты выгрузок лежат в самой таблице, без срока хранения она росла бы бесконечно
+    def purge_finished(self) -> int:
+        with self.session_factory() as db:
+            result = db.execute(delete(Job).where(Job.finished_at < func.now() - timedelta(hours=settings.JOB_RESULT_TTL_HOURS)))
+            db.commit()
+        return result.rowcount
+
+    def resume_queued(self) -> None:
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(Job.id, Job.type).where(Job.status == JobStatus.queued).order_by(Job.created_at)
+            ).all()
+        for job_id, job_type in rows:
+            self.dispatch(job_id, job_type)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self, job_type: str) -> ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(job_type)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=self.concurrency.get(job_type, 1),
+                                          thread_name_prefix=f"job-{job_type}")
+                self._pools[job_type] = pool
+            return pool
+
+    def _run(self, job_id: int) -> None:
+        with self.session_factory() as db:
+            # забираем задание атомарно: если его уже взял другой процесс, UPDATE ничего не вернёт
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.queued)
+                .values(status=JobStatus.running, started_at=func.now())
+                .returning(Job.type, Job.params, Job.created_by_id)
+            ).first()
+            db.commit()
+            if claimed is None:
+                return
+
+            try:
+                user = db.get(User, claimed.created_by_id)
+                content, media_type, filename = HANDLERS[claimed.type](db, user, claimed.params)
+                values = {"status": JobStatus.done, "result": content,
+                          "result_type": media_type, "result_name": filename}
+            except HTTPException as e:
+                values = {"status": JobStatus.failed, "error": str(e.detail)}
+            except Exception:
+                logger.exception("Фоновое задание %s завершилось ошибкой", job_id)
+                values = {"status": JobStatus.failed, "error": "Внутренняя ошибка при выполнении задания"}
+            db.rollback()
+
+            db.execute(update(Job).where(Job.id == job_id).values(**values, finished_at=func.now()))
+            db.commit()
+        # заодно убираем устаревшие: запрос по индексу finished_at, обычно ничего не удаляет
+        self.purge_finished()
+
+
+runner = JobRunner(settings.JOB_CONCURRENCY)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_after_commit(session: Session) -> None:
+    for job_id, job_type in session.info.pop(_PENDING_KEY, ()):
+        runner.dispatch(job_id, job_type)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,20 +1,47 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.routes.tasks import router as tasks_router
 from app.api.routes.auth import router as auth_router
 from app.api.routes.analytics import router as analytics_router
 from app.api.routes.users import router as users_router
 from app.api.routes.topics import router as topics_router
+from app.api.routes.jobs import router as jobs_router
+from app.api.routes.activity import router as activity_router
+from app.core.bulkhead import BulkheadMiddleware, analytics_bulkhead
+from app.core.rate_limit import RateLimitMiddleware
+from app.db import task_events
+from app.jobs import runner as job_runner
 from app.ui.router import router as ui_router
 
-app = FastAPI(title="Task Tracker")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # задания, брошенные упавшим процессом, устаревшие результаты и оставшиеся в очереди
+    job_runner.reclaim_stale()
+    job_runner.purge_finished()
+    job_runner.resume_queued()
+    yield
+    job_runner.shutdown()
+    task_events.hub.stop()
+
+app = FastAPI(title="Task Tracker", lifespan=lifespan)
+# лимит запросов снаружи: отклонённые им запросы не занимают очередь аналитики
+app.add_middleware(BulkheadMiddleware)
+app.add_middleware(RateLimitMiddleware)
 
 app.include_router(auth_router)
 app.include_router(tasks_router)
 app.include_router(topics_router)
 app.include_router(analytics_router)
 app.include_router(users_router)
+app.include_router(jobs_router)
+app.include_router(activity_router)
 app.include_router(ui_router)
 
 @app.get("/start")
 def start():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/metrics")
+def metrics():
+    return {"analytics_bulkhead": analytics_bulkhead.stats()}
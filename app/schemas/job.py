@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.db.models import JobStatus
+
+
+class JobOut(BaseModel):
+    id: int
+    type: str
+    status: JobStatus
+    params: dict
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
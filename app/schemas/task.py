@@ -88,4 +88,12 @@ class TaskOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskChanges(BaseModel):
+    changed: list[TaskOut]
+    deleted: list[int]
+    # передать в следующий запрос; пока has_more, изменения отдаются страницами
+    next_token: str
+    has_more: bool
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class TaskHistoryItem(BaseModel):
+    id: int
+    from_status_id: int | None
+    from_status: str | None
+    to_status_id: int
+    to_status: str
+    changed_by_id: int
+    changed_by: str
+    changed_at: datetime
+
+
+class TaskHistoryPage(BaseModel):
+    items: list[TaskHistoryItem]
+    # передать в cursor, чтобы получить следующую (более старую) страницу; None - дальше записей нет
+    next_cursor: str | None
+
+
+class ActivityItem(TaskHistoryItem):
+    task_id: int
+    task_title: str
+
+
+class ActivityPage(BaseModel):
+    items: list[ActivityItem]
+    next_cursor: str | None
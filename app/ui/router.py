@@ -1,28 +1,41 @@
 from __future__ import annotations
 
+from datetime import datetime
 from io import BytesIO
+from typing import Literal
+from urllib.parse import urlencode
 
 import pandas as pd
 from fastapi import APIRouter, Depends, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
-from matplotlib import pyplot as plt
-from sqlalchemy import and_, select, func
+from sqlalchemy import and_, select, func, tuple_
 from sqlalchemy.orm import Session
 from fastapi.responses import StreamingResponse
 from app.api.deps import get_db
+from app.api.routes.analytics import build_dashboard
+from app.core.charts import chart_spec, load_pyplot, render_svg
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.security import verify_password, create_access_token, hash_password
+from app.db import ref_cache, task_cache
 from app.db.models import User, TaskStatus, Task, Topic, TaskStatusHistory
+from app.db.read_models import TaskListItem, fetch, task_list_items
 
 templates = Jinja2Templates(directory="app/ui/templates")
 router = APIRouter(prefix="/ui", tags=["ui"])
 
+# json - спецификация графика для отрисовки на клиенте
+ChartExt = Literal["png", "svg", "json"]
+
+TASKS_PAGE_SIZE = 50
+
 def _scope_for_user(user: User):
     if user.role.value == "admin":
         return None
     return Task.creator_id == user.id
 
 def _png_bar(labels, values, title: str) -> StreamingResponse:
+    plt = load_pyplot()
     fig = plt.figure()
     plt.title(title)
     plt.bar([str(x) for x in labels], values)
@@ -34,6 +47,19 @@ def _png_bar(labels, values, title: str) -> StreamingResponse:
     buf.seek(0)
     return StreamingResponse(buf, media_type="image/png")
 
+def _bar_chart(labels, values, title: str, fmt: str):
+    if fmt == "svg":
+        return Response(render_svg("bar", labels, values, title), media_type="image/svg+xml")
+    if fmt == "json":
+        return chart_spec("bar", labels, values, title)
+    return _png_bar(labels, values, title)
+
+def _parse_id(value: str | None) -> int | None:
+    return int(value) if value and value.isdigit() else None
+
+def _parse_tasks_cursor(value: str | None) -> tuple[datetime, int] | None:
+    return decode_cursor(value, (datetime.fromisoformat, int))
+
 def _require_admin(request: Request, db: Session) -> User | None:
     user = _get_user_from_cookie(request, db)
     if not user:
@@ -61,7 +87,7 @@ def register_action(
     user = User(name=name, email=email, password_hash=hash_password(password))
     db.add(user)
     db.flush()
-    db.refresh(user)
+    ref_cache.invalidate(db, "users")
 
     token = create_access_token(subject=str(user.id))
     resp = RedirectResponse(url="/ui/tasks", status_code=302)
@@ -111,19 +137,68 @@ def _get_user_from_cookie(request: Request, db: Session) -> User | None:
 
 
 @router.get("/tasks", response_class=HTMLResponse)
-def tasks_page(request: Request, db: Session = Depends(get_db)):
+def tasks_page(
+    request: Request,
+    db: Session = Depends(get_db),
+    status_id: str | None = None,
+    topic_id: str | None = None,
+    assignee_id: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+):
     user = _get_user_from_cookie(request, db)
     if not user:
         return RedirectResponse(url="/ui/login", status_code=302)
 
-    statuses = db.query(TaskStatus).order_by(TaskStatus.sort_order.asc()).all()
+    statuses = ref_cache.get_statuses(db)
+
+    filters = {
+        "status_id": _parse_id(status_id),
+        "topic_id": _parse_id(topic_id),
+        "assignee_id": _parse_id(assignee_id),
+    }
 
-    q = db.query(Task)
+    # названия статуса, темы и людей берём join-ами одним запросом в модель чтения, без ORM-объектов
+    q = task_list_items()
     if user.role.value != "admin":
-        q = q.filter(Task.creator_id == user.id)
-    tasks = q.order_by(Task.created_at.desc()).limit(200).all()
-    topics = db.query(Topic).order_by(Topic.name.asc()).all()
-    users = db.query(User).order_by(User.name.asc()).all()
+        q = q.where(Task.creator_id == user.id)
+    for field, value in filters.items():
+        if value is not None:
+            q = q.where(getattr(Task, field) == value)
+
+    # keyset по (created_at, id): страница - диапазон индекса ix_tasks_created_at_id от курсора,
+    # без OFFSET. Берём на одну запись больше, чтобы понять, есть ли ещё страница, без count(*)
+    key = tuple_(Task.created_at, Task.id)
+    after_key = _parse_tasks_cursor(after)
+    before_key = _parse_tasks_cursor(before) if after_key is None else None
+    if before_key is not None:
+        rows = fetch(db, TaskListItem, (
+            q.where(key > tuple_(*before_key))
+            .order_by(Task.created_at.asc(), Task.id.asc())
+            .limit(TASKS_PAGE_SIZE + 1)
+        ))
+        has_prev = len(rows) > TASKS_PAGE_SIZE
+        has_next = True
+        tasks = rows[:TASKS_PAGE_SIZE][::-1]
+    else:
+        if after_key is not None:
+            q = q.where(key < tuple_(*after_key))
+        rows = fetch(db, TaskListItem, q.order_by(Task.created_at.desc(), Task.id.desc()).limit(TASKS_PAGE_SIZE + 1))
+        has_prev = after_key is not None
+        has_next = len(rows) > TASKS_PAGE_SIZE
+        tasks = rows[:TASKS_PAGE_SIZE]
+
+    active_filters = {k: v for k, v in filters.items() if v is not None}
+    prev_url = next_url = None
+    if tasks and has_prev:
+        cursor = encode_cursor(tasks[0].created_at, tasks[0].id)
+        prev_url = f"/ui/tasks?{urlencode({**active_filters, 'before': cursor})}"
+    if tasks and has_next:
+        cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        next_url = f"/ui/tasks?{urlencode({**active_filters, 'after': cursor})}"
+
+    topics = ref_cache.get_topics(db)
+    users = ref_cache.get_users(db)
 
     return templates.TemplateResponse(
         "tasks.html",
@@ -134,6 +209,9 @@ def tasks_page(request: Request, db: Session = Depends(get_db)):
             "statuses": statuses,
             "topics": topics,
             "users": users,
+            "filters": filters,
+            "prev_url": prev_url,
+            "next_url": next_url,
             "show_nav": True,
         },
     )
@@ -154,8 +232,8 @@ def create_task_ui(
         return RedirectResponse(url="/ui/login", status_code=302)
 
     status_new = db.query(TaskStatus).filter(TaskStatus.code == "new").one()
-    topic_id_int = int(topic_id) if topic_id and topic_id.isdigit() else None
-    assignee_id_int = int(assignee_id) if assignee_id and assignee_id.isdigit() else None
+    topic_id_int = _parse_id(topic_id)
+    assignee_id_int = _parse_id(assignee_id)
     task = Task(
         title=title,
         description=description,
@@ -190,9 +268,18 @@ def change_status_ui(
         return RedirectResponse(url="/ui/tasks", status_code=302)
 
     new_status = db.query(TaskStatus).filter(TaskStatus.code == status_code).one()
-    task.status_id = new_status.id
+    if task.status_id != new_status.id:
+        # как в API: аналитика и архивация опираются на историю переходов
+        db.add(TaskStatusHistory(
+            task_id=task.id,
+            from_status_id=task.status_id,
+            to_status_id=new_status.id,
+            changed_by_id=user.id,
+        ))
+        task.status_id = new_status.id
     db.add(task)
     db.flush()
+    task_cache.invalidate(db, task.id)
     return RedirectResponse(url="/ui/tasks", status_code=302)
 
 @router.post("/tasks/{task_id}/delete")
@@ -210,8 +297,32 @@ def delete_task_ui(request: Request, task_id: int, db: Session = Depends(get_db)
 
     db.delete(task)
     db.flush()
+    task_cache.invalidate(db, task_id)
     return RedirectResponse(url="/ui/tasks", status_code=302)
 
+@router.get("/tasks/{task_id}/edit", response_class=HTMLResponse)
+def edit_task_page(request: Request, task_id: int, db: Session = Depends(get_db)):
+    user = _get_user_from_cookie(request, db)
+    if not user:
+        return RedirectResponse(url="/ui/login", status_code=302)
+
+    task = task_cache.get(db, task_id)
+    if not task:
+        return RedirectResponse(url="/ui/tasks", status_code=302)
+
+    if user.role.value != "admin" and task.creator_id != user.id:
+        return RedirectResponse(url="/ui/tasks", status_code=302)
+
+    topics = ref_cache.get_topics(db)
+    users = ref_cache.get_users(db)
+    statuses = ref_cache.get_statuses(db)
+
+    return templates.TemplateResponse(
+        "task_edit.html",
+        {"request": request, "user": user, "task": task, "topics": topics, "users": users,
+         "statuses": statuses, "show_nav": True},
+    )
+
 @router.post("/tasks/{task_id}/update")
 def update_task_ui(
     request: Request,
@@ -234,8 +345,8 @@ def update_task_ui(
     if user.role.value != "admin" and task.creator_id != user.id:
         return RedirectResponse(url="/ui/tasks", status_code=302)
 
-    topic_id_int = int(topic_id) if topic_id and topic_id.isdigit() else None
-    assignee_id_int = int(assignee_id) if assignee_id and assignee_id.isdigit() else None
+    topic_id_int = _parse_id(topic_id)
+    assignee_id_int = _parse_id(assignee_id)
 
     task.title = title.strip()
     task.description = description
@@ -245,6 +356,7 @@ def update_task_ui(
 
     db.add(task)
     db.flush()
+    task_cache.invalidate(db, task.id)
     return RedirectResponse(url="/ui/tasks", status_code=302)
 
 @router.get("/analytics", response_class=HTMLResponse)
@@ -252,10 +364,27 @@ def analytics_page(request: Request, db: Session = Depends(get_db)):
     user = _get_user_from_cookie(request, db)
     if not user:
         return RedirectResponse(url="/ui/login", status_code=302)
-    return templates.TemplateResponse("analytics.html", {"request": request})
+    # все графики считаются одним запросом и встраиваются в страницу как svg
+    data = build_dashboard(db, user)
+    lead = data["lead_time"]
+    charts = {
+        "statuses": render_svg("bar", [x["name"] for x in data["statuses"]["items"]],
+                               [x["count"] for x in data["statuses"]["items"]], "Задачи по статусам"),
+        "topics": render_svg("bar", [x["topic"] for x in data["topics"]["items"]],
+                             [x["count"] for x in data["topics"]["items"]], "Задачи по темам"),
+        "assignees": render_svg("bar", [x["assignee"] for x in data["assignees"]["items"]],
+                                [x["count"] for x in data["assignees"]["items"]], "Задачи по исполнителям"),
+        "lead_time": render_svg("bar", ["Среднее", "Медиана", "90-й перцентиль"],
+                                [lead["avg_hours"] or 0, lead["median_hours"] or 0, lead["p90_hours"] or 0],
+                                "Время выполнения до завершения задач (часы)"),
+    }
+    return templates.TemplateResponse(
+        "analytics.html",
+        {"request": request, "user": user, "charts": charts, "show_nav": True},
+    )
 
-@router.get("/analytics/statuses.png")
-def ui_analytics_statuses_png(request: Request, db: Session = Depends(get_db)):
+@router.get("/analytics/statuses.{fmt}")
+def ui_analytics_statuses_chart(request: Request, fmt: ChartExt, db: Session = Depends(get_db)):
     user = _get_user_from_cookie(request, db)
     if not user:
         return RedirectResponse(url="/ui/login", status_code=302)
@@ -277,10 +406,10 @@ def ui_analytics_statuses_png(request: Request, db: Session = Depends(get_db)):
 
     labels = [r[0] for r in rows]
     values = [int(r[1]) for r in rows]
-    return _png_bar(labels, values, "Задачи по статусам")
+    return _bar_chart(labels, values, "Задачи по статусам", fmt)
 
-@router.get("/analytics/topics.png")
-def ui_analytics_topics_png(request: Request, db: Session = Depends(get_db)):
+@router.get("/analytics/topics.{fmt}")
+def ui_analytics_topics_chart(request: Request, fmt: ChartExt, db: Session = Depends(get_db)):
     user = _get_user_from_cookie(request, db)
     if not user:
         return RedirectResponse(url="/ui/login", status_code=302)
@@ -302,10 +431,10 @@ def ui_analytics_topics_png(request: Request, db: Session = Depends(get_db)):
 
     labels = [r[0] for r in rows]
     values = [int(r[1]) for r in rows]
-    return _png_bar(labels, values, "Задачи по темам")
+    return _bar_chart(labels, values, "Задачи по темам", fmt)
 
-@router.get("/analytics/assignees.png")
-def ui_analytics_assignees_png(request: Request, db: Session = Depends(get_db)):
+@router.get("/analytics/assignees.{fmt}")
+def ui_analytics_assignees_chart(request: Request, fmt: ChartExt, db: Session = Depends(get_db)):
     user = _get_user_from_cookie(request, db)
     if not user:
         return RedirectResponse(url="/ui/login", status_code=302)
@@ -325,10 +454,10 @@ def ui_analytics_assignees_png(request: Request, db: Session = Depends(get_db)):
 
     labels = [r[0] for r in rows]
     values = [int(r[1]) for r in rows]
-    return _png_bar(labels, values, "Задачи по исполнителям")
+    return _bar_chart(labels, values, "Задачи по исполнителям", fmt)
 
-@router.get("/analytics/lead_time.png")
-def ui_analytics_lead_time_png(request: Request, db: Session = Depends(get_db)):
+@router.get("/analytics/lead_time.{fmt}")
+def ui_analytics_lead_time_chart(request: Request, fmt: ChartExt, db: Session = Depends(get_db)):
     user = _get_user_from_cookie(request, db)
     if not user:
         return RedirectResponse(url="/ui/login", status_code=302)
@@ -337,7 +466,7 @@ def ui_analytics_lead_time_png(request: Request, db: Session = Depends(get_db)):
 
     done_id = db.execute(select(TaskStatus.id).where(TaskStatus.code == "done")).scalar_one_or_none()
     if not done_id:
-        return _png_bar(["done"], [0], "Время выполнения")
+        return _bar_chart(["done"], [0], "Время выполнения", fmt)
 
     subq = (
         select(
@@ -357,7 +486,7 @@ def ui_analytics_lead_time_png(request: Request, db: Session = Depends(get_db)):
     secs = pd.to_numeric(pd.Series(rows), errors="coerce").dropna()
 
     avg_h = float((secs.mean() / 3600)) if len(secs) else 0.0
-    return _png_bar(["Часов в среднем"], [round(avg_h, 2)], "Время выполнения до завершения задач")
+    return _bar_chart(["Часов в среднем"], [round(avg_h, 2)], "Время выполнения до завершения задач", fmt)
 
 @router.post("/logout")
 def logout():
@@ -371,8 +500,8 @@ def admin_page(request: Request, db: Session = Depends(get_db)):
     if not user:
         return RedirectResponse(url="/ui/login", status_code=302)
 
-    users = db.query(User).order_by(User.id.asc()).all()
-    topics = db.query(Topic).order_by(Topic.name.asc()).all()
+    users = sorted(ref_cache.get_users(db), key=lambda u: u.id)
+    topics = ref_cache.get_topics(db)
 
     return templates.TemplateResponse(
         "admin.html",
@@ -400,6 +529,7 @@ def admin_change_role(
     u.role = role
     db.add(u)
     db.flush()
+    ref_cache.invalidate(db, "users")
     return RedirectResponse(url="/ui/admin", status_code=302)
 
 @router.post("/admin/users/{user_id}/toggle_active")
@@ -418,6 +548,7 @@ def admin_toggle_active(request: Request, user_id: int, db: Session = Depends(ge
     u.is_active = not u.is_active
     db.add(u)
     db.flush()
+    ref_cache.invalidate(db, "users")
     return RedirectResponse(url="/ui/admin", status_code=302)
 
 @router.post("/admin/topics/create")
@@ -442,6 +573,7 @@ def admin_create_topic(
     topic = Topic(name=name, description=description)
     db.add(topic)
     db.flush()
+    ref_cache.invalidate(db, "topics")
     return RedirectResponse(url="/ui/admin", status_code=302)
 
 @router.post("/admin/topics/{topic_id}/update")
@@ -472,6 +604,7 @@ def admin_update_topic(
     topic.description = description
     db.add(topic)
     db.flush()
+    ref_cache.invalidate(db, "topics")
     return RedirectResponse(url="/ui/admin", status_code=302)
 
 @router.post("/admin/topics/{topic_id}/delete")
@@ -486,4 +619,6 @@ def admin_delete_topic(request: Request, topic_id: int, db: Session = Depends(ge
 
     db.delete(topic)
     db.flush()
+    ref_cache.invalidate(db, "topics")
+    task_cache.invalidate_all(db)
     return RedirectResponse(url="/ui/admin", status_code=302)
\ No newline at end of file
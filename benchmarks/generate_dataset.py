@@ -0,0 +1,214 @@
+import argparse
+import io
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from app.core.security import hash_password
+from app.db.partitions import create_partition, is_partitioned, list_partitions, month_start, partition_name
+
+# Генератор синтетических данных для подбора индексов и запросов на реалистичном объёме:
+# пользователи, темы, задачи и история переходов статусов загружаются через COPY пачками.
+#
+#   python -m benchmarks.generate_dataset --tasks 1000000
+#   python -m benchmarks.generate_dataset --users 20000 --tasks 10000000 --creator-skew 1.3
+#
+# Распределения:
+#   - авторы задач по закону Ципфа (--creator-skew): несколько пользователей создают большую часть задач;
+#   - created_at равномерно за последние --days дней;
+#   - задача доходит до k-го статуса (по sort_order) с вероятностями --progress,
+#     переходы идут через экспоненциальные интервалы со средним --step-hours.
+# Данные дописываются к существующим, все пользователи получают пароль --password.
+# Загрузка идёт одной транзакцией; триггеры tasks (NOTIFY ленты изменений) на время загрузки выключены.
+# Для 10M задач: --batch-size побольше и база, где пользователь - суперпользователь (см. ниже).
+
+
+def parse_weights(value: str) -> list[float]:
+    weights = [float(w) for w in value.split(",")]
+    if any(w < 0 for w in weights) or not sum(weights):
+        raise argparse.ArgumentTypeError("веса должны быть неотрицательными и не все нулевыми")
+    return weights
+
+
+def zipf_weights(n: int, skew: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def copy_frame(cur, table: str, df: pd.DataFrame) -> None:
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False, na_rep="")
+    buf.seek(0)
+    # пустое поле без кавычек в CSV - NULL
+    cur.copy_expert(f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def next_id(conn, table: str) -> int:
+    return conn.execute(text(f"SELECT COALESCE(max(id), 0) + 1 FROM {table}")).scalar_one()
+
+
+def sync_sequence(conn, table: str) -> None:
+    conn.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(max(id), 1) FROM {table}))"
+    ))
+
+
+def ensure_history_partitions(conn, start: date, end: date) -> None:
+    if not is_partitioned(conn):
+        return
+    existing = set(list_partitions(conn))
+    month = month_start(start)
+    while month <= end:
+        if partition_name(month) not in existing:
+            create_partition(conn, month)
+        month = month_start(month, 1)
+
+
+def task_chunk(rng: np.random.Generator, n: int, first_id: int, args, user_ids: np.ndarray,
+               creator_p: np.ndarray, topic_ids: np.ndarray, status_ids: list[int],
+               now: datetime) -> tuple[pd.DataFrame, pd.DataFrame]:
+    ids = np.arange(first_id, first_id + n)
+    creators = rng.choice(user_ids, size=n, p=creator_p)
+    assignees = np.where(rng.random(n) < args.assigned_share, rng.choice(user_ids, size=n), 0)
+    topics = np.where(rng.random(n) < args.topic_share, rng.choice(topic_ids, size=n), 0) \
+        if len(topic_ids) else np.zeros(n, dtype=np.int64)
+    created = np.datetime64(now.replace(tzinfo=None)) - (rng.random(n) * args.days * 86400e6).astype("timedelta64[us]")
+
+    progress = np.asarray(args.progress[:len(status_ids)], dtype=float)
+    stages = rng.choice(len(progress), size=n, p=progress / progress.sum())
+
+    # история: по строке на каждый переход new -> ... -> stages[i]
+    steps = stages.astype(np.int64)
+    owner = np.repeat(np.arange(n), steps)
+    starts = np.cumsum(steps) - steps
+    step_no = np.arange(len(owner)) - np.repeat(starts, steps)
+    gaps = rng.exponential(args.step_hours * 3600e6, size=len(owner)).astype("timedelta64[us]")
+    # накопленная сумма интервалов внутри каждой задачи
+    cum = np.cumsum(gaps)
+    has = steps > 0
+    base = np.zeros(n, dtype="timedelta64[us]")
+    base[has] = cum[starts[has]] - gaps[starts[has]]
+    cum -= np.repeat(base, steps)
+    changed = np.minimum(created[owner] + cum, np.datetime64(now.replace(tzinfo=None)))
+
+    status_arr = np.asarray(status_ids)
+    changers = np.where(assignees[owner] > 0, assignees[owner], creators[owner])
+    history = pd.DataFrame({
+        "task_id": ids[owner],
+        "from_status_id": status_arr[step_no],
+        "to_status_id": status_arr[step_no + 1],
+        "changed_by_id": changers,
+        "changed_at": pd.to_datetime(changed).tz_localize("UTC"),
+        # снимок полей задачи для ленты активности; в replica-режиме триггер его не заполнит
+        "creator_id": creators[owner],
+        "topic_id": pd.Series(topics[owner]).where(topics[owner] > 0).astype("Int64"),
+        "assignee_id": pd.Series(assignees[owner]).where(assignees[owner] > 0).astype("Int64"),
+    })
+
+    last_change = created.copy()
+    last_change[has] = changed[(starts + steps - 1)[has]]
+    tasks = pd.DataFrame({
+        "id": ids,
+        "title": [f"Задача {i}" for i in ids],
+        "status_id": status_arr[stages],
+        "topic_id": pd.Series(topics).where(topics > 0).astype("Int64"),
+        "creator_id": creators,
+        "assignee_id": pd.Series(assignees).where(assignees > 0).astype("Int64"),
+        "priority": rng.choice([1, 2, 3, 4, 5], size=n, p=[0.1, 0.2, 0.4, 0.2, 0.1]),
+        "created_at": pd.to_datetime(created).tz_localize("UTC"),
+        "updated_at": pd.to_datetime(last_change).tz_localize("UTC"),
+    })
+    return tasks, history
+
+
+def generate(conn, args) -> dict[str, int]:
+    rng = np.random.default_rng(args.seed)
+    now = datetime.now(timezone.utc)
+    status_ids = list(conn.execute(text("SELECT id FROM task_statuses ORDER BY sort_order")).scalars())
+    if not status_ids:
+        raise SystemExit("нет статусов задач: сначала примените миграции (alembic upgrade head)")
+
+    raw = conn.connection.dbapi_connection
+    cur = raw.cursor()
+
+    first_user = next_id(conn, "users")
+    user_ids = np.arange(first_user, first_user + args.users)
+    password_hash = hash_password(args.password)
+    copy_frame(cur, "users", pd.DataFrame({
+        "id": user_ids,
+        "name": [f"bench{i}" for i in user_ids],
+        "email": [f"bench{i}@example.com" for i in user_ids],
+        "password_hash": password_hash,
+    }))
+
+    first_topic = next_id(conn, "topics")
+    topic_ids = np.arange(first_topic, first_topic + args.topics)
+    copy_frame(cur, "topics", pd.DataFrame({"id": topic_ids, "name": [f"bench-topic-{i}" for i in topic_ids]}))
+
+    ensure_history_partitions(conn, (now - timedelta(days=args.days)).date(), now.date())
+    # replica-режим отключает и триггеры, и проверки внешних ключей (данные согласованы по построению) -
+    # это основная часть времени загрузки; доступен только суперпользователю
+    fast = conn.execute(text("SELECT rolsuper FROM pg_roles WHERE rolname = current_user")).scalar()
+    if fast:
+        conn.execute(text("SET LOCAL session_replication_role = replica"))
+    else:
+        conn.execute(text("ALTER TABLE tasks DISABLE TRIGGER USER"))
+
+    creator_p = zipf_weights(args.users, args.creator_skew)
+    rng.shuffle(creator_p)
+    first_task = next_id(conn, "tasks")
+    history_id = next_id(conn, "task_status_history")
+    total_history = 0
+    started = time.perf_counter()
+    for offset in range(0, args.tasks, args.batch_size):
+        n = min(args.batch_size, args.tasks - offset)
+        tasks, history = task_chunk(rng, n, first_task + offset, args, user_ids, creator_p,
+                                    topic_ids, status_ids, now)
+        history.insert(0, "id", np.arange(history_id, history_id + len(history)))
+        history_id += len(history)
+        copy_frame(cur, "tasks", tasks)
+        copy_frame(cur, "task_status_history", history)
+        total_history += len(history)
+        print(f"  задач {offset + n}/{args.tasks}, история {total_history}, "
+              f"{time.perf_counter() - started:.0f} с", flush=True)
+
+    if not fast:
+        conn.execute(text("ALTER TABLE tasks ENABLE TRIGGER USER"))
+    for table in ("users", "topics", "tasks", "task_status_history"):
+        sync_sequence(conn, table)
+    return {"users": args.users, "topics": args.topics, "tasks": args.tasks, "history": total_history}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генерация синтетических пользователей, тем, задач и истории")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365, help="за сколько дней назад создаются задачи")
+    parser.add_argument("--creator-skew", type=float, default=1.1,
+                        help="показатель Ципфа для авторов задач, 0 - равномерно")
+    parser.add_argument("--assigned-share", type=float, default=0.7, help="доля задач с исполнителем")
+    parser.add_argument("--topic-share", type=float, default=0.8, help="доля задач с темой")
+    parser.add_argument("--progress", type=parse_weights, default=[0.2, 0.25, 0.1, 0.45],
+                        help="веса финального статуса задачи по порядку статусов")
+    parser.add_argument("--step-hours", type=float, default=48, help="средний интервал между переходами")
+    parser.add_argument("--batch-size", type=int, default=200_000, help="задач в одной пачке COPY")
+    parser.add_argument("--password", default="bench12345")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from app.db.session import engine
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        counts = generate(conn, args)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE users, topics, tasks, task_status_history"))
+    print(", ".join(f"{k}: {v}" for k, v in counts.items()) + f" за {time.perf_counter() - started:.0f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from app.main import app
+
+# Нагрузочный прогон приложения в процессе (httpx ASGITransport) на базе из DATABASE_URL.
+# Несколько воркеров выполняют смешанную нагрузку чтения и записи от имени тестовых пользователей,
+# по каждому маршруту считаются p50/p95/p99 и пропускная способность, результат пишется в JSON,
+# чтобы сравнивать релизы между собой.
+#
+#   python -m benchmarks.load_test --duration 30 --concurrency 8
+#   python -m benchmarks.load_test --mix list_tasks=80,create_task=20 --out results.json
+#
+# Прогон создаёт пользователей и задачи в базе - запускать на отдельной (например, сгенерированной
+# benchmarks/generate_dataset.py) базе, а не на рабочей.
+
+# доля операций в смеси по умолчанию: примерно 4 чтения на 1 запись
+DEFAULT_MIX = {
+    "list_tasks": 45,
+    "get_task": 15,
+    "analytics_summary": 10,
+    "create_task": 10,
+    "update_task": 8,
+    "change_task_status": 12,
+}
+STATUS_CODES = ["new", "in_progress", "review", "done"]
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"неизвестная операция: {name}")
+        mix[name] = int(weight)
+    return mix
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+class Worker:
+    def __init__(self, client: httpx.AsyncClient, token: str, rnd: random.Random, samples: dict):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.rnd = rnd
+        self.samples = samples
+        self.task_ids: list[int] = []
+
+    async def call(self, name: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            r = await self.client.request(method, url, headers=self.headers, **kwargs)
+            ok = r.status_code < 400
+        except Exception:
+            r, ok = None, False
+        elapsed = time.perf_counter() - start
+        self.samples.setdefault(name, {"latencies": [], "errors": 0})
+        self.samples[name]["latencies"].append(elapsed)
+        if not ok:
+            self.samples[name]["errors"] += 1
+        return r
+
+    async def create_task(self):
+        r = await self.call("create_task", "POST", "/tasks",
+                            data={"title": f"load {uuid.uuid4().hex[:8]}", "priority": self.rnd.randint(1, 5)})
+        if r is not None and r.status_code == 201:
+            self.task_ids.append(r.json()["id"])
+
+    async def list_tasks(self):
+        await self.call("list_tasks", "GET", "/tasks", params={"limit": 50})
+
+    async def get_task(self):
+        if self.task_ids:
+            await self.call("get_task", "GET", f"/tasks/{self.rnd.choice(self.task_ids)}")
+
+    async def update_task(self):
+        if self.task_ids:
+            await self.call("update_task", "PATCH", f"/tasks/{self.rnd.choice(self.task_ids)}",
+                            data={"priority": self.rnd.randint(1, 5)})
+
+    async def change_task_status(self):
+        if self.task_ids:
+            await self.call("change_task_status", "PATCH", f"/tasks/{self.rnd.choice(self.task_ids)}/status",
+                            data={"status_code": self.rnd.choice(STATUS_CODES)})
+
+    async def analytics_summary(self):
+        await self.call("analytics_summary", "GET", "/analytics/summary")
+
+    # немного своих задач, чтобы чтению и правкам было с чем работать с первой секунды
+    async def warm_up(self):
+        for _ in range(5):
+            await self.create_task()
+        self.samples.clear()
+
+    async def run(self, mix: dict[str, int], deadline: float):
+        names, weights = list(mix), list(mix.values())
+        while time.perf_counter() < deadline:
+            await getattr(self, self.rnd.choices(names, weights)[0])()
+
+
+async def _login(client: httpx.AsyncClient, run_id: str, n: int) -> str:
+    email = f"load-{run_id}-{n}@example.com"
+    r = await client.post("/auth/register", data={"name": f"load{n}", "email": email, "password": "loadtest123"})
+    r.raise_for_status()
+    r = await client.post("/auth/login", data={"username": email, "password": "loadtest123"})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def run_load(duration: float, concurrency: int, mix: dict[str, int], users: int, seed: int) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        tokens = [await _login(client, run_id, n) for n in range(users)]
+        per_worker = [{} for _ in range(concurrency)]
+        workers = [Worker(client, tokens[i % users], random.Random(seed + i), per_worker[i])
+                   for i in range(concurrency)]
+        # разогрев (создание стартовых задач) не входит в замер: время отсчитывается после него
+        await asyncio.gather(*(w.warm_up() for w in workers))
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(w.run(mix, deadline) for w in workers))
+        elapsed = time.perf_counter() - started
+
+    merged: dict[str, dict] = {}
+    for samples in per_worker:
+        for name, s in samples.items():
+            m = merged.setdefault(name, {"latencies": [], "errors": 0})
+            m["latencies"] += s["latencies"]
+            m["errors"] += s["errors"]
+
+    routes = {}
+    for name, m in sorted(merged.items()):
+        lat = sorted(m["latencies"])
+        routes[name] = {
+            "count": len(lat),
+            "errors": m["errors"],
+            "rps": round(len(lat) / elapsed, 2),
+            "p50_ms": round(percentile(lat, 50) * 1000, 2),
+            "p95_ms": round(percentile(lat, 95) * 1000, 2),
+            "p99_ms": round(percentile(lat, 99) * 1000, 2),
+        }
+    total = sum(r["count"] for r in routes.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "total_requests": total,
+        "total_rps": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон API в процессе")
+    parser.add_argument("--duration", type=float, default=30, help="секунд замера")
+    parser.add_argument("--concurrency", type=int, default=8, help="одновременных клиентов")
+    parser.add_argument("--users", type=int, default=4, help="сколько тестовых пользователей завести")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="операция=вес через запятую")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, default=None, help="куда записать JSON с результатом")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load(args.duration, args.concurrency, args.mix, args.users, args.seed))
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "revision": _git_revision(),
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        **result,
+    }
+    out = args.out or Path("benchmarks/results") / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+
+    print(f"{'маршрут':<20}{'запросов':>10}{'ошибок':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, r in report["routes"].items():
+        print(f"{name:<20}{r['count']:>10}{r['errors']:>8}{r['rps']:>9}"
+              f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}")
+    print(f"всего: {report['total_requests']} запросов, {report['total_rps']} rps -> {out}")
+
+
+if __name__ == "__main__":
+    main()
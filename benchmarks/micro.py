@@ -0,0 +1,178 @@
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+# Микробенчмарки горячих функций сериализации и аналитики на 1k и 100k строк.
+# Время каждого случая сравнивается с сохранённым baseline (benchmarks/baselines.json),
+# замедление больше порога (--threshold) - регрессия, команда завершается с кодом 1.
+#
+#   python -m benchmarks.micro                 # сравнить с baseline
+#   python -m benchmarks.micro -k 'taskout*'   # только часть случаев
+#   python -m benchmarks.micro --save          # записать текущие результаты как baseline
+#
+# Baseline зависит от машины: после смены железа (или CI-раннера) его нужно пересохранить.
+
+BASELINES = Path(__file__).with_name("baselines.json")
+ROW_SIZES = (1_000, 100_000)
+
+# имя случая -> (размеры, подготовка: размер -> замеряемая функция)
+CASES: dict[str, tuple[tuple[int, ...], Callable[[int], Callable[[], object]]]] = {}
+
+
+def case(name: str, sizes: tuple[int, ...] = ROW_SIZES):
+    def register(setup):
+        CASES[name] = (sizes, setup)
+        return setup
+    return register
+
+
+def _tasks(n: int) -> list:
+    from app.db.models import Task
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        Task(id=i, title=f"Задача {i}", description=None if i % 3 else "описание", status_id=1 + i % 4,
+             topic_id=i % 50 or None, creator_id=1 + i % 100, assignee_id=1 + i % 70, priority=1 + i % 5,
+             due_date=date(2026, 2, 1) + timedelta(days=i % 30), created_at=now, updated_at=now)
+        for i in range(1, n + 1)
+    ]
+
+
+def _assignee_frame(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "assignee_id": np.arange(1, n + 1),
+        "assignee_name": [f"user{i}" for i in range(1, n + 1)],
+        "total": rng.integers(0, 500, n),
+        "done": rng.integers(0, 200, n),
+        "done_share": rng.random(n).round(3),
+    })
+
+
+@case("taskout_validate")
+def _taskout_validate(n: int):
+    from app.schemas.task import TaskOut
+
+    tasks = _tasks(n)
+    return lambda: [TaskOut.model_validate(t) for t in tasks]
+
+
+@case("taskout_dump_json")
+def _taskout_dump_json(n: int):
+    from app.schemas.task import TaskOut
+
+    items = [TaskOut.model_validate(t) for t in _tasks(n)]
+    return lambda: [item.model_dump(mode="json") for item in items]
+
+
+@case("df_to_dict_records")
+def _df_to_dict_records(n: int):
+    df = _assignee_frame(n)
+    return lambda: df.to_dict(orient="records")
+
+
+@case("png_hist")
+def _png_hist(n: int):
+    from app.api.routes.analytics import _series_to_png_hist
+
+    values = pd.Series(np.random.default_rng(1).exponential(48, n))
+    return lambda: _series_to_png_hist(values, "Время выполнения")
+
+
+# столбцов и точек на реальных графиках десятки, а не тысячи
+@case("png_bar", sizes=(10, 100))
+def _png_bar(n: int):
+    from app.api.routes.analytics import _df_to_png_bar
+
+    df = _assignee_frame(n)
+    return lambda: _df_to_png_bar(df, "assignee_name", "total", "Задачи по исполнителям")
+
+
+@case("png_line", sizes=(30, 365))
+def _png_line(n: int):
+    from app.api.routes.analytics import _df_to_png_line
+
+    df = pd.DataFrame({"day": pd.date_range("2026-01-01", periods=n), "created": np.arange(n)})
+    return lambda: _df_to_png_line(df, "day", "created", "Динамика")
+
+
+def measure(fn: Callable[[], object], min_time: float) -> list[float]:
+    # первый прогон - прогрев (импорты, кэши шрифтов matplotlib)
+    once = timeit.timeit(fn, number=1)
+    repeat = max(3, min(20, int(min_time / max(once, 1e-9))))
+    return timeit.repeat(fn, number=1, repeat=repeat)
+
+
+def run(pattern: str, min_time: float) -> dict[str, dict]:
+    results = {}
+    for name, (sizes, setup) in CASES.items():
+        for size in sizes:
+            key = f"{name}[{size}]"
+            if not fnmatch.fnmatch(key, pattern):
+                continue
+            # мусор от предыдущего случая не должен собираться посреди замера этого
+            gc.collect()
+            times = measure(setup(size), min_time)
+            results[key] = {
+                "rows": size,
+                "min_s": min(times),
+                "median_s": statistics.median(times),
+                "per_row_us": min(times) / size * 1e6,
+            }
+            print(f"{key:<32}{min(times) * 1000:>10.2f} мс{results[key]['per_row_us']:>10.3f} мкс/строка", flush=True)
+    return results
+
+
+def compare(results: dict[str, dict], baselines: dict[str, dict], threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'случай':<32}{'baseline':>12}{'сейчас':>12}{'изменение':>11}")
+    for key, r in results.items():
+        base = baselines.get(key)
+        if base is None:
+            print(f"{key:<32}{'-':>12}{r['min_s'] * 1000:>10.2f}мс{'нет base':>11}")
+            continue
+        change = r["min_s"] / base["min_s"] - 1
+        mark = " РЕГРЕССИЯ" if change > threshold else ""
+        print(f"{key:<32}{base['min_s'] * 1000:>10.2f}мс{r['min_s'] * 1000:>10.2f}мс{change:>+10.1%}{mark}")
+        if change > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Микробенчмарки сериализации и аналитики")
+    parser.add_argument("-k", dest="pattern", default="*", help="glob по имени случая, например 'png_*'")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимое замедление, доля")
+    parser.add_argument("--min-time", type=float, default=1.0, help="сколько секунд замерять каждый случай")
+    parser.add_argument("--save", action="store_true", help="сохранить результаты как baseline")
+    args = parser.parse_args()
+
+    results = run(args.pattern, args.min_time)
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {"cases": {}}
+
+    if args.save:
+        stored["cases"].update(results)
+        stored["machine"] = f"{platform.machine()} {platform.processor()} python {platform.python_version()}"
+        BASELINES.write_text(json.dumps(stored, ensure_ascii=False, indent=2, sort_keys=True) + "\n")
+        print(f"baseline сохранён: {BASELINES}")
+        return
+
+    regressions = compare(results, stored["cases"], args.threshold)
+    if regressions:
+        print(f"\nзамедление больше {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
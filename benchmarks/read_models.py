@@ -0,0 +1,59 @@
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from app.db.models import Task
+from app.db.read_models import TaskRow, fetch, select_rows
+from app.db.session import SessionLocal
+
+# Сравнение загрузки страницы задач ORM-объектами и моделью чтения TaskRow на базе из DATABASE_URL
+# (данные - например, из benchmarks/generate_dataset.py): время на запрос и пик памяти Python.
+#
+#   python -m benchmarks.read_models --rows 200 --rows 10000
+
+
+def load_orm(db, n: int) -> list:
+    return list(db.execute(select(Task).order_by(Task.id).limit(n)).scalars())
+
+
+def load_read_model(db, n: int) -> list:
+    return fetch(db, TaskRow, select_rows(TaskRow, Task).order_by(Task.id).limit(n))
+
+
+def measure(loader, n: int, repeat: int) -> tuple[float, float]:
+    times = []
+    for _ in range(repeat):
+        # как в запросе: новая сессия, загрузка, закрытие
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            loader(db, n)
+            times.append(time.perf_counter() - start)
+    gc.collect()
+    with SessionLocal() as db:
+        tracemalloc.start()
+        rows = loader(db, n)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows
+    return statistics.median(times), peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ORM против модели чтения для списка задач")
+    parser.add_argument("--rows", type=int, action="append", help="строк на запрос, можно несколько раз")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'строк':>8}{'ORM, мс':>10}{'чтение, мс':>12}{'ORM, КБ':>10}{'чтение, КБ':>12}")
+    for n in args.rows or [200, 10_000]:
+        orm_time, orm_mem = measure(load_orm, n, args.repeat)
+        rm_time, rm_mem = measure(load_read_model, n, args.repeat)
+        print(f"{n:>8}{orm_time * 1000:>10.2f}{rm_time * 1000:>12.2f}{orm_mem / 1024:>10.0f}{rm_mem / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
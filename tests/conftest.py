@@ -11,6 +11,8 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 from app.api.deps import get_db
+from app.db import ref_cache, task_cache, task_events
+from app.jobs import runner as job_runner
 from app.db.base import Base
 from app.db.models import TaskStatus
 
@@ -60,9 +62,14 @@ def test_engine():
 
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # фоновые задания выполняются в своих сессиях - тоже на тестовой бд
+    job_runner.session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    task_events.hub.engine = engine
 
     yield engine
 
+    job_runner.shutdown()
+
     Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture()
@@ -97,7 +104,13 @@ def client(db_session):
 def _clean_db(db_session):
     db_session.execute(text("TRUNCATE TABLE task_status_history RESTART IDENTITY CASCADE;"))
     db_session.execute(text("TRUNCATE TABLE tasks RESTART IDENTITY CASCADE;"))
+    db_session.execute(text("TRUNCATE TABLE tasks_archive RESTART IDENTITY CASCADE;"))
+    db_session.execute(text("TRUNCATE TABLE task_tombstones;"))
+    db_session.execute(text("TRUNCATE TABLE sync_horizon;"))
     db_session.execute(text("TRUNCATE TABLE topics RESTART IDENTITY CASCADE;"))
+    db_session.execute(text("TRUNCATE TABLE jobs RESTART IDENTITY CASCADE;"))
     db_session.execute(text("TRUNCATE TABLE users RESTART IDENTITY CASCADE;"))
     db_session.commit()
+    ref_cache.clear()
+    task_cache.clear()
     yield
\ No newline at end of file
@@ -0,0 +1,51 @@
+from tests.utils import (register, login, auth_headers, make_admin, create_task_form, patch_task_form,
+                         change_status_form, create_topic_form)
+
+
+def _feed(client, token, **params):
+    items, cursor = [], None
+    while True:
+        r = client.get("/activity", params={**params, "limit": 2, **({"cursor": cursor} if cursor else {})},
+                       headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        items += r.json()["items"]
+        cursor = r.json()["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_activity_feed_filters_and_scope(client, db_session):
+    register(client, "admin", "admin@test.com", "secret123")
+    make_admin(db_session, "admin@test.com")
+    admin = login(client, "admin@test.com", "secret123")
+    u1 = register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    t1 = login(client, "u1@test.com", "secret123")
+    t2 = login(client, "u2@test.com", "secret123")
+
+    topic_a = create_topic_form(client, admin, name="A").json()["id"]
+    topic_b = create_topic_form(client, admin, name="B").json()["id"]
+    task1 = create_task_form(client, t1, title="t1", topic_id=str(topic_a)).json()["id"]
+    task2 = create_task_form(client, t2, title="t2").json()["id"]
+    for code in ("in_progress", "review", "done"):
+        assert change_status_form(client, t1, task1, code).status_code == 200
+    assert change_status_form(client, t2, task2, "in_progress").status_code == 200
+
+    everything = _feed(client, admin)
+    assert len(everything) == 4
+    assert [i["id"] for i in everything] == sorted((i["id"] for i in everything), reverse=True)
+    assert everything[0]["task_id"] == task2 and everything[0]["task_title"] == "t2"
+
+    # обычный пользователь видит только переходы своих задач
+    own = _feed(client, t1)
+    assert {i["task_id"] for i in own} == {task1} and len(own) == 3
+    assert _feed(client, t1, changed_by_id=u1["id"]) == own
+    assert _feed(client, t2, changed_by_id=u1["id"]) == []
+
+    # тема берётся на момент перехода: после переноса задачи старые записи остаются в теме A
+    assert patch_task_form(client, t1, task1, topic_id=str(topic_b)).status_code == 200
+    assert len(_feed(client, admin, topic_id=topic_a)) == 3
+    assert _feed(client, admin, topic_id=topic_b) == []
+
+    r = client.get("/activity", params={"cursor": "bad"}, headers=auth_headers(admin))
+    assert r.status_code == 400
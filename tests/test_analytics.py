@@ -1,9 +1,11 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import event, select, update
 
+from app.api.routes import analytics
 from app.db.models import TaskStatus, Task, TaskStatusHistory
-from tests.utils import register, login, auth_headers, create_task_form, create_topic_form, make_admin
+from tests.utils import (register, login, auth_headers, create_task_form, create_topic_form, make_admin,
+                         change_status_form)
 
 
 def _mark_task_done(db_session, task_id: int, user_id: int):
@@ -139,4 +141,166 @@ def test_summary_burndown_lead_time_json_and_png(client, db_session):
 
     r = client.get("/analytics/lead_time?format=png", headers=auth_headers(token))
     assert r.status_code == 200
-    assert r.headers["content-type"].startswith("image/png")
\ No newline at end of file
+    assert r.headers["content-type"].startswith("image/png")
+
+def test_time_in_status_json_grouped_and_png(client):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+
+    r = client.get("/analytics/time_in_status", headers=auth_headers(token))
+    assert r.status_code == 404
+
+    task_id = create_task_form(client, token, title="t1", priority="3").json()["id"]
+    change_status_form(client, token, task_id, "in_progress")
+    change_status_form(client, token, task_id, "review")
+    change_status_form(client, token, task_id, "done")
+
+    r = client.get("/analytics/time_in_status?format=json", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    items = r.json()["items"]
+    # done терминальный, в выборку не попадает; new считается от создания задачи
+    assert [x["status_code"] for x in items] == ["new", "in_progress", "review"]
+    assert all(x["count"] == 1 and x["avg_hours"] >= 0 for x in items)
+
+    r = client.get("/analytics/time_in_status?group_by=topic", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert all(x["group"] == "Без темы" for x in r.json()["items"])
+
+    r = client.get("/analytics/time_in_status?group_by=assignee&format=png", headers=auth_headers(token))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("image/png")
+
+
+def test_time_in_status_clipped_by_date_to(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+
+    task_id = create_task_form(client, token, title="t1", priority="3").json()["id"]
+    change_status_form(client, token, task_id, "in_progress")
+    change_status_form(client, token, task_id, "review")
+
+    # new: -12..-10 дней, in_progress: -10..-2 дня, review: с -2 дней до сих пор
+    now = datetime.now(timezone.utc)
+    db_session.execute(update(Task).where(Task.id == task_id).values(created_at=now - timedelta(days=12)))
+    for code, days in (("in_progress", 10), ("review", 2)):
+        status_id = db_session.execute(select(TaskStatus.id).where(TaskStatus.code == code)).scalar_one()
+        db_session.execute(update(TaskStatusHistory)
+                           .where(TaskStatusHistory.task_id == task_id, TaskStatusHistory.to_status_id == status_id)
+                           .values(changed_at=now - timedelta(days=days)))
+    db_session.commit()
+
+    r = client.get("/analytics/time_in_status", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    items = {x["status_code"]: x for x in r.json()["items"]}
+    assert items["new"]["count"] == 1 and items["new"]["median_hours"] == 48
+    assert items["in_progress"]["count"] == 1 and items["in_progress"]["median_hours"] == 192
+    # открытый отрезок в статистику не попадает, считается отдельно
+    assert items["review"]["count"] == 0 and items["review"]["median_hours"] is None
+    assert items["review"]["open_count"] == 1 and 47 < items["review"]["open_avg_hours"] < 49
+
+    date_to = date.today() - timedelta(days=5)
+    r = client.get(f"/analytics/time_in_status?date_to={date_to}", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    items = {x["status_code"]: x for x in r.json()["items"]}
+    assert set(items) == {"new", "in_progress"}
+    assert items["new"]["count"] == 1 and items["new"]["median_hours"] == 48
+    # in_progress к date_to ещё не закончился: длина обрезана по окну, а не до -2 дней
+    assert items["in_progress"]["count"] == 0 and items["in_progress"]["open_count"] == 1
+    assert 96 <= items["in_progress"]["open_avg_hours"] <= 120
+
+
+def test_analytics_svg_and_spec(client):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+
+    create_task_form(client, token, title="t1", priority="3")
+
+    r = client.get("/analytics/statuses?format=svg", headers=auth_headers(token))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("image/svg+xml")
+    assert r.text.startswith("<svg") and "Задачи по статусам" in r.text
+
+    r = client.get("/analytics/statuses?format=spec", headers=auth_headers(token))
+    assert r.status_code == 200
+    spec = r.json()
+    assert spec["type"] == "bar"
+    assert len(spec["labels"]) == len(spec["series"][0]["values"]) == 4
+    assert sum(spec["series"][0]["values"]) == 1
+
+
+def test_trend_gap_filling_and_buckets(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+
+    r1 = create_task_form(client, token, title="t1", priority="3")
+    create_task_form(client, token, title="t2", priority="3")
+    user_id = client.get("/users/me", headers=auth_headers(token)).json()["id"]
+    _mark_task_done(db_session, r1.json()["id"], user_id)
+
+    today = date.today()
+    date_from = today - timedelta(days=6)
+    r = client.get(f"/analytics/trend?bucket=day&date_from={date_from}&date_to={today}",
+                   headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    items = r.json()["items"]
+    # пустые дни тоже возвращаются
+    assert len(items) == 7
+    assert items[0]["bucket"] == str(date_from) and items[-1]["bucket"] == str(today)
+    assert sum(x["created"] for x in items) == 2
+    assert sum(x["completed"] for x in items) == 1
+    assert items[-1]["open"] == 1
+
+    r = client.get(f"/analytics/trend?bucket=month&date_from={today - timedelta(days=400)}",
+                   headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert len(r.json()["items"]) in (14, 15)
+    assert r.json()["items"][-1]["open"] == 1
+
+    r = client.get("/analytics/trend?bucket=week&format=svg", headers=auth_headers(token))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("image/svg+xml")
+
+    r = client.get("/analytics/trend?format=png", headers=auth_headers(token))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("image/png")
+
+    r = client.get(f"/analytics/trend?date_from={today}&date_to={date_from}", headers=auth_headers(token))
+    assert r.status_code == 400
+
+
+def test_dashboard_single_round_trip(client, db_session, test_engine, monkeypatch):
+    register(client, "admin", "admin@test.com", "secret123")
+    make_admin(db_session, "admin@test.com")
+    admin_token = login(client, "admin@test.com", "secret123")
+    topic_id = create_topic_form(client, admin_token, name="Backend").json()["id"]
+
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    create_task_form(client, token, title="t1", priority="3", topic_id=str(topic_id))
+    r = create_task_form(client, token, title="t2", priority="3")
+    user_id = client.get("/users/me", headers=auth_headers(token)).json()["id"]
+    _mark_task_done(db_session, r.json()["id"], user_id)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_engine, "before_cursor_execute", listener)
+    try:
+        r = client.get("/analytics/dashboard", headers=auth_headers(token))
+    finally:
+        event.remove(test_engine, "before_cursor_execute", listener)
+    assert r.status_code == 200, r.text
+    # пользователь из токена + один запрос на все агрегаты
+    assert len(statements) == 2
+
+    data = r.json()
+    assert data["statuses"]["total"] == 2
+    assert [x["code"] for x in data["statuses"]["items"]] == ["new", "in_progress", "review", "done"]
+    assert data["topics"]["items"][0] == {"topic": "Backend", "count": 1, "percent": 100.0}
+    assert data["assignees"]["items"] == [{"assignee": "Без исполнителя", "count": 2, "percent": 100.0}]
+    assert data["lead_time"]["count"] == 1
+
+    # с репликой те же агрегаты считаются параллельно на отдельных соединениях
+    monkeypatch.setattr(analytics, "replica_engine", test_engine)
+    r2 = client.get("/analytics/dashboard", headers=auth_headers(token))
+    assert r2.status_code == 200, r2.text
+    assert r2.json() == data
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from app.db.archive import archive_done_tasks
+from app.db.models import Task, TaskArchive, TaskStatusHistory, TaskStatusHistoryArchive, TaskTombstone
+from tests.utils import register, login, auth_headers, create_task_form, change_status_form
+
+
+def test_archive_moves_old_done_tasks_with_history(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    other = login(client, "u2@test.com", "secret123")
+
+    old_done = create_task_form(client, token, title="old-done").json()["id"]
+    fresh_done = create_task_form(client, token, title="fresh-done").json()["id"]
+    old_open = create_task_form(client, token, title="old-open").json()["id"]
+    for task_id in (old_done, fresh_done):
+        change_status_form(client, token, task_id, "in_progress")
+        change_status_form(client, token, task_id, "done")
+
+    # old-done завершена давно, но правилась недавно; у fresh-done наоборот
+    long_ago = datetime.now(timezone.utc) - timedelta(days=120)
+    db_session.execute(update(TaskStatusHistory).where(TaskStatusHistory.task_id == old_done)
+                       .values(changed_at=long_ago))
+    db_session.execute(update(Task).where(Task.id.in_([fresh_done, old_open])).values(updated_at=long_ago))
+    db_session.commit()
+
+    assert archive_done_tasks(db_session, older_than_days=90, batch_size=1) == 1
+
+    assert db_session.get(Task, old_done) is None
+    assert db_session.get(TaskArchive, old_done) is not None
+    assert db_session.scalar(select(func.count()).select_from(TaskStatusHistory)
+                             .where(TaskStatusHistory.task_id == old_done)) == 0
+    assert db_session.scalar(select(func.count()).select_from(TaskStatusHistoryArchive)
+                             .where(TaskStatusHistoryArchive.task_id == old_done)) == 2
+
+    r = client.get(f"/tasks/{old_done}", headers=auth_headers(token))
+    assert r.status_code == 200
+    assert r.json()["title"] == "old-done"
+    assert client.get(f"/tasks/{old_done}", headers=auth_headers(other)).status_code == 403
+
+    r = client.get("/tasks?sort_by=title&sort_dir=asc", headers=auth_headers(token))
+    assert [t["title"] for t in r.json()] == ["fresh-done", "old-open"]
+
+    r = client.get("/tasks?include_archived=true&sort_by=title&sort_dir=asc", headers=auth_headers(token))
+    assert [t["title"] for t in r.json()] == ["fresh-done", "old-done", "old-open"]
+
+    r = client.get("/tasks?include_archived=true&status_id=1", headers=auth_headers(token))
+    assert [t["title"] for t in r.json()] == ["old-open"]
+
+
+def test_archive_is_not_a_deletion_for_sync(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    task_id = create_task_form(client, token, title="done").json()["id"]
+    change_status_form(client, token, task_id, "done")
+    db_session.execute(update(TaskStatusHistory).where(TaskStatusHistory.task_id == task_id)
+                       .values(changed_at=datetime.now(timezone.utc) - timedelta(days=120)))
+    db_session.commit()
+
+    first = client.get("/tasks/changes", headers=auth_headers(token)).json()
+    assert [t["id"] for t in first["changed"]] == [task_id]
+    # снимок рабочей задачи в кэше
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).status_code == 200
+
+    assert archive_done_tasks(db_session, older_than_days=90, batch_size=10) == 1
+
+    after = client.get("/tasks/changes", params={"token": first["next_token"]}, headers=auth_headers(token)).json()
+    assert after["changed"] == [] and after["deleted"] == []
+    assert db_session.scalar(select(func.count()).select_from(TaskTombstone)) == 0
+    # история читается уже из архива
+    r = client.get(f"/tasks/{task_id}/history", headers=auth_headers(token))
+    assert [i["to_status"] for i in r.json()["items"]] == ["Сделано"]
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from app.core.bulkhead import Bulkhead, BulkheadFull
+from tests.utils import register, login, auth_headers
+
+
+def test_bulkhead_rejects_after_queue_timeout():
+    bulkhead = Bulkhead(capacity=1, queue_timeout=0.05)
+
+    async def run():
+        async with bulkhead.slot():
+            assert bulkhead.stats()["saturation"] == 1
+            with pytest.raises(BulkheadFull):
+                async with bulkhead.slot():
+                    pass
+        # слот освободился - следующий запрос проходит
+        async with bulkhead.slot():
+            pass
+
+    asyncio.run(run())
+    stats = bulkhead.stats()
+    assert (stats["in_use"], stats["waiting"], stats["completed_total"], stats["rejected_total"]) == (0, 0, 2, 1)
+
+
+def test_metrics_count_analytics_requests(client):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    before = client.get("/metrics").json()["analytics_bulkhead"]["completed_total"]
+
+    assert client.get("/analytics/summary", headers=auth_headers(token)).status_code == 200
+    # CRUD идёт мимо bulkhead
+    assert client.get("/tasks", headers=auth_headers(token)).status_code == 200
+
+    stats = client.get("/metrics").json()["analytics_bulkhead"]
+    assert stats["completed_total"] == before + 1
+    assert stats["in_use"] == 0
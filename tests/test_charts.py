@@ -0,0 +1,23 @@
+from app.core.charts import chart_spec, histogram, render_svg
+
+
+def test_render_svg_escapes_labels():
+    svg = render_svg("bar", ["<b>&"], [3], "T<1>")
+    assert svg.startswith("<svg") and svg.endswith("</svg>")
+    assert "&lt;b&gt;&amp;" in svg
+    assert "T&lt;1&gt;" in svg
+
+def test_render_svg_line_and_empty():
+    assert "<polyline" in render_svg("line", ["a", "b"], [1, 2], "t")
+    assert render_svg("bar", [], [], "t").endswith("</svg>")
+
+def test_histogram_bins():
+    labels, counts = histogram([0, 1, 2, 3, 4, None], bins=2)
+    assert len(labels) == 2
+    assert counts == [2, 3]
+    assert histogram([5, 5], bins=4) == (["5"], [2])
+
+def test_chart_spec():
+    spec = chart_spec("line", [1, 2], [3, 4], "t", series="done")
+    assert spec == {"type": "line", "title": "t", "labels": ["1", "2"],
+                    "series": [{"name": "done", "values": [3.0, 4.0]}]}
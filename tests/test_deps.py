@@ -1,4 +1,9 @@
+from types import SimpleNamespace
+
 import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import InternalError
+from sqlalchemy.orm import sessionmaker
 
 from app.api import deps
 
@@ -46,4 +51,24 @@ def test_get_db_rollbacks_on_exception(monkeypatch):
         gen.throw(ValueError("boom"))
 
     assert fake.rolled_back is True
-    assert fake.closed is True
\ No newline at end of file
+    assert fake.closed is True
+
+def test_get_db_read_only_for_safe_methods(monkeypatch, test_engine):
+    monkeypatch.setattr(deps, "ReadOnlySessionLocal",
+                        sessionmaker(bind=test_engine.execution_options(postgresql_readonly=True)))
+    monkeypatch.setattr(deps, "SessionLocal", sessionmaker(bind=test_engine))
+    insert = text("INSERT INTO topics (name) VALUES ('ro-check')")
+
+    gen = deps.get_db(SimpleNamespace(method="GET"))
+    db = next(gen)
+    assert db.execute(text("SHOW transaction_read_only")).scalar() == "on"
+    with pytest.raises(InternalError):
+        db.execute(insert)
+    gen.close()
+
+    # признак только для чтения не остаётся на соединении, вернувшемся в пул
+    gen = deps.get_db(SimpleNamespace(method="POST"))
+    db = next(gen)
+    assert db.execute(text("SHOW transaction_read_only")).scalar() == "off"
+    db.execute(text("DELETE FROM topics WHERE name = 'ro-check'"))
+    gen.close()
@@ -0,0 +1,106 @@
+import csv
+import io
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import Job, JobStatus
+from app.jobs import runner as job_runner
+from tests.utils import register, login, auth_headers, create_task_form
+
+
+def _wait_job(client, db_session, token: str, job_id: int, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/{job_id}", headers=auth_headers(token)).json()
+        if job["status"] in ("done", "failed") or time.monotonic() > deadline:
+            return job
+        # общая тестовая сессия не завершает транзакцию между запросами
+        db_session.commit()
+        time.sleep(0.05)
+
+
+def test_tasks_export_job(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    other = login(client, "u2@test.com", "secret123")
+    create_task_form(client, token, title="t1", priority="2")
+    create_task_form(client, token, title="t2, с запятой", priority="4")
+    create_task_form(client, other, title="foreign")
+
+    r = client.post("/jobs/tasks-export", data={"format": "csv"}, headers=auth_headers(token))
+    assert r.status_code == 202, r.text
+    job_id = r.json()["id"]
+    assert r.json()["status"] == "queued"
+
+    # до коммита задание в пул не отдаётся
+    r = client.get(f"/jobs/{job_id}/result", headers=auth_headers(token))
+    assert r.status_code == 409
+    db_session.commit()
+
+    job = _wait_job(client, db_session, token, job_id)
+    assert job["status"] == "done", job
+    assert job["started_at"] and job["finished_at"]
+
+    assert client.get(f"/jobs/{job_id}", headers=auth_headers(other)).status_code == 403
+
+    r = client.get(f"/jobs/{job_id}/result", headers=auth_headers(token))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert 'filename="tasks.csv"' in r.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [(x["title"], x["priority"]) for x in rows] == [("t1", "2"), ("t2, с запятой", "4")]
+
+
+def test_analytics_jobs_png_and_failure(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    create_task_form(client, token, title="t1")
+
+    png_id = client.post("/jobs/analytics/statuses", data={"format": "png"}, headers=auth_headers(token)).json()["id"]
+    # времени в статусах ещё нет - задание завершится ошибкой обработчика
+    failed_id = client.post("/jobs/analytics/time_in_status", data={"format": "json"},
+                            headers=auth_headers(token)).json()["id"]
+    db_session.commit()
+
+    job = _wait_job(client, db_session, token, png_id)
+    assert job["status"] == "done", job
+    assert job["params"] == {"name": "statuses", "args": {"format": "png"}}
+    r = client.get(f"/jobs/{png_id}/result", headers=auth_headers(token))
+    assert r.headers["content-type"] == "image/png"
+    assert r.content.startswith(b"\x89PNG")
+
+    job = _wait_job(client, db_session, token, failed_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "Нет данных"
+    assert client.get(f"/jobs/{failed_id}/result", headers=auth_headers(token)).status_code == 409
+
+    r = client.post("/jobs/analytics/unknown", data={"format": "png"}, headers=auth_headers(token))
+    assert r.status_code == 422
+
+
+def test_stale_running_jobs_reclaimed_and_old_results_purged(client, db_session):
+    user_id = register(client, "u1", "u1@test.com", "secret123")["id"]
+    token = login(client, "u1@test.com", "secret123")
+    now = datetime.now(timezone.utc)
+    # упавший процесс оставил задание в running; рядом - ещё работающее и два завершённых
+    lost = Job(type="tasks_export", status=JobStatus.running, created_by_id=user_id,
+               started_at=now - timedelta(hours=2))
+    alive = Job(type="tasks_export", status=JobStatus.running, created_by_id=user_id, started_at=now)
+    expired = Job(type="tasks_export", status=JobStatus.done, created_by_id=user_id, result=b"x",
+                  started_at=now - timedelta(days=3), finished_at=now - timedelta(days=3))
+    recent = Job(type="tasks_export", status=JobStatus.done, created_by_id=user_id, result=b"x",
+                 started_at=now, finished_at=now)
+    db_session.add_all([lost, alive, expired, recent])
+    db_session.flush()
+    lost_id, alive_id, expired_id, recent_id = lost.id, alive.id, expired.id, recent.id
+    db_session.commit()
+
+    assert job_runner.reclaim_stale() == 1
+    assert job_runner.purge_finished() == 1
+
+    job = client.get(f"/jobs/{lost_id}", headers=auth_headers(token)).json()
+    assert job["status"] == "failed" and job["error"] and job["finished_at"]
+    assert client.get(f"/jobs/{alive_id}", headers=auth_headers(token)).json()["status"] == "running"
+    assert client.get(f"/jobs/{expired_id}", headers=auth_headers(token)).status_code == 404
+    assert client.get(f"/jobs/{recent_id}", headers=auth_headers(token)).status_code == 200
@@ -0,0 +1,55 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from app.db import partitions
+
+
+def test_month_start_and_partition_name():
+    assert partitions.month_start(date(2026, 1, 31)) == date(2026, 1, 1)
+    assert partitions.month_start(date(2026, 1, 15), -1) == date(2025, 12, 1)
+    assert partitions.month_start(date(2026, 11, 2), 3) == date(2027, 2, 1)
+    assert partitions.partition_name(date(2027, 2, 1)) == "task_status_history_p2027_02"
+
+
+def test_ensure_and_detach_partitions(test_engine):
+    with test_engine.begin() as conn:
+        assert partitions.is_partitioned(conn)
+        assert partitions.list_partitions(conn) == ["task_status_history_default"]
+
+        # без фикстуры client: её сессия держит транзакцию открытой, а DROP отсоединённой
+        # партиции снимает внешние ключи и ждал бы блокировку на связанных таблицах
+        status_id = conn.execute(text(
+            "INSERT INTO task_statuses (code, name, sort_order, is_terminal) VALUES ('p', 'p', 99, false) "
+            "ON CONFLICT (code) DO UPDATE SET name = excluded.name RETURNING id"
+        )).scalar()
+        conn.execute(text("INSERT INTO users (name, email, password_hash) VALUES ('p', 'p@test.com', 'x')"))
+        conn.execute(text("INSERT INTO tasks (title, status_id, creator_id) VALUES ('t', :s, 1)"), {"s": status_id})
+        conn.execute(text(
+            "INSERT INTO task_status_history (task_id, to_status_id, changed_by_id, changed_at) "
+            "VALUES (1, :s, 1, '2020-02-10'), (1, :s, 1, '2020-04-20')"
+        ), {"s": status_id})
+
+        created = partitions.ensure_future_partitions(conn, 2, today=date(2020, 2, 5))
+        assert created == [
+            "task_status_history_p2020_02",
+            "task_status_history_p2020_03",
+            "task_status_history_p2020_04",
+        ]
+        assert partitions.ensure_future_partitions(conn, 2, today=date(2020, 2, 5)) == []
+
+        # строки из default-партиции переехали в помесячные
+        rows = conn.execute(text(
+            "SELECT tableoid::regclass::text FROM task_status_history ORDER BY changed_at"
+        )).scalars().all()
+        assert rows == ["task_status_history_p2020_02", "task_status_history_p2020_04"]
+
+        dropped = partitions.detach_old_partitions(conn, 1, drop=True, today=date(2020, 4, 1))
+        assert dropped == ["task_status_history_p2020_02"]
+        assert conn.execute(text("SELECT count(*) FROM task_status_history")).scalar() == 1
+
+        for name in partitions.list_partitions(conn):
+            if name != partitions.DEFAULT_PARTITION:
+                conn.execute(text(f"DROP TABLE {name}"))
+        conn.execute(text("TRUNCATE TABLE task_status_history, tasks, users RESTART IDENTITY CASCADE"))
+        conn.execute(text("DELETE FROM task_statuses WHERE id = :s"), {"s": status_id})
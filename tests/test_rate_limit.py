@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import PostgresBuckets, memory_buckets
+from tests.utils import register, login, auth_headers
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMITS", {"analytics": (0.01, 2), "default": (1000, 1000)})
+    memory_buckets.clear()
+    yield
+    memory_buckets.clear()
+
+
+def test_analytics_limited_per_user(client, limited):
+    register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    t1 = login(client, "u1@test.com", "secret123")
+    t2 = login(client, "u2@test.com", "secret123")
+
+    codes = [client.get("/analytics/summary", headers=auth_headers(t1)).status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+    r = client.get("/analytics/summary", headers=auth_headers(t1))
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+
+    # у другого пользователя своё ведро, другие классы маршрутов не затронуты
+    assert client.get("/analytics/summary", headers=auth_headers(t2)).status_code == 200
+    assert client.get("/tasks", headers=auth_headers(t1)).status_code == 200
+
+
+def test_postgres_buckets(test_engine):
+    buckets = PostgresBuckets(test_engine)
+    try:
+        assert [buckets.take("test:pg", 0.01, 2) for _ in range(2)] == [0.0, 0.0]
+        assert buckets.take("test:pg", 0.01, 2) > 1
+        assert buckets.take("test:other", 0.01, 2) == 0.0
+    finally:
+        buckets.clear()
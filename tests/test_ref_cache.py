@@ -0,0 +1,47 @@
+from app.db import ref_cache
+from app.db.models import Topic
+from tests.utils import register, login, auth_headers, create_topic_form, make_admin
+
+
+def test_topics_cached_until_api_change(client, db_session):
+    register(client, "admin", "admin@test.com", "secret123")
+    make_admin(db_session, "admin@test.com")
+    token = login(client, "admin@test.com", "secret123")
+
+    assert ref_cache.get_topics(db_session) == ()
+
+    topic_id = create_topic_form(client, token, name="Backend").json()["id"]
+    assert [t.name for t in ref_cache.get_topics(db_session)] == ["Backend"]
+
+    # запись в обход роутов кэш не сбрасывает
+    db_session.add(Topic(name="Direct"))
+    db_session.flush()
+    assert [t.name for t in ref_cache.get_topics(db_session)] == ["Backend"]
+
+    r = client.patch(f"/topics/{topic_id}", data={"name": "API"}, headers=auth_headers(token))
+    assert r.status_code == 200
+    assert [t.name for t in ref_cache.get_topics(db_session)] == ["API", "Direct"]
+
+    client.delete(f"/topics/{topic_id}", headers=auth_headers(token))
+    assert [t.name for t in ref_cache.get_topics(db_session)] == ["Direct"]
+
+
+def test_users_invalidated_on_register_and_role_change(client, db_session):
+    register(client, "admin", "admin@test.com", "secret123")
+    make_admin(db_session, "admin@test.com")
+    token = login(client, "admin@test.com", "secret123")
+
+    assert [u.email for u in ref_cache.get_users(db_session)] == ["admin@test.com"]
+
+    user_id = register(client, "u1", "u1@test.com", "secret123")["id"]
+    assert [u.email for u in ref_cache.get_users(db_session)] == ["admin@test.com", "u1@test.com"]
+
+    client.patch(f"/users/{user_id}/role", data={"role": "admin"}, headers=auth_headers(token))
+    assert {u.email: u.role.value for u in ref_cache.get_users(db_session)}["u1@test.com"] == "admin"
+
+
+def test_invalidate_after_commit(db_session):
+    ref_cache.invalidate(db_session, "topics")
+    assert "topics" in db_session.info[ref_cache._PENDING_KEY]
+    db_session.commit()
+    assert ref_cache._PENDING_KEY not in db_session.info
@@ -1,7 +1,7 @@
 from sqlalchemy import select
 
 from app.db.models import TaskStatusHistory
-from tests.utils import register, login, create_task_form, change_status_form
+from tests.utils import register, login, auth_headers, create_task_form, change_status_form
 
 
 def test_change_status_writes_history(client, db_session):
@@ -27,4 +27,38 @@ def test_change_status_invalid_code(client):
     task_id = r.json()["id"]
 
     r = change_status_form(client, token, task_id, "no_such_status")
-    assert r.status_code in (400, 404)
\ No newline at end of file
+    assert r.status_code in (400, 404)
+
+
+def test_task_history_paged_newest_first(client):
+    register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    other = login(client, "u2@test.com", "secret123")
+
+    task_id = create_task_form(client, token, title="t1").json()["id"]
+    path = ["in_progress", "review", "done", "review", "in_progress"]
+    for code in path:
+        assert change_status_form(client, token, task_id, code).status_code == 200
+
+    # одна транзакция теста - changed_at у всех записей равны, порядок держится на id
+    items, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        r = client.get(f"/tasks/{task_id}/history", params=params, headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        page = r.json()
+        assert len(page["items"]) <= 2
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [i["id"] for i in items] == sorted((i["id"] for i in items), reverse=True)
+    assert len(items) == len(path)
+    assert items[-1]["from_status"] == "Новая" and items[-1]["to_status"] == "В работе"
+    assert items[0]["changed_by"] == "u1"
+
+    assert client.get(f"/tasks/{task_id}/history", headers=auth_headers(other)).status_code == 403
+    r = client.get(f"/tasks/{task_id}/history", params={"cursor": "bad"}, headers=auth_headers(token))
+    assert r.status_code == 400
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.db.archive import purge_tombstones
+from app.db.models import TaskTombstone
+from tests.utils import register, login, auth_headers, create_task_form, patch_task_form
+
+
+def _sync(client, token, sync_token=None, **params):
+    if sync_token:
+        params["token"] = sync_token
+    r = client.get("/tasks/changes", params=params, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_changes_since_token(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    t1 = login(client, "u1@test.com", "secret123")
+    t2 = login(client, "u2@test.com", "secret123")
+
+    a = create_task_form(client, t1, title="a").json()["id"]
+    b = create_task_form(client, t1, title="b").json()["id"]
+    create_task_form(client, t2, title="foreign")
+    # общая тестовая сессия: синхронизация видит только зафиксированные транзакции
+    db_session.commit()
+
+    first = _sync(client, t1)
+    assert [t["id"] for t in first["changed"]] == [a, b]
+    assert first["deleted"] == [] and first["has_more"] is False
+
+    patch_task_form(client, t1, a, title="a-upd")
+    db_session.commit()
+    client.delete(f"/tasks/{b}", headers=auth_headers(t1))
+    db_session.commit()
+
+    second = _sync(client, t1, first["next_token"])
+    assert [(t["id"], t["title"]) for t in second["changed"]] == [(a, "a-upd")]
+    assert second["deleted"] == [b]
+
+    third = _sync(client, t1, second["next_token"])
+    assert third["changed"] == [] and third["deleted"] == []
+
+
+def test_changes_paging_and_bad_token(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    t1 = login(client, "u1@test.com", "secret123")
+    ids = []
+    for i in range(3):
+        ids.append(create_task_form(client, t1, title=f"t{i}").json()["id"])
+        db_session.commit()
+
+    seen, sync_token = [], None
+    while True:
+        page = _sync(client, t1, sync_token, limit=2)
+        seen += [t["id"] for t in page["changed"]]
+        sync_token = page["next_token"]
+        if not page["has_more"]:
+            break
+    assert seen == ids
+
+    r = client.get("/tasks/changes", params={"token": "garbage"}, headers=auth_headers(t1))
+    assert r.status_code == 400
+
+
+def test_tokens_older_than_purged_tombstones_are_gone(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    t1 = login(client, "u1@test.com", "secret123")
+    a, b = (create_task_form(client, t1, title=t).json()["id"] for t in ("a", "b"))
+    db_session.commit()
+    stale = _sync(client, t1)["next_token"]
+
+    client.delete(f"/tasks/{a}", headers=auth_headers(t1))
+    db_session.commit()
+    assert _sync(client, t1, stale)["deleted"] == [a]
+
+    # надгробие старше срока хранения удаляется, клиент со старым токеном о нём уже не узнает
+    db_session.execute(update(TaskTombstone).values(deleted_at=datetime.now(timezone.utc) - timedelta(days=60)))
+    db_session.commit()
+    assert purge_tombstones(db_session, older_than_days=30) == 1
+    r = client.get("/tasks/changes", params={"token": stale}, headers=auth_headers(t1))
+    assert r.status_code == 410
+
+    # полная синхронизация и токены после очистки работают
+    full = _sync(client, t1, limit=1)
+    assert [t["id"] for t in full["changed"]] == [b] and full["deleted"] == []
+    client.delete(f"/tasks/{b}", headers=auth_headers(t1))
+    db_session.commit()
+    assert _sync(client, t1, full["next_token"])["deleted"] == [b]
@@ -0,0 +1,85 @@
+import time
+from dataclasses import replace
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db import task_cache, task_events
+from tests.utils import (register, login, auth_headers, make_admin, create_task_form, patch_task_form,
+                         change_status_form, create_topic_form, capture_statements)
+
+
+def _task_selects(statements: list[str]) -> list[str]:
+    return [sql for sql in statements if sql.lstrip().upper().startswith("SELECT") and "FROM tasks" in sql]
+
+
+def test_get_task_served_from_cache_until_write(client, db_session, test_engine):
+    register(client, "admin", "admin@test.com", "secret123")
+    make_admin(db_session, "admin@test.com")
+    token = login(client, "admin@test.com", "secret123")
+    topic_id = create_topic_form(client, token, name="A").json()["id"]
+    task_id = create_task_form(client, token, title="t1", topic_id=str(topic_id)).json()["id"]
+
+    with capture_statements(test_engine) as statements:
+        assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()["title"] == "t1"
+        assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()["title"] == "t1"
+    assert len(_task_selects(statements)) == 1
+
+    # своя запись видна сразу же
+    assert patch_task_form(client, token, task_id, title="t1-upd").status_code == 200
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()["title"] == "t1-upd"
+    assert change_status_form(client, token, task_id, "in_progress").status_code == 200
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()["status_id"] == 2
+
+    # удаление темы обнуляет topic_id каскадом в БД
+    assert client.delete(f"/topics/{topic_id}", headers=auth_headers(token)).status_code == 204
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()["topic_id"] is None
+
+    assert client.delete(f"/tasks/{task_id}", headers=auth_headers(token)).status_code == 204
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).status_code == 404
+
+
+def test_task_cache_is_bounded_lru(client, db_session, test_engine, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_CACHE_SIZE", 2)
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    ids = [create_task_form(client, token, title=f"t{i}").json()["id"] for i in range(3)]
+
+    for task_id in (ids[0], ids[1], ids[0], ids[2]):
+        assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).status_code == 200
+    assert set(task_cache._entries) == {ids[0], ids[2]}
+
+    # более старый снимок не заменяет более новый
+    newer = task_cache._entries[ids[0]][1]
+    older = replace(newer, title="old", updated_at=newer.updated_at.replace(year=2000))
+    task_cache._put(older, 0.0, task_cache._generation)
+    assert task_cache._entries[ids[0]][1].title == newer.title
+
+
+def test_write_from_another_process_drops_snapshot(client, db_session, test_engine):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    task_id = create_task_form(client, token, title="t1").json()["id"]
+    db_session.commit()
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()["title"] == "t1"
+    assert task_id in task_cache._entries
+
+    # другой воркер: своё соединение, в этом процессе никто не вызывает invalidate
+    with test_engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET title = 'elsewhere' WHERE id = :id"), {"id": task_id})
+    deadline = time.monotonic() + 5
+    while task_id in task_cache._entries and time.monotonic() < deadline:
+        time.sleep(0.01)
+    db_session.commit()
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()["title"] == "elsewhere"
+
+
+def test_cache_bypassed_while_listener_is_down(client, db_session, monkeypatch):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    task_id = create_task_form(client, token, title="t1").json()["id"]
+    monkeypatch.setattr(task_events.hub, "add_listener", lambda listener: None)
+    monkeypatch.setattr(task_events.hub, "connected", False)
+
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers(token)).status_code == 200
+    assert task_cache._entries == {}
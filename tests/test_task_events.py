@@ -0,0 +1,100 @@
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+
+from app.api.routes.tasks import task_event_stream
+from app.db import task_events
+from tests.utils import register, login, auth_headers, create_task_form, patch_task_form, change_status_form
+
+
+def _parse(chunk: str) -> tuple[str, dict]:
+    kind, data = chunk.strip().split("\n")
+    return kind.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_event_stream_filtered_by_access(client, db_session):
+    register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    t1 = login(client, "u1@test.com", "secret123")
+    t2 = login(client, "u2@test.com", "secret123")
+    u1_id = client.get("/users/me", headers=auth_headers(t1)).json()["id"]
+    db_session.commit()
+
+    def write():
+        foreign = create_task_form(client, t2, title="foreign").json()["id"]
+        own = create_task_form(client, t1, title="own").json()["id"]
+        patch_task_form(client, t1, own, title="own-upd")
+        change_status_form(client, t1, own, "in_progress")
+        change_status_form(client, t2, foreign, "done")
+        client.delete(f"/tasks/{own}", headers=auth_headers(t1))
+        # общая тестовая сессия: NOTIFY уходят только при коммите
+        db_session.commit()
+        return own
+
+    async def run():
+        stream = task_event_stream(u1_id, is_admin=False, heartbeat=30)
+        assert await stream.__anext__() == ": connected\n\n"
+        own = await asyncio.to_thread(write)
+        events = [_parse(await asyncio.wait_for(stream.__anext__(), 5)) for _ in range(4)]
+        await stream.aclose()
+        return own, events
+
+    own, events = asyncio.run(run())
+    # события по чужой задаче отфильтрованы
+    assert [(kind, e["id"]) for kind, e in events] == [
+        ("created", own), ("updated", own), ("status_changed", own), ("deleted", own),
+    ]
+    assert all(e["creator_id"] == u1_id for _, e in events)
+
+
+def test_event_stream_heartbeat(client):
+    async def run():
+        stream = task_event_stream(1, is_admin=True, heartbeat=0.05)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        return chunks
+
+    assert asyncio.run(run()) == [": connected\n\n", ": ping\n\n"]
+
+
+def test_events_endpoint_requires_auth(client):
+    assert client.get("/tasks/events").status_code == 401
+
+
+def _listener_pids(db_session) -> set[int]:
+    return set(db_session.execute(text(
+        "SELECT pid FROM pg_stat_activity WHERE datname = current_database() AND query = 'LISTEN task_changes'"
+    )).scalars())
+
+
+def test_event_stream_survives_lost_connection(client, db_session, monkeypatch):
+    monkeypatch.setattr(task_events, "RECONNECT_MIN_SECONDS", 0.05)
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    db_session.commit()
+
+    def kill_and_write():
+        old = _listener_pids(db_session)
+        assert old
+        db_session.execute(text("SELECT pg_terminate_backend(pid) FROM unnest(:pids) AS pid"), {"pids": list(old)})
+        db_session.commit()
+        deadline = time.monotonic() + 5
+        while not (_listener_pids(db_session) - old) and time.monotonic() < deadline:
+            db_session.commit()
+            time.sleep(0.05)
+        task_id = create_task_form(client, token, title="after-reconnect").json()["id"]
+        db_session.commit()
+        return task_id
+
+    async def run():
+        stream = task_event_stream(1, is_admin=True, heartbeat=30)
+        assert await stream.__anext__() == ": connected\n\n"
+        task_id = await asyncio.to_thread(kill_and_write)
+        event = _parse(await asyncio.wait_for(stream.__anext__(), 5))
+        await stream.aclose()
+        return task_id, event
+
+    task_id, (kind, event) = asyncio.run(run())
+    assert (kind, event["id"]) == ("created", task_id)
@@ -1,4 +1,9 @@
-from tests.utils import register, login, auth_headers, create_task_form, patch_task_form, change_status_form
+from sqlalchemy import func, select
+
+from app.core import fast_json
+from app.db.models import TaskStatusHistory
+from tests.utils import (register, login, auth_headers, create_task_form, patch_task_form, change_status_form,
+                         capture_statements)
 
 
 def test_user_can_crud_own_task(client):
@@ -62,9 +67,67 @@ def test_list_tasks_sort_and_filter(client):
     r = client.get(f"/tasks/{id2}", headers=auth_headers(token))
     assert r.status_code == 200
 
+def test_list_tasks_matches_task_out(client, monkeypatch):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+    task_id = create_task_form(client, token, title="t1", description="d1", due_date="2026-03-01").json()["id"]
+    single = client.get(f"/tasks/{task_id}", headers=auth_headers(token)).json()
+
+    # список собирается из строк без TaskOut, формат полей должен совпадать
+    assert client.get("/tasks", headers=auth_headers(token)).json() == [single]
+    # и без orjson
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert client.get("/tasks", headers=auth_headers(token)).json() == [single]
+
 def test_task_create_priority_validation(client):
     register(client, "u1", "u1@test.com", "secret123")
     token = login(client, "u1@test.com", "secret123")
 
     r = client.post("/tasks", data={"title": "t1", "priority": "0"}, headers=auth_headers(token))
-    assert r.status_code == 422
\ No newline at end of file
+    assert r.status_code == 422
+
+
+def test_delete_task_does_not_load_history(client, db_session, test_engine):
+    register(client, "u1", "u1@test.com", "secret123")
+    token = login(client, "u1@test.com", "secret123")
+
+    task_id = create_task_form(client, token, title="t1").json()["id"]
+    for code in ("in_progress", "review", "in_progress", "done"):
+        change_status_form(client, token, task_id, code)
+    db_session.expire_all()
+
+    with capture_statements(test_engine) as statements:
+        r = client.delete(f"/tasks/{task_id}", headers=auth_headers(token))
+    assert r.status_code == 204
+    # история удаляется каскадом в БД, а не загружается и удаляется построчно
+    assert not any("FROM task_status_history" in s for s in statements)
+    assert db_session.scalar(select(func.count()).select_from(TaskStatusHistory)) == 0
+
+
+def test_bulk_delete_by_ids_and_filter(client, test_engine):
+    register(client, "u1", "u1@test.com", "secret123")
+    register(client, "u2", "u2@test.com", "secret123")
+    t1 = login(client, "u1@test.com", "secret123")
+    t2 = login(client, "u2@test.com", "secret123")
+
+    own = [create_task_form(client, t1, title=f"t{i}").json()["id"] for i in range(4)]
+    foreign = create_task_form(client, t2, title="foreign").json()["id"]
+    change_status_form(client, t1, own[0], "done")
+    change_status_form(client, t1, own[1], "done")
+
+    assert client.delete("/tasks", headers=auth_headers(t1)).status_code == 400
+
+    # чужая задача под условие не попадает
+    with capture_statements(test_engine) as statements:
+        r = client.delete(f"/tasks?ids={own[2]}&ids={foreign}", headers=auth_headers(t1))
+    assert r.status_code == 200
+    assert r.json() == {"deleted": 1}
+    assert sum(s.lstrip().upper().startswith("DELETE") for s in statements) == 1
+
+    r = client.delete("/tasks?status_id=4", headers=auth_headers(t1))
+    assert r.json() == {"deleted": 2}
+
+    r = client.get("/tasks", headers=auth_headers(t1))
+    assert [t["id"] for t in r.json()] == [own[3]]
+    assert client.get(f"/tasks/{foreign}", headers=auth_headers(t2)).status_code == 200
+
@@ -0,0 +1,93 @@
+import re
+from datetime import datetime, timedelta, timezone
+from html import unescape
+
+from sqlalchemy import select
+
+from app.db.models import Task, User
+from app.ui import router as ui_router
+
+
+def _ui_register(client, name: str, email: str, password: str = "secret123"):
+    r = client.post("/ui/register", data={"name": name, "email": email, "password": password},
+                    follow_redirects=False)
+    assert r.status_code == 302, r.text
+
+
+def _task_ids(html: str) -> list[int]:
+    return [int(x) for x in re.findall(r"<tr>\s*<td>(\d+)</td>", html)]
+
+
+def _nav_link(html: str, label: str) -> str | None:
+    m = re.search(rf'<a href="([^"]+)">{re.escape(label)}</a>', html)
+    return unescape(m.group(1)) if m else None
+
+
+def test_tasks_page_keyset_paging_with_filters(client, db_session, monkeypatch):
+    monkeypatch.setattr(ui_router, "TASKS_PAGE_SIZE", 2)
+    _ui_register(client, "u1", "u1@test.com")
+    user_id = db_session.execute(select(User.id).where(User.email == "u1@test.com")).scalar_one()
+
+    # у первых двух задач одинаковое время создания: порядок между ними задаёт id
+    base = datetime.now(timezone.utc) - timedelta(days=1)
+    created = [base, base, base + timedelta(hours=1), base + timedelta(hours=2), base + timedelta(hours=3)]
+    tasks = [Task(title=f"t{i}", status_id=1 if i < 4 else 2, creator_id=user_id, created_at=ts)
+             for i, ts in enumerate(created)]
+    db_session.add_all(tasks)
+    db_session.commit()
+    newest_first = [t.id for t in reversed(tasks)]
+
+    r = client.get("/ui/tasks")
+    assert _task_ids(r.text) == newest_first[:2]
+    assert _nav_link(r.text, "← Назад") is None
+
+    second = _nav_link(r.text, "Вперёд →")
+    r = client.get(second)
+    assert _task_ids(r.text) == newest_first[2:4]
+
+    r = client.get(_nav_link(r.text, "Вперёд →"))
+    assert _task_ids(r.text) == newest_first[4:]
+    assert _nav_link(r.text, "Вперёд →") is None
+
+    # назад с последней страницы - снова вторая
+    r = client.get(_nav_link(r.text, "← Назад"))
+    assert _task_ids(r.text) == newest_first[2:4]
+    assert _nav_link(r.text, "Вперёд →") is not None
+
+    # фильтр сохраняется в ссылках на соседние страницы
+    r = client.get("/ui/tasks?status_id=1")
+    assert _task_ids(r.text) == newest_first[1:3]
+    next_url = _nav_link(r.text, "Вперёд →")
+    assert "status_id=1" in next_url
+    r = client.get(next_url)
+    assert _task_ids(r.text) == newest_first[3:]
+    assert _nav_link(r.text, "Вперёд →") is None
+
+    # битый курсор - первая страница
+    assert _task_ids(client.get("/ui/tasks?after=garbage").text) == newest_first[:2]
+
+
+def test_edit_page_access_and_read_only_rows(client, db_session):
+    _ui_register(client, "u2", "u2@test.com")
+    _ui_register(client, "u1", "u1@test.com")
+    owner_id = db_session.execute(select(User.id).where(User.email == "u2@test.com")).scalar_one()
+    task = Task(title="foreign", status_id=1, creator_id=owner_id)
+    db_session.add(task)
+    db_session.commit()
+
+    # u1 залогинен последним: чужую задачу не редактирует
+    r = client.get(f"/ui/tasks/{task.id}/edit", follow_redirects=False)
+    assert r.status_code == 302
+    assert r.headers["location"] == "/ui/tasks"
+
+    client.post("/ui/login", data={"email": "u2@test.com", "password": "secret123"})
+    r = client.get(f"/ui/tasks/{task.id}/edit")
+    assert r.status_code == 200
+    assert 'name="status_code"' in r.text and 'name="topic_id"' in r.text
+
+    # строки списка без форм со списками: только ссылка на редактирование
+    r = client.get("/ui/tasks")
+    rows = r.text.split("<tbody>", 1)[1]
+    assert _task_ids(r.text) == [task.id]
+    assert "<select" not in rows
+    assert f'href="/ui/tasks/{task.id}/edit"' in rows
@@ -0,0 +1,63 @@
+from tests.utils import (register, login, auth_headers, make_admin, create_task_form, patch_task_form,
+                         change_status_form, create_topic_form, capture_statements)
+
+
+# запросы с первой записи до конца запроса: серверные значения должны прийти в RETURNING,
+# без повторного SELECT после flush
+def _from_first_write(statements: list[str]) -> list[str]:
+    for i, sql in enumerate(statements):
+        if sql.lstrip().upper().startswith(("INSERT", "UPDATE")):
+            return statements[i:]
+    return []
+
+
+def _assert_single_round_trips(statements: list[str], writes: int) -> None:
+    tail = _from_first_write(statements)
+    assert len(tail) == writes, tail
+    assert all("RETURNING" in sql for sql in tail if sql.lstrip().upper().startswith("INSERT")), tail
+
+
+def test_write_paths_do_not_reselect(client, db_session, test_engine):
+    with capture_statements(test_engine) as statements:
+        register(client, "admin", "admin@test.com", "secret123")
+    _assert_single_round_trips(statements, 1)
+
+    register(client, "u1", "u1@test.com", "secret123")
+    make_admin(db_session, "admin@test.com")
+    token = login(client, "admin@test.com", "secret123")
+
+    with capture_statements(test_engine) as statements:
+        r = create_task_form(client, token, title="t1")
+    assert r.status_code == 201 and r.json()["created_at"]
+    _assert_single_round_trips(statements, 1)
+    task_id = r.json()["id"]
+
+    with capture_statements(test_engine) as statements:
+        r = patch_task_form(client, token, task_id, title="t1-upd")
+    assert r.status_code == 200 and r.json()["title"] == "t1-upd"
+    _assert_single_round_trips(statements, 1)
+    assert "RETURNING" in _from_first_write(statements)[0]
+
+    with capture_statements(test_engine) as statements:
+        r = change_status_form(client, token, task_id, "in_progress")
+    assert r.status_code == 200
+    # история статуса и сама задача
+    _assert_single_round_trips(statements, 2)
+
+    with capture_statements(test_engine) as statements:
+        r = create_topic_form(client, token, name="Backend")
+    assert r.status_code == 201
+    _assert_single_round_trips(statements, 1)
+    topic_id = r.json()["id"]
+
+    with capture_statements(test_engine) as statements:
+        r = client.patch(f"/topics/{topic_id}", data={"name": "Frontend"}, headers=auth_headers(token))
+    assert r.status_code == 200 and r.json()["name"] == "Frontend"
+    _assert_single_round_trips(statements, 1)
+
+    u1_id = [u["id"] for u in client.get("/users", headers=auth_headers(token)).json()
+             if u["email"] == "u1@test.com"][0]
+    with capture_statements(test_engine) as statements:
+        r = client.patch(f"/users/{u1_id}/role", data={"role": "admin"}, headers=auth_headers(token))
+    assert r.status_code == 200 and r.json()["role"] == "admin"
+    _assert_single_round_trips(statements, 1)
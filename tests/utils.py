@@ -1,4 +1,6 @@
-from sqlalchemy import update
+from contextlib import contextmanager
+
+from sqlalchemy import event, update
 from app.db.models import User, UserRole
 
 def register(client, name: str, email: str, password: str):
@@ -43,4 +45,15 @@ def change_status_form(client, token: str, task_id: int, status_code: str):
 
 def create_topic_form(client, token: str, **fields):
     r = client.post("/topics", data=fields, headers={"Authorization": f"Bearer {token}"})
-    return r
\ No newline at end of file
+    return r
+
+# SQL-запросы, отправленные в БД внутри блока
+@contextmanager
+def capture_statements(engine):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)